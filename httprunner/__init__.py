@@ -1,14 +1,28 @@
 __version__ = "3.1.4"
 __description__ = "One-stop solution for HTTP(S) testing."
 
-from httprunner.core.testcase.step.runapi.config import RequestConfig
-from httprunner.core.testcase.step.runapi.request import HttpRunnerRequest
+import importlib
+import sys
 
-# import firstly for monkey patch if needed
-from httprunner.ext.locust import main_locusts
-from httprunner.parser import parse_parameters as Parameters
-from httprunner.runner import HttpRunner
-from httprunner.testcase import Config, Step, RunRequest, RunTestCase
+if "locust" in sys.argv[0]:
+    # import firstly for monkey patch
+    import httprunner.ext.locust  # noqa: F401
+
+# public names are imported lazily at first access, keep `hrun -V` and pytest workers fast
+_lazy_imports = {
+    "HttpRunner": ("httprunner.runner", "HttpRunner"),
+    "Config": ("httprunner.testcase", "Config"),
+    "Step": ("httprunner.testcase", "Step"),
+    "RunRequest": ("httprunner.testcase", "RunRequest"),
+    "RunTestCase": ("httprunner.testcase", "RunTestCase"),
+    "Parameters": ("httprunner.parser", "parse_parameters"),
+    "RequestConfig": ("httprunner.core.testcase.step.runapi.config", "RequestConfig"),
+    "HttpRunnerRequest": (
+        "httprunner.core.testcase.step.runapi.request",
+        "HttpRunnerRequest",
+    ),
+    "main_locusts": ("httprunner.ext.locust", "main_locusts"),
+}
 
 __all__ = [
     "__version__",
@@ -22,3 +36,19 @@ __all__ = [
     "RequestConfig",
     "HttpRunnerRequest",
 ]
+
+
+def __getattr__(name):
+    try:
+        module_name, attr_name = _lazy_imports[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), attr_name)
+    # cache in module globals, __getattr__ is not called for the name any more
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_imports))
@@ -2,14 +2,17 @@
 Built-in validate comparators.
 """
 
+import json
 import math
 import re
 from collections import defaultdict
+from functools import lru_cache
 from typing import Any, Callable, Iterable, Literal, Optional, Text, Union
 
 import jsonschema
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
+from httprunner.builtin import vectorized
 from httprunner.builtin.jsonassert import (  # noqa
     json_assert,
     json_contains,
@@ -19,11 +22,50 @@ from httprunner.builtin.jsoncomparator.jsonassert import (  # noqa
     json_contains_v2,
     json_equal_v2,
 )
+from httprunner.configs.comparator import comparator_settings
 from httprunner.exceptions import ParamsError
 
 Number = Union[int, float]
 
 
+def _format_items(items: list, total: Optional[int] = None) -> Text:
+    """Format items listed in failure message, only the first items are listed if there are too many.
+
+    :param items: items to list, maybe only the first ones of all items.
+    :param total: total count of items, defaults to the length of items.
+    """
+    total = len(items) if total is None else total
+    max_items = comparator_settings.max_reported_items
+    if total <= max_items:
+        return repr(items)
+
+    return f"{repr(items[:max_items])}\n（仅显示前 {max_items} 个，共 {total} 个）"
+
+
+@lru_cache(maxsize=512)
+def _compile_regex(pattern: Text) -> re.Pattern:
+    """Compile regex pattern, patterns are compiled only once."""
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=128)
+def _get_json_schema_validator(schema_key: Text):
+    """Get JSON schema validator instance of the schema dumped to schema_key.
+
+    The schema is checked only once, SchemaError will be raised if it is invalid.
+    """
+    schema = json.loads(schema_key)
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+@lru_cache(maxsize=128)
+def _get_type_adapter(type_: Any) -> TypeAdapter:
+    """Get TypeAdapter of type, the validation schema is built only once."""
+    return TypeAdapter(type_)
+
+
 def equal(
     check_value: Any,
     expect_value: Any,
@@ -54,14 +96,22 @@ def each_equal(
         assert check_value, "check_value should not be empty when is_not_empty is True"
 
     # assert each item in check_value equals to expect_value, record the index and value of all the different items
-    diff_items = [
-        (index, item) for index, item in enumerate(check_value) if item != expect_value
-    ]
+    diff_indexes = vectorized.get_unequal_indexes(check_value, expect_value)
+    if diff_indexes is None:
+        diff_indexes = [
+            index for index, item in enumerate(check_value) if item != expect_value
+        ]
 
-    # if diff_items is not empty, raise AssertionError
-    assert (
-        not diff_items
-    ), f"{message}\n预期列表中每一个值都等于 {repr(expect_value)}，但下面这些值不等于预期值，显示格式为 (index, value): \n{repr(diff_items)}"
+    # if diff_indexes is not empty, raise AssertionError
+    if diff_indexes:
+        diff_items = [
+            (index, check_value[index])
+            for index in diff_indexes[: comparator_settings.max_reported_items]
+        ]
+        raise AssertionError(
+            f"{message}\n预期列表中每一个值都等于 {repr(expect_value)}，但下面这些值不等于预期值，显示格式为 (index, value): \n"
+            f"{_format_items(diff_items, len(diff_indexes))}"
+        )
 
 
 def greater_than(
@@ -186,7 +236,7 @@ def type_match(check_value: Any, expect_value: Any, message: Text = ""):
 def regex_match(check_value: Text, expect_value: Any, message: Text = ""):
     assert isinstance(expect_value, str), "expect_value should be Text type"
     assert isinstance(check_value, str), "check_value should be Text type"
-    assert re.match(expect_value, check_value), message
+    assert _compile_regex(expect_value).match(check_value), message
 
 
 def startswith(check_value: Any, expect_value: Any, message: Text = ""):
@@ -198,12 +248,41 @@ def endswith(check_value: Text, expect_value: Any, message: Text = ""):
 
 
 def is_close(
-    check_value: Number, expect_value: tuple[Number, Number], message: Text = ""
+    check_value: Union[Number, list[Number], tuple[Number, ...]],
+    expect_value: tuple[Number, Number],
+    message: Text = "",
 ):
+    """Assert value is close to the expected value within the absolute tolerance.
+
+    If check_value is a list or tuple, each item of it should be close to the expected value.
+
+    :param check_value: a number, or a list/tuple of numbers
+    :param expect_value: a tuple of (expected value, absolute tolerance)
+    """
     a = check_value
     b = expect_value[0]
     abs_tol = expect_value[1]
 
+    if isinstance(a, (list, tuple)):
+        diff_indexes = vectorized.get_not_close_indexes(a, b, abs_tol)
+        if diff_indexes is None:
+            diff_indexes = [
+                index
+                for index, item in enumerate(a)
+                if not math.isclose(item, b, abs_tol=abs_tol)
+            ]
+
+        if diff_indexes:
+            diff_items = [
+                (index, a[index])
+                for index in diff_indexes[: comparator_settings.max_reported_items]
+            ]
+            raise AssertionError(
+                f"{message}\n预期列表中每一个值与 {b} 的差值都不超过 {abs_tol}，但下面这些值超过了，显示格式为 (index, value): \n"
+                f"{_format_items(diff_items, len(diff_indexes))}"
+            )
+        return
+
     if not message:
         message = f"difference ({abs(a - b)}) between {a} and {b} exceeded the minimum absolute tolerance ({abs_tol})"
 
@@ -247,9 +326,18 @@ def no_keys_duplicate(
     assert isinstance(
         check_value, list
     ), f"`check_value` should be a list, but got `{type(check_value)}`"
-    assert not (
-        duplicate_items := get_list_duplicate_items(check_value)
-    ), f"{message}\nduplicate items found: {duplicate_items}"
+
+    duplicate_indexes = vectorized.get_duplicate_indexes(check_value)
+    if duplicate_indexes is None:
+        duplicate_items = get_list_duplicate_items(check_value)
+    else:
+        duplicate_items = [
+            (check_value[indexes[0]], indexes) for indexes in duplicate_indexes
+        ]
+
+    assert (
+        not duplicate_items
+    ), f"{message}\nduplicate items found: {_format_items(duplicate_items)}"
 
 
 def list_sorted_in(
@@ -274,6 +362,13 @@ def list_sorted_in(
         "DSC",
     ], f"type of expected value should be Callable or the value is one of 'ASC', 'DSC', but got {type(expect_value)}"
 
+    # check sortedness without sorting a copy if possible
+    if (
+        expect_value in ["ASC", "DSC"]
+        and vectorized.is_sorted(check_value, reverse=expect_value == "DSC") is True
+    ):
+        return
+
     sorted_value = check_value.copy()
 
     if expect_value == "ASC":
@@ -329,7 +424,17 @@ def match_json_schema(
 ):
     """Assert value matches the JSON schema."""
     try:
-        jsonschema.validate(check_value, expect_value)
+        try:
+            # schemas equal in content share the same validator instance
+            schema_key = json.dumps(expect_value, sort_keys=True)
+        except (TypeError, ValueError):
+            # schema can not be dumped, validate it without cache
+            jsonschema.validate(check_value, expect_value)
+        else:
+            validator = _get_json_schema_validator(schema_key)
+            error = jsonschema.exceptions.best_match(validator.iter_errors(check_value))
+            if error is not None:
+                raise error
         jsonschema_error_message = None
     except Exception as e:
         jsonschema_error_message = e
@@ -339,12 +444,24 @@ def match_json_schema(
 
 def match_pydantic_model(
     check_value: dict,
-    expect_value: BaseModel,
+    expect_value: Union[type[BaseModel], Any],
     message: Text = "",
 ):
-    """Assert value matches the pydantic model."""
+    """Assert value matches the pydantic model.
+
+    expect_value can also be any other type supported by pydantic TypeAdapter, e.g. list[Model].
+    """
     try:
-        expect_value.model_validate(check_value, strict=True)
+        if isinstance(expect_value, type) and issubclass(expect_value, BaseModel):
+            # validator of pydantic model is built when the model class is created
+            expect_value.model_validate(check_value, strict=True)
+        else:
+            try:
+                type_adapter = _get_type_adapter(expect_value)
+            except TypeError:
+                # type is unhashable, e.g. annotated with unhashable metadata
+                type_adapter = TypeAdapter(expect_value)
+            type_adapter.validate_python(check_value, strict=True)
         validate_error_message = None
     except Exception as e:
         validate_error_message = e
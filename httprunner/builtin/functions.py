@@ -3,14 +3,18 @@ Built-in functions used in YAML/JSON testcases.
 """
 
 import collections.abc
+import copy
 import datetime
 import json
 import random
 import string
 import time
-from typing import Mapping, Any
+from typing import Any, Iterable, Mapping, Optional, Text
 
 from httprunner.exceptions import ParamsError
+from httprunner.jmespath_utils import compile_jmespath, flatten_simple_path
+
+_JSON_PREFIXES = ("{", "[", '"')
 
 
 def gen_random_string(str_len):
@@ -65,7 +69,108 @@ def update_dict_recursively(d: dict, u: Mapping) -> dict:
     return d
 
 
-def expand_nested_json(target: Any) -> Any:
+def copy_and_update_dict_recursively(d: dict, u: Mapping) -> dict:
+    """
+    Update a copy of a nested dict recursively, the original dict is left untouched.
+
+    Note:
+        Only dicts on the paths being updated are copied, the others are shared with the original dict.
+
+    >>> origin_dict = {"a": {"a1": 11, "a2": 12}, "b": {"b1": 21}}
+    >>> return_obj = copy_and_update_dict_recursively(origin_dict, {"a": {"a1": 1}})
+    >>> return_obj
+    {'a': {'a1': 1, 'a2': 12}, 'b': {'b1': 21}}
+    >>> origin_dict
+    {'a': {'a1': 11, 'a2': 12}, 'b': {'b1': 21}}
+    >>> return_obj["b"] is origin_dict["b"]
+    True
+    """
+    d = copy.copy(d)
+    for k, v in u.items():
+        if isinstance(v, collections.abc.Mapping):
+            d[k] = copy_and_update_dict_recursively(d.get(k, {}), v)
+        else:
+            d[k] = v
+    return d
+
+
+def _decode_json_string(target: Text) -> Any:
+    """Decode string which looks like JSON, the string itself is returned if it can not be decoded.
+
+    Only JSON objects, arrays and strings may contain double quotes, so decoding is attempted
+    only when the stripped string starts with one of their first characters.
+    """
+    stripped = target.lstrip()
+    if not stripped.startswith(_JSON_PREFIXES) or '"' not in stripped:
+        return target
+
+    try:
+        decoded = json.loads(stripped)
+    except json.decoder.JSONDecodeError:
+        return target
+
+    # JSON string encoded in JSON string, e.g. '"{\\"bar\\": \\"baz\\"}"'
+    if isinstance(decoded, str):
+        return _decode_json_string(decoded)
+    return decoded
+
+
+def _expand_nested_json(target: Any) -> Any:
+    if isinstance(target, dict):
+        for k, v in target.items():
+            if isinstance(v, (str, dict, list)):
+                target[k] = _expand_nested_json(v)
+        return target
+    elif isinstance(target, list):
+        for index, item in enumerate(target):
+            if isinstance(item, (str, dict, list)):
+                target[index] = _expand_nested_json(item)
+        return target
+    elif isinstance(target, str):
+        decoded = _decode_json_string(target)
+        if decoded is target:
+            return target
+        return _expand_nested_json(decoded)
+    else:
+        return target
+
+
+def _expand_nested_json_at(target: Any, path: Text) -> None:
+    """Expand nested json of the subtree selected by JMESPath expression in place."""
+    compiled_path = compile_jmespath(path)
+    steps = flatten_simple_path(compiled_path.parsed)
+    if steps is None:
+        # projections, filters, functions, etc. select copies of containers,
+        # the selected dicts and lists are still the original ones and can be expanded in place.
+        selected = compiled_path.search(target)
+        if isinstance(selected, (dict, list)):
+            _expand_nested_json(selected)
+        return
+
+    if not steps:
+        _expand_nested_json(target)
+        return
+
+    container = target
+    for index, (step_type, key) in enumerate(steps):
+        if step_type == "field":
+            if not isinstance(container, dict) or key not in container:
+                return
+        elif not isinstance(container, list) or not -len(container) <= key < len(
+            container
+        ):
+            return
+
+        value = container[key]
+        if index == len(steps) - 1:
+            container[key] = _expand_nested_json(value)
+        elif isinstance(value, str):
+            # parent encoded in JSON string, decode it on the way down
+            value = container[key] = _decode_json_string(value)
+        container = value
+
+
+def expand_nested_json(target: Any, paths: Optional[Iterable[Text]] = None) -> Any:
     """
     Try to convert string part to Python object using json.loads().
 
@@ -84,22 +189,161 @@ def expand_nested_json(target: Any) -> Any:
     >>> expand_nested_json("{\\"bar\\":\\"baz\\"}")
     {'bar': 'baz'}
 
+    Only subtrees selected by JMESPath expressions are expanded if paths are specified,
+    JSON strings on the way to the subtrees are decoded as well.
+
+    >>> expand_nested_json({"a": '{"b": "[\\\\"x\\\\"]"}', "c": '["y"]'}, paths=["a.b"])
+    {'a': {'b': ['x']}, 'c': '["y"]'}
+
     Reference: https://stackoverflow.com/questions/5997029/escape-double-quotes-for-json-in-python
     """
-    if isinstance(target, dict):
-        for k, v in target.items():
-            target[k] = expand_nested_json(v)
-        return target
-    elif isinstance(target, str) and '"' in target:
-        try:
-            target = json.loads(target)
-        except json.decoder.JSONDecodeError:
+    if paths is None:
+        return _expand_nested_json(target)
+
+    if isinstance(target, str):
+        target = _decode_json_string(target)
+    for path in paths:
+        _expand_nested_json_at(target, path)
+    return target
+
+
+class _LazyExpandedDict(dict):
+    """Dict of which values are expanded by expand_nested_json on first access.
+
+    Operations which read all the values, e.g. comparing, iterating items and
+    serializing, expand all the remaining values first.
+    """
+
+    __slots__ = ("_unexpanded_keys",)
+
+    def __init__(self, target: dict):
+        super().__init__(target)
+        self._unexpanded_keys = set(target)
+
+    def _expand_value(self, key):
+        self._unexpanded_keys.discard(key)
+        value = _expand_lazily(dict.__getitem__(self, key))
+        dict.__setitem__(self, key, value)
+        return value
+
+    def _expand_all(self):
+        for key in list(self._unexpanded_keys):
+            self._expand_value(key)
+
+    def __getitem__(self, key):
+        if key in self._unexpanded_keys:
+            return self._expand_value(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self._unexpanded_keys:
+            return self._expand_value(key)
+        return dict.get(self, key, default)
+
+    def __setitem__(self, key, value):
+        self._unexpanded_keys.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._unexpanded_keys.discard(key)
+        dict.__delitem__(self, key)
+
+    def pop(self, key, *args):
+        if key in self._unexpanded_keys:
+            self._expand_value(key)
+        return dict.pop(self, key, *args)
+
+    def setdefault(self, key, default=None):
+        if key in self._unexpanded_keys:
+            return self._expand_value(key)
+        return dict.setdefault(self, key, default)
+
+    def popitem(self):
+        self._expand_all()
+        return dict.popitem(self)
+
+    def update(self, *args, **kwargs):
+        other = dict(*args, **kwargs)
+        self._unexpanded_keys.difference_update(other)
+        dict.update(self, other)
+
+    def clear(self):
+        self._unexpanded_keys.clear()
+        dict.clear(self)
+
+    def __iter__(self):
+        # keys need no expanding, overridden to make dict(obj) and {**obj} read values by __getitem__
+        return dict.__iter__(self)
+
+    def values(self):
+        self._expand_all()
+        return dict.values(self)
+
+    def items(self):
+        self._expand_all()
+        return dict.items(self)
+
+    def copy(self):
+        self._expand_all()
+        return dict(self.items())
+
+    def __eq__(self, other):
+        self._expand_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        self._expand_all()
+        return dict.__ne__(self, other)
+
+    __hash__ = None
+
+    def __or__(self, other):
+        self._expand_all()
+        return dict.__or__(self, other)
+
+    def __ror__(self, other):
+        self._expand_all()
+        return dict.__ror__(self, other)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __repr__(self):
+        self._expand_all()
+        return dict.__repr__(self)
+
+    def __reduce_ex__(self, protocol):
+        # copied, deep copied and pickled as plain dict
+        return dict, (self.copy(),)
+
+
+def _expand_lazily(target: Any) -> Any:
+    if isinstance(target, str):
+        decoded = _decode_json_string(target)
+        if decoded is target:
             return target
-        return expand_nested_json(target)
+        target = decoded
+
+    if isinstance(target, dict):
+        return _LazyExpandedDict(target)
     elif isinstance(target, list):
-        decoded_target = []
-        for i in target:
-            decoded_target.append(expand_nested_json(i))
-        return decoded_target
+        return [_expand_lazily(item) for item in target]
     else:
         return target
+
+
+def expand_nested_json_lazily(target: Any) -> Any:
+    """
+    Same as expand_nested_json, but values of dicts are expanded on first access.
+
+    Note:
+        Dicts and lists are wrapped in new objects, the original object (argument target) will not be changed.
+
+    >>> expanded_obj = expand_nested_json_lazily({"foo": "{\\"bar\\":\\"baz\\"}", "qux": "[\\"x\\"]"})
+    >>> expanded_obj["foo"]
+    {'bar': 'baz'}
+    >>> expanded_obj == {"foo": {"bar": "baz"}, "qux": ["x"]}
+    True
+    """
+    return _expand_lazily(target)
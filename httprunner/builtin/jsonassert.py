@@ -8,6 +8,7 @@ from httprunner.builtin.jsoncomparator.jsonassert import (
     json_contains_v2,
     json_equal_v2,
 )
+from httprunner.builtin.jsoncomparator.util import are_type_groups_ignored
 
 
 def json_assert(
@@ -54,20 +55,22 @@ def json_assert(
         **deepdiff_kwargs,
     )
 
+    # unexpected dictionary items are allowed in non-strict mode, they are not formatted either
+    if not strict and "dictionary_item_added" in ddiff:
+        ddiff.pop("dictionary_item_added")
+
+    if len(ddiff) == 0:
+        return None
+
+    # format the diff only if it's not empty
     formatter = DeepDiffFormatter(strict, ddiff)
     formatter.format()
     formatted_string = formatter.formatted_string
 
-    if not strict and "dictionary_item_added" in ddiff.to_dict().keys():
-        ddiff.pop("dictionary_item_added")
-
     if make_assertion:
-        assert len(ddiff) == 0, f"{message}\n{formatted_string}"
-    else:
-        if len(ddiff) == 0:
-            return None
-        else:
-            return formatted_string
+        raise AssertionError(f"{message}\n{formatted_string}")
+
+    return formatted_string
 
 
 def json_contains(
@@ -83,10 +86,9 @@ def json_contains(
     """Equivalent to the non-strict mode of java unit test lib JSONassert.
 
     By default, use java JSONassert (re-implemented with Python) as the comparator,
+    ignore_string_type_changes and ignore_numeric_type_changes are supported by it too,
     fallback to deepdiff version if any of the following conditions are met:
-        * ignore_string_type_changes is True
-        * ignore_numeric_type_changes is True
-        * ignore_type_in_groups is not None
+        * ignore_type_in_groups has groups of types not compared as the same JSON type, e.g. (int, str)
         * other_deepdiff_kwargs is not empty
         * expected_value is neither a dict nor a list
         * check_value is neither a dict nor a list
@@ -97,12 +99,14 @@ def json_contains(
     """
     # fallback to deepdiff version if any of the following conditions are met.
     if (
-        ignore_string_type_changes
-        or ignore_numeric_type_changes
-        or ignore_type_in_groups
-        or other_deepdiff_kwargs
+        other_deepdiff_kwargs
         or not isinstance(expect_value, (dict, list))
         or not isinstance(check_value, (dict, list))
+        or not are_type_groups_ignored(
+            ignore_type_in_groups,
+            ignore_string_type_changes,
+            ignore_numeric_type_changes,
+        )
     ):
         deepdiff_kwargs = {
             "ignore_string_type_changes": ignore_string_type_changes,
@@ -125,7 +129,13 @@ def json_contains(
         )
 
     # use java JSONassert (re-implemented with Python) as the comparator
-    json_contains_v2(check_value, expect_value, message)
+    json_contains_v2(
+        check_value,
+        expect_value,
+        message,
+        ignore_string_type_changes=ignore_string_type_changes,
+        ignore_numeric_type_changes=ignore_numeric_type_changes,
+    )
 
 
 def json_equal(
@@ -141,10 +151,9 @@ def json_equal(
     """Equivalent to the strict mode of java unit test lib JSONassert.
 
     By default, use java JSONassert (re-implemented with Python) as the comparator,
+    ignore_string_type_changes and ignore_numeric_type_changes are supported by it too,
     fallback to deepdiff version if any of the following conditions are met:
-        * ignore_string_type_changes is True
-        * ignore_numeric_type_changes is True
-        * ignore_type_in_groups is not None
+        * ignore_type_in_groups has groups of types not compared as the same JSON type, e.g. (int, str)
         * other_deepdiff_kwargs is not empty
         * expected_value is neither a dict nor a list
         * check_value is neither a dict nor a list
@@ -155,12 +164,14 @@ def json_equal(
     """
     # fallback to deepdiff version if any of the following conditions are met.
     if (
-        ignore_string_type_changes
-        or ignore_numeric_type_changes
-        or ignore_type_in_groups
-        or other_deepdiff_kwargs
+        other_deepdiff_kwargs
         or not isinstance(expect_value, (dict, list))
         or not isinstance(check_value, (dict, list))
+        or not are_type_groups_ignored(
+            ignore_type_in_groups,
+            ignore_string_type_changes,
+            ignore_numeric_type_changes,
+        )
     ):
         deepdiff_kwargs = {
             "ignore_string_type_changes": ignore_string_type_changes,
@@ -183,7 +194,13 @@ def json_equal(
         )
 
     # use java JSONassert (re-implemented with Python) as the comparator
-    json_equal_v2(check_value, expect_value, message)
+    json_equal_v2(
+        check_value,
+        expect_value,
+        message,
+        ignore_string_type_changes=ignore_string_type_changes,
+        ignore_numeric_type_changes=ignore_numeric_type_changes,
+    )
 
 
 def get_json_contains_diff_message(
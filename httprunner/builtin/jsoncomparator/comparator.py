@@ -1,49 +1,78 @@
 """Main module for JSON comparator."""
 
 import json
-from typing import Any
+from typing import Any, Optional
 
 from httprunner.builtin.jsoncomparator import util
 from httprunner.builtin.jsoncomparator.result import JSONCompareResult
+from httprunner.builtin.jsoncomparator.util import FieldPath
 
 
 class JSONComparator:
     """Main class for JSON comparator."""
 
-    def __init__(self, is_strict: bool = False) -> None:
+    def __init__(
+        self,
+        is_strict: bool = False,
+        *,
+        ignore_string_type_changes: bool = False,
+        ignore_numeric_type_changes: bool = False,
+    ) -> None:
         """Init the JSONComparator.
 
         ref: https://github.com/skyscreamer/JSONassert
 
         :param is_strict: whether to compare with strict mode, default is False. \
-            The original JSON comparison logic has four modes: STRICT, LENIENT, NON_EXTENSIBLE, STRICT_ORDER, \
+            The original JSONassert has four modes: STRICT, LENIENT, NON_EXTENSIBLE, STRICT_ORDER, \
             but we only implement two of them: STRICT and LENIENT. \
             If is_strict is True, then compare with STRICT mode, otherwise compare with LENIENT mode.
+        :param ignore_string_type_changes: whether to ignore string type changes or not, \
+            if True, bytes are decoded with UTF-8 and compared as strings, e.g. b"Hello" vs. "Hello" are the same.
+        :param ignore_numeric_type_changes: whether to ignore numeric type changes or not, \
+            if True, numbers other than int and float (e.g. Decimal) are compared as float. \
+            Note that int and float are always compared by value, e.g. 10 vs. 10.0 are the same.
         """
         self.is_strict = is_strict
+        self.ignore_string_type_changes = ignore_string_type_changes
+        self.ignore_numeric_type_changes = ignore_numeric_type_changes
+
+    def _normalize(self, value: Any) -> Any:
+        """Convert values to be compared as JSON types if any type changes are ignored."""
+        if not (self.ignore_string_type_changes or self.ignore_numeric_type_changes):
+            return value
+
+        return util.normalize_json_types(
+            value, self.ignore_string_type_changes, self.ignore_numeric_type_changes
+        )
 
     def _compare_field_values(
-        self, prefix: str, expected: Any, actual: Any, result: JSONCompareResult
+        self,
+        path: FieldPath,
+        expected: Any,
+        actual: Any,
+        result: JSONCompareResult,
+        stack: list,
     ):
         """Compare the expected field value with the actual field value.
 
-        :param prefix: field path prefix.
+        :param path: field path, built to string only when a failed field is recorded.
         :param expected: the expected field value.
         :param actual: the actual field value.
         :param result: JSONCompareResult instance.
+        :param stack: work stack, comparisons of child fields are pushed onto it.
         """
         # Fail the comparison if any one is not a valid JSON type.
         if not util.is_valid_json_type(expected):
             result.fail(
-                f"{prefix}: The expected item's type ({type(expected)}) is not a valid JSON data type, "
-                "only the following types are allowed: "
+                f"{util.build_field_path(path)}: The expected item's type ({type(expected)}) "
+                "is not a valid JSON data type, only the following types are allowed: "
                 "number (int, float), string (str), boolean (bool), array (list), object (dict), null (None)\n"
             )
             return
         elif not util.is_valid_json_type(actual):
             result.fail(
-                f"{prefix}: The actual item's type ({type(actual)}) is not a valid JSON data type, "
-                "only the following types are allowed: "
+                f"{util.build_field_path(path)}: The actual item's type ({type(actual)}) "
+                "is not a valid JSON data type, only the following types are allowed: "
                 "number (int, float), string (str), boolean (bool), array (list), object (dict), null (None)\n"
             )
             return
@@ -56,129 +85,168 @@ class JSONComparator:
         ):
             # Mark as mismatched field if the two numbers are not equal.
             if expected != actual:
-                result.add_mismatch_field(prefix, expected, actual)
+                result.add_mismatch_field(util.build_field_path(path), expected, actual)
             return
 
         # Except numbers, two values to be compared must have the same JSON type.
         elif not util.is_same_json_type(actual, expected):
-            result.add_mismatch_field(prefix, expected, actual)
+            result.add_mismatch_field(util.build_field_path(path), expected, actual)
             return
 
         # Both are simple values, compare them directly.
         elif util.is_simple_value(expected):
             if expected != actual:
-                result.add_mismatch_field(prefix, expected, actual)
+                result.add_mismatch_field(util.build_field_path(path), expected, actual)
             return
 
         # Both are JSON objects, call compare_json_objects.
         elif isinstance(expected, dict):
-            self._compare_json_objects(prefix, expected, actual, result)
+            self._compare_json_objects(path, expected, actual, result, stack)
             return
 
         # Both are JSON arrays, call compare_json_arrays.
         elif isinstance(expected, list):
-            self._compare_json_arrays(prefix, expected, actual, result)
+            self._compare_json_arrays(path, expected, actual, result, stack)
             return
         else:
             result.fail("Unknown error occurred")
 
-    def _check_expected_json_object_keys_in_actual(
-        self, prefix: str, expected: dict, actual: dict, result: JSONCompareResult
+    def _add_missing_key(
+        self,
+        path: FieldPath,
+        expected_object_key: Any,
+        actual: None,
+        result: JSONCompareResult,
+        stack: list,
     ):
-        """Check keys of expected JSON object are all in actual JSON object.
-
-        :param prefix: field path prefix.
-        :param expected: expected JSON object.
-        :param actual: actual JSON object.
-        :param result: a JSONCompareResult instance.
-        """
-        for expected_object_key, expected_object_value in expected.items():
-            if expected_object_key in actual:
-                # Key exists both in expected and actual, need to compare field values.
-                self._compare_field_values(
-                    util.qualify_field_path(prefix, expected_object_key),
-                    expected_object_value,
-                    actual[expected_object_key],
-                    result,
-                )
-            else:
-                # Keys that exist in expected but not in actual are missing fields.
-                result.add_missing_field(
-                    prefix,
-                    expected_object_key,
-                )
+        """Add a key that exists in expected JSON object but not in actual JSON object as missing field."""
+        result.add_missing_field(util.build_field_path(path), expected_object_key)
 
     def _check_actual_json_object_keys_in_expected(
-        self, prefix: str, expected: dict, actual: dict, result: JSONCompareResult
+        self,
+        path: FieldPath,
+        expected: dict,
+        actual: dict,
+        result: JSONCompareResult,
+        stack: list,
     ):
         """Check keys of actual JSON object are all in expected JSON object.
 
         Call this method only when is_strict is True.
 
-        :param prefix: field path prefix.
+        :param path: field path.
         :param expected: expected JSON object.
         :param actual: actual JSON object.
         :param result: a JSONCompareResult instance.
+        :param stack: work stack.
         """
         # In STRICT mode, keys that exist in actual but not in expected are unexpected fields.
-        for key in set(actual.keys()) - set(expected.keys()):
-            result.add_unexpected_field(prefix, key)
+        unexpected_keys = set(actual.keys()) - set(expected.keys())
+        if not unexpected_keys:
+            return
+
+        field_path = util.build_field_path(path)
+        for key in unexpected_keys:
+            result.add_unexpected_field(field_path, key)
 
     def _compare_json_objects(
-        self, prefix: str, expected: dict, actual: dict, result: JSONCompareResult
+        self,
+        path: FieldPath,
+        expected: dict,
+        actual: dict,
+        result: JSONCompareResult,
+        stack: list,
     ):
         """Compare two JSON objects.
 
-        :param prefix: field path prefix.
+        Checks are pushed onto the stack in reverse order, so that they are done in the order of keys.
+
+        :param path: field path.
         :param expected: expected JSON object.
         :param actual: actual JSON object.
         :param result: a JSONCompareResult instance.
+        :param stack: work stack.
         """
-        # Check that every key of expected JSON object is in actual JSON object.
-        self._check_expected_json_object_keys_in_actual(
-            prefix, expected, actual, result
-        )
-
-        # If is_strict is True, check that every key of actual JSON object is in expected JSON object.
+        # If is_strict is True, check that every key of actual JSON object is in expected JSON object,
+        # after all fields of the JSON object are compared.
         if self.is_strict:
-            self._check_actual_json_object_keys_in_expected(
-                prefix, expected, actual, result
+            stack.append(
+                (
+                    self._check_actual_json_object_keys_in_expected,
+                    path,
+                    expected,
+                    actual,
+                )
             )
 
+        # Check that every key of expected JSON object is in actual JSON object.
+        for expected_object_key in reversed(expected):
+            if expected_object_key in actual:
+                # Key exists both in expected and actual, need to compare field values.
+                stack.append(
+                    (
+                        self._compare_field_values,
+                        (path, util.KEY_SEGMENT, expected_object_key),
+                        expected[expected_object_key],
+                        actual[expected_object_key],
+                    )
+                )
+            else:
+                # Keys that exist in expected but not in actual are missing fields.
+                stack.append((self._add_missing_key, path, expected_object_key, None))
+
     def _compare_json_arrays_with_strict_order(
-        self, prefix: str, expected: list, actual: list, result: JSONCompareResult
+        self,
+        path: FieldPath,
+        expected: list,
+        actual: list,
+        result: JSONCompareResult,
+        stack: list,
     ):
         """Compare two JSON arrays with strict order.
 
         The values in the same index should match.
 
-        :param prefix: field path prefix.
+        :param path: field path.
         :param expected: expected JSON array.
         :param actual: actual JSON array.
         :param result: a JSONCompareResult instance.
+        :param stack: work stack.
         """
-        for expected_array_index, expected_array_value in enumerate(expected):
-            self._compare_field_values(
-                f"{prefix}[{expected_array_index}]",
-                expected_array_value,
-                actual[expected_array_index],
-                result,
+        for expected_array_index in range(len(expected) - 1, -1, -1):
+            stack.append(
+                (
+                    self._compare_field_values,
+                    (path, util.INDEX_SEGMENT, expected_array_index),
+                    expected[expected_array_index],
+                    actual[expected_array_index],
+                )
             )
 
     def _compare_json_arrays_all_simple_values(
-        self, prefix: str, expected: list, actual: list, result: JSONCompareResult
+        self,
+        path: FieldPath,
+        expected: list,
+        actual: list,
+        result: JSONCompareResult,
+        stack: list,
     ):
         """Compare two JSON arrays with all values being simple values.
 
         The comparison is done in non strict mode, so the order of the values does not matter.
 
-        :param prefix: field path prefix.
+        :param path: field path.
         :param expected: expected JSON array.
         :param actual: actual JSON array.
         :param result: a JSONCompareResult instance.
+        :param stack: work stack.
         """
         expected_item_to_count_mapping = util.get_cardinality_mapping(expected)
         actual_item_to_count_mapping = util.get_cardinality_mapping(actual)
+        if expected_item_to_count_mapping == actual_item_to_count_mapping:
+            return
+
+        prefix = util.build_field_path(path)
 
         # Iterate over the expected mapping to find missing and mismatched items.
         for expected_item, expected_count in expected_item_to_count_mapping.items():
@@ -205,22 +273,72 @@ class JSONComparator:
                     f"{prefix}[]", util.get_actual_value(actual_item), False
                 )
 
+    def _add_missing_unique_key_item(
+        self,
+        path: FieldPath,
+        expected_json_object: dict,
+        actual: None,
+        result: JSONCompareResult,
+        stack: list,
+    ):
+        """Add an item of expected JSON array whose unique key value is not in actual JSON array as missing field."""
+        result.add_missing_field(
+            util.build_field_path(path), expected_json_object, False
+        )
+
+    def _check_unexpected_unique_key_items(
+        self,
+        path: FieldPath,
+        expected: tuple[str, dict],
+        actual_mapping: dict,
+        result: JSONCompareResult,
+        stack: list,
+    ):
+        """Add items of actual JSON array whose unique key values are not in expected JSON array as unexpected fields.
+
+        :param path: field path of the JSON arrays.
+        :param expected: a tuple of (unique_key, expected_mapping).
+        :param actual_mapping: mapping of actual JSON array, converted by the unique key.
+        :param result: a JSONCompareResult instance.
+        :param stack: work stack.
+        """
+        unique_key, expected_mapping = expected
+        for unique_key_value, actual_json_object in actual_mapping.items():
+            if unique_key_value not in expected_mapping:
+                result.add_unexpected_field(
+                    util.build_field_path(
+                        (
+                            path,
+                            util.UNIQUE_KEY_SEGMENT,
+                            (unique_key, util.get_actual_value(unique_key_value)),
+                        )
+                    ),
+                    actual_json_object,
+                    False,
+                )
+
     def _compare_json_arrays_all_json_objects(
-        self, prefix: str, expected: list, actual: list, result: JSONCompareResult
+        self,
+        path: FieldPath,
+        expected: list,
+        actual: list,
+        result: JSONCompareResult,
+        stack: list,
     ):
         """Compare two JSON arrays with all values being JSON objects.
 
-        :param prefix: the field path prefix.
+        :param path: field path.
         :param expected: expected JSON array.
         :param actual: actual JSON array.
         :param result: a JSONCompareResult instance.
+        :param stack: work stack.
         """
         unique_key = util.find_unique_key(expected)
 
         # If no unique key found from expected or the unique key was not unique in actual JSON array,
         # we have to compare them with an expensive way.
         if not unique_key or not util.is_usable_as_unique_key(unique_key, actual):
-            self._compare_json_arrays_recursively(prefix, expected, actual, result)
+            self._compare_json_arrays_recursively(path, expected, actual, result)
             return
 
         # If a unique key was found, convert the JSON arrays to dictionaries and compare them.
@@ -231,49 +349,82 @@ class JSONComparator:
             actual, unique_key
         )
 
+        # Find unexpected items after all items in the expected mapping are compared.
+        stack.append(
+            (
+                self._check_unexpected_unique_key_items,
+                path,
+                (unique_key, expected_mapping),
+                actual_mapping,
+            )
+        )
+
         # Iterate over the expected mapping to find missing and mismatched items.
-        for unique_key_value, expected_json_object in expected_mapping.items():
+        for unique_key_value in reversed(expected_mapping):
+            expected_json_object = expected_mapping[unique_key_value]
+            item_path = (
+                path,
+                util.UNIQUE_KEY_SEGMENT,
+                (unique_key, util.get_actual_value(unique_key_value)),
+            )
+
             # If any value of the unique key is not in the actual mapping, this item is a missing item.
             if unique_key_value not in actual_mapping:
-                result.add_missing_field(
-                    util.format_unique_key(
-                        prefix, unique_key, util.get_actual_value(unique_key_value)
-                    ),
-                    expected_json_object,
-                    False,
+                stack.append(
+                    (
+                        self._add_missing_unique_key_item,
+                        item_path,
+                        expected_json_object,
+                        None,
+                    )
                 )
                 continue
 
             # If the unique key value is in the actual mapping, compare the two JSON objects.
-            self._compare_field_values(
-                util.format_unique_key(
-                    prefix, unique_key, util.get_actual_value(unique_key_value)
-                ),
-                expected_json_object,
-                actual_mapping[unique_key_value],
-                result,
-            )
-
-        # Iterate over the actual mapping to find unexpected items.
-        for unique_key_value, actual_json_object in actual_mapping.items():
-            if unique_key_value not in expected_mapping:
-                result.add_unexpected_field(
-                    util.format_unique_key(
-                        prefix, unique_key, util.get_actual_value(unique_key_value)
-                    ),
-                    actual_json_object,
-                    False,
+            stack.append(
+                (
+                    self._compare_field_values,
+                    item_path,
+                    expected_json_object,
+                    actual_mapping[unique_key_value],
                 )
+            )
 
     def _compare_json_arrays_recursively(
-        self, prefix: str, expected: list, actual: list, result: JSONCompareResult
+        self, path: FieldPath, expected: list, actual: list, result: JSONCompareResult
     ):
         """Compare two JSON arrays recursively.
 
-        This is expensive (O(n^2)), but may be the only resort for some cases with loose array ordering, and no
-        easy way to uniquely identify each element.
+        This may be the only resort for some cases with loose array ordering, and no easy way to uniquely identify
+        each element. It is O(n^2) in the worst case, e.g. all items have the same fingerprint.
 
-        :param prefix: field path prefix.
+        :param path: field path.
+        :param expected: expected JSON array.
+        :param actual: actual JSON array.
+        :param result: a JSONCompareResult instance.
+        """
+        # Items are bucketed by fingerprints, so that an expected item is only compared with
+        # actual items which may match it, the result is the same as comparing with all of them.
+        candidate_indexes = util.get_candidate_indexes(expected, actual)
+        if candidate_indexes is None:
+            # Some items are not valid JSON types, compare them one by one to report it.
+            self._compare_json_arrays_one_by_one(path, expected, actual, result)
+            return
+
+        unmatched_index = self._find_unmatched_array_item(
+            expected, actual, candidate_indexes
+        )
+        if unmatched_index is not None:
+            self._fail_array_item_not_found(
+                path, unmatched_index, expected[unmatched_index], result
+            )
+
+    def _compare_json_arrays_one_by_one(
+        self, path: FieldPath, expected: list, actual: list, result: JSONCompareResult
+    ):
+        """Compare two JSON arrays by comparing each expected item with all actual items.
+
+        :param path: field path.
         :param expected: expected JSON array.
         :param actual: actual JSON array.
         :param result: a JSONCompareResult instance.
@@ -287,7 +438,8 @@ class JSONComparator:
             # Fail the comparison if the expected item is not a valid JSON type.
             if not util.is_valid_json_type(expected_item):
                 result.fail(
-                    f"{prefix}[{expected_index}]: Invalid JSON data type {type(expected_item)} in expected array."
+                    f"{util.build_field_path(path)}[{expected_index}]: "
+                    f"Invalid JSON data type {type(expected_item)} in expected array."
                     f"\nOnly the following types are allowed: "
                     "number (int, float), string (str), boolean (bool), array (list), object (dict), null (None)\n"
                 )
@@ -307,69 +459,95 @@ class JSONComparator:
                 # Fail the comparison if the actual item is not a valid JSON type.
                 elif not util.is_valid_json_type(actual_item):
                     result.fail(
-                        f"{prefix}[{expected_index}]: Invalid JSON data type {type(actual_item)} in actual array."
+                        f"{util.build_field_path(path)}[{expected_index}]: "
+                        f"Invalid JSON data type {type(actual_item)} in actual array."
                         f"\nOnly the following types are allowed: "
                         "number (int, float), string (str), boolean (bool), array (list), object (dict), null (None)\n"
                     )
                     return
 
-                # Compare two numbers with '==' operator.
-                elif (
-                    util.is_number_but_not_bool(expected_item)
-                    and util.is_number_but_not_bool(actual_item)
-                    and expected_item == actual_item
-                ):
+                elif self._matches(expected_item, actual_item):
                     matched_indexes.add(actual_index)
                     match_found = True
                     break
 
-                # Continue if the JSON data type of the two items are different.
-                elif not util.is_same_json_type(actual_item, expected_item):
+            # If no match is found in the inner (actual) loop, fail the comparison.
+            if not match_found:
+                self._fail_array_item_not_found(
+                    path, expected_index, expected_item, result
+                )
+                return
+
+    def _find_unmatched_array_item(
+        self, expected: list, actual: list, candidate_indexes: list[list[int]]
+    ) -> Optional[int]:
+        """Match each expected item with the first unmatched candidate in actual array.
+
+        :param expected: expected JSON array.
+        :param actual: actual JSON array.
+        :param candidate_indexes: candidate indexes of each expected item, got by `util.get_candidate_indexes()`.
+        :return: index of the first expected item having no match, or None if all expected items are matched.
+        """
+        # If one item of actual array matches one in the expected array,
+        # it's index in actual array will be added to the matched_indexes set.
+        matched_indexes = set()
+
+        for expected_index, expected_item in enumerate(expected):
+            for actual_index in candidate_indexes[expected_index]:
+                # Skip the item if it has been matched.
+                if actual_index in matched_indexes:
                     continue
 
-                # The actual item should have the same JSON data type as the expected item,
-                # because data type has been checked above.
-                # Call compare_json() if the the expected item is a JSON object or a JSON array.
-                elif isinstance(expected_item, (dict, list)):
-                    # If the comparison is successful, add the actual index to the matched_indexes set.
-                    if self.compare_json(expected_item, actual_item).is_success:
-                        matched_indexes.add(actual_index)
-                        match_found = True
-                        break
-                # If the expected item is a simple value, compare them directly.
-                elif expected_item == actual_item:
+                if self._matches(expected_item, actual[actual_index]):
                     matched_indexes.add(actual_index)
-                    match_found = True
                     break
+            else:
+                return expected_index
 
-            # If no match is found in the inner (actual) loop, fail the comparison.
-            if not match_found:
-                try:
-                    expected_item_str = json.dumps(expected_item, ensure_ascii=False)
-                except Exception:
-                    expected_item_str = repr(expected_item)
-
-                result.fail(
-                    f"{prefix}[{expected_index}] Could not find match for element {expected_item_str}"
-                )
+        return None
 
-                return
+    def _fail_array_item_not_found(
+        self,
+        path: FieldPath,
+        expected_index: int,
+        expected_item: Any,
+        result: JSONCompareResult,
+    ):
+        """Fail the comparison for no match was found for the expected array item."""
+        try:
+            expected_item_str = json.dumps(expected_item, ensure_ascii=False)
+        except Exception:
+            try:
+                expected_item_str = repr(expected_item)
+            except RecursionError:
+                # the item is nested too deep to be displayed
+                expected_item_str = util.describe_field(expected_item)
+
+        result.fail(
+            f"{util.build_field_path(path)}[{expected_index}] Could not find match for element {expected_item_str}"
+        )
 
     def _compare_json_arrays(
-        self, prefix: str, expected: list, actual: list, result: JSONCompareResult
+        self,
+        path: FieldPath,
+        expected: list,
+        actual: list,
+        result: JSONCompareResult,
+        stack: list,
     ):
         """Compare two JSON arrays.
 
-        :param prefix: field path prefix.
+        :param path: field path.
         :param expected: expected JSON array.
         :param actual: actual JSON array.
         :param result: a JSONCompareResult instance.
+        :param stack: work stack.
         """
         # Compare the length of the two arrays.
         # Fail the comparison if the lengths are different.
         if len(expected) != len(actual):
             result.fail(
-                f"{prefix}[]: Expected {len(expected)} values but got {len(actual)}"
+                f"{util.build_field_path(path)}[]: Expected {len(expected)} values but got {len(actual)}"
             )
             return
         # Return directly if the two arrays are empty.
@@ -379,7 +557,7 @@ class JSONComparator:
         # If is_strict is True, compare the two arrays with strict order.
         if self.is_strict:
             self._compare_json_arrays_with_strict_order(
-                prefix, expected, actual, result
+                path, expected, actual, result, stack
             )
 
         # The other cases, compare the two arrays in non strict mode.
@@ -388,19 +566,142 @@ class JSONComparator:
             expected
         ) and util.is_all_simple_values_array(actual):
             self._compare_json_arrays_all_simple_values(
-                prefix, expected, actual, result
+                path, expected, actual, result, stack
             )
         # If all values in the expected array are JSON objects, call _compare_json_arrays_all_json_objects().
         elif util.is_all_json_objects_array(expected):
-            self._compare_json_arrays_all_json_objects(prefix, expected, actual, result)
+            self._compare_json_arrays_all_json_objects(
+                path, expected, actual, result, stack
+            )
         # Otherwise, call _compare_json_arrays_recursively().
         else:
-            self._compare_json_arrays_recursively(prefix, expected, actual, result)
+            self._compare_json_arrays_recursively(path, expected, actual, result)
+
+    def _match_json_arrays(self, expected: list, actual: list, stack: list) -> bool:
+        """Check two JSON arrays of the same length, items to be compared further are pushed onto the stack.
+
+        :param expected: expected JSON array.
+        :param actual: actual JSON array.
+        :param stack: pairs of (expected, actual) values to be compared.
+        :return: False if the two arrays do not match, True if they match or it depends on items pushed.
+        """
+        if self.is_strict:
+            stack.extend(zip(expected, actual))
+            return True
+
+        if util.is_all_simple_values_array(
+            expected
+        ) and util.is_all_simple_values_array(actual):
+            return util.get_cardinality_mapping(
+                expected
+            ) == util.get_cardinality_mapping(actual)
+
+        if util.is_all_json_objects_array(expected):
+            unique_key = util.find_unique_key(expected)
+            if unique_key and util.is_usable_as_unique_key(unique_key, actual):
+                actual_mapping = util.convert_array_of_json_objects_to_mapping(
+                    actual, unique_key
+                )
+                # Both mappings have the same size, so no unexpected item exists if no item is missing.
+                for (
+                    unique_key_value,
+                    expected_json_object,
+                ) in util.convert_array_of_json_objects_to_mapping(
+                    expected, unique_key
+                ).items():
+                    if unique_key_value not in actual_mapping:
+                        return False
+                    stack.append(
+                        (expected_json_object, actual_mapping[unique_key_value])
+                    )
+                return True
+
+        candidate_indexes = util.get_candidate_indexes(expected, actual)
+        if candidate_indexes is None:
+            # Arrays containing items not valid JSON types never match.
+            return False
+
+        # If each expected item has only one candidate and no candidate is shared,
+        # the two arrays match if every expected item matches its candidate.
+        if all(len(indexes) == 1 for indexes in candidate_indexes) and len(
+            {indexes[0] for indexes in candidate_indexes}
+        ) == len(candidate_indexes):
+            stack.extend(
+                (expected_item, actual[indexes[0]])
+                for expected_item, indexes in zip(expected, candidate_indexes)
+            )
+            return True
+
+        return (
+            self._find_unmatched_array_item(expected, actual, candidate_indexes) is None
+        )
+
+    def matches(self, expected: Any, actual: Any) -> bool:
+        """Returns True if the two values match, it's the same as `compare_json(expected, actual).is_success`.
+
+        It returns at the first difference found, without building any fail message,
+        so it's used to test for a match when the details of differences are not needed.
+        """
+        return self._matches(self._normalize(expected), self._normalize(actual))
+
+    def _matches(self, expected: Any, actual: Any) -> bool:
+        """Implementation of matches(), values should have been normalized."""
+        stack = [(expected, actual)]
+        while stack:
+            expected, actual = stack.pop()
+
+            if not util.is_valid_json_type(expected) or not util.is_valid_json_type(
+                actual
+            ):
+                return False
+
+            elif util.is_number_but_not_bool(expected) and util.is_number_but_not_bool(
+                actual
+            ):
+                if expected != actual:
+                    return False
+
+            elif not util.is_same_json_type(actual, expected):
+                return False
+
+            elif util.is_simple_value(expected):
+                if expected != actual:
+                    return False
+
+            elif isinstance(expected, dict):
+                for key, value in expected.items():
+                    if key not in actual:
+                        return False
+                    stack.append((value, actual[key]))
+
+                if self.is_strict and any(key not in expected for key in actual):
+                    return False
+
+            elif isinstance(expected, list):
+                if len(expected) != len(actual):
+                    return False
+                elif expected and not self._match_json_arrays(expected, actual, stack):
+                    return False
+
+            else:
+                return False
+
+        return True
 
     def compare_json(self, expected: Any, actual: Any) -> JSONCompareResult:
-        """Compare two values corresponding to JSON data type."""
-        result = JSONCompareResult()
+        """Compare two values corresponding to JSON data type.
 
-        self._compare_field_values("", expected, actual, result)
+        Fields are compared with an explicit work stack rather than recursive calls,
+        so that deeply nested JSONs are not limited by the recursion limit.
+        """
+        result = JSONCompareResult()
+        expected = self._normalize(expected)
+        actual = self._normalize(actual)
+
+        # Each work is a tuple of (method, path, expected, actual).
+        stack = [(self._compare_field_values, "", expected, actual)]
+        while stack:
+            method, path, expected, actual = stack.pop()
+            method(path, expected, actual, result, stack)
 
         return result
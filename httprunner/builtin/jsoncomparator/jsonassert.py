@@ -8,6 +8,9 @@ def assert_equals(
     actual: Union[dict, list],
     is_strict: bool,
     message: str,
+    *,
+    ignore_string_type_changes: bool = False,
+    ignore_numeric_type_changes: bool = False,
 ) -> None:
     """Assert that the JSON provided matches the expected JSON.
 
@@ -15,8 +18,14 @@ def assert_equals(
     :param actual: the JSON to compare against the expected JSON.
     :param is_strict: compare the JSON strictly or not.
     :param message: the message to display if the assertion fails.
+    :param ignore_string_type_changes: compare bytes as strings or not.
+    :param ignore_numeric_type_changes: compare numbers other than int and float (e.g. Decimal) as float or not.
     """
-    json_comparator = JSONComparator(is_strict)
+    json_comparator = JSONComparator(
+        is_strict,
+        ignore_string_type_changes=ignore_string_type_changes,
+        ignore_numeric_type_changes=ignore_numeric_type_changes,
+    )
     result = json_comparator.compare_json(expected, actual)
 
     if not result.is_success:
@@ -30,15 +39,35 @@ def json_contains_v2(
     check_value: Union[dict, list],
     expect_value: Union[dict, list],
     message: str = "",
+    *,
+    ignore_string_type_changes: bool = False,
+    ignore_numeric_type_changes: bool = False,
 ) -> None:
     """Comparator for HttpRunner, non-strict mode of JSONassert."""
-    assert_equals(expect_value, check_value, False, message)
+    assert_equals(
+        expect_value,
+        check_value,
+        False,
+        message,
+        ignore_string_type_changes=ignore_string_type_changes,
+        ignore_numeric_type_changes=ignore_numeric_type_changes,
+    )
 
 
 def json_equal_v2(
     check_value: Union[dict, list],
     expect_value: Union[dict, list],
     message: str = "",
+    *,
+    ignore_string_type_changes: bool = False,
+    ignore_numeric_type_changes: bool = False,
 ) -> None:
     """Comparator for HttpRunner, strict mode of JSONassert."""
-    assert_equals(expect_value, check_value, True, message)
+    assert_equals(
+        expect_value,
+        check_value,
+        True,
+        message,
+        ignore_string_type_changes=ignore_string_type_changes,
+        ignore_numeric_type_changes=ignore_numeric_type_changes,
+    )
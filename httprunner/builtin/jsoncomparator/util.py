@@ -1,9 +1,13 @@
 import json
 from numbers import Number
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 SALT = "__SALT__"
 
+# floats are compared to 12 digits after the decimal point if numeric type changes are ignored,
+# the default of deepdiff when ignore_numeric_type_changes is True
+SIGNIFICANT_DIGITS_WHEN_IGNORE_NUMERIC_TYPES = 12
+
 
 def is_simple_value(value: Any):
     """The value has a simple data type (neither dict nor list).
@@ -221,3 +225,279 @@ def describe_field(field_value: Any, is_field_path: bool = False) -> str:
     else:
         # display string without quotes if it's a field path
         return field_value
+
+
+# Fields of JSON objects nested deeper than this are not taken into fingerprints.
+MAX_SHAPE_DEPTH = 8
+
+
+def get_json_shape(value: Any, depth: int = 0) -> tuple:
+    """Get the shape of a JSON value, it describes which fields of a value are taken into a fingerprint.
+
+    The shape of a JSON object consists of its keys and the shapes of their values,
+    arrays and simple values have fixed shapes, values nested deeper than MAX_SHAPE_DEPTH match any shape.
+
+    :param value: the value to get shape of.
+    :param depth: depth of the value.
+    :raises TypeError: the value is not a valid JSON type, or contains values not valid JSON type.
+    """
+    if depth > MAX_SHAPE_DEPTH:
+        return ("any",)
+    elif isinstance(value, dict):
+        return (
+            "object",
+            frozenset(
+                (key, get_json_shape(item, depth + 1)) for key, item in value.items()
+            ),
+        )
+    elif isinstance(value, list):
+        return ("array",)
+    elif is_simple_value(value):
+        return ("simple",)
+
+    raise TypeError(f"{type(value)} is not a valid JSON data type")
+
+
+def get_json_fingerprint(value: Any, shape: tuple) -> Optional[tuple]:
+    """Get the fingerprint of a JSON value projected to the shape.
+
+    Fingerprints respect the lenient comparison, two values can only match if their fingerprints
+    projected to the shape of the expected value are equal:
+      - 1 and 1.0 have the same fingerprint, while True and 1 do not
+      - keys of JSON objects not in the shape are left out, so extra keys are allowed
+      - only the length of JSON arrays is taken, for items of arrays can be in any order
+
+    :param value: the value to get fingerprint of.
+    :param shape: the shape got by `get_json_shape()` from the expected value.
+    :return: the fingerprint, or None if the value can never match a value with the shape.
+    """
+    kind = shape[0]
+    if kind == "any":
+        return shape
+    elif kind == "object":
+        if not isinstance(value, dict):
+            return None
+
+        fields = []
+        for key, item_shape in shape[1]:
+            if key not in value:
+                return None
+
+            item_fingerprint = get_json_fingerprint(value[key], item_shape)
+            if item_fingerprint is None:
+                return None
+
+            fields.append((key, item_fingerprint))
+
+        return "object", frozenset(fields)
+
+    elif kind == "array":
+        return ("array", len(value)) if isinstance(value, list) else None
+
+    elif isinstance(value, bool):
+        # True and 1 are different JSON types
+        return "boolean", value
+    elif is_number_but_not_bool(value):
+        # 1.0 == 1 and hash(1.0) == hash(1)
+        return ("number", value) if is_simple_value(value) else None
+    elif value is None:
+        return ("null",)
+    elif isinstance(value, str):
+        return "string", value
+
+    return None
+
+
+def get_candidate_indexes(expected: list, actual: list) -> Optional[list[list[int]]]:
+    """Get indexes of actual items which may match each expected item, in ascending order.
+
+    Items are bucketed by fingerprints, so that an expected item is only compared with actual items
+    in the same bucket rather than all of them.
+
+    :param expected: expected JSON array.
+    :param actual: actual JSON array.
+    :return: candidate indexes of each expected item, \
+        or None if any item is not a valid JSON type, items should be compared one by one then.
+    """
+    try:
+        expected_shapes = [get_json_shape(item) for item in expected]
+    except TypeError:
+        return None
+
+    if not all(is_valid_json_type(item) for item in actual):
+        return None
+
+    # fingerprint -> indexes of actual items, for each shape of expected items
+    shape_to_buckets_mapping: dict[tuple, dict[tuple, list[int]]] = {}
+    candidate_indexes = []
+    for expected_item, shape in zip(expected, expected_shapes):
+        buckets = shape_to_buckets_mapping.get(shape)
+        if buckets is None:
+            buckets = shape_to_buckets_mapping[shape] = {}
+            for actual_index, actual_item in enumerate(actual):
+                fingerprint = get_json_fingerprint(actual_item, shape)
+                if fingerprint is not None:
+                    buckets.setdefault(fingerprint, []).append(actual_index)
+
+        candidate_indexes.append(
+            buckets.get(get_json_fingerprint(expected_item, shape), [])
+        )
+
+    return candidate_indexes
+
+
+# Field paths are built lazily, a path is either the root path "" or a tuple of (parent_path, kind, segment),
+# it's converted to string by `build_field_path()` only when a failed field is recorded.
+FieldPath = Union[str, tuple]
+KEY_SEGMENT = "key"
+INDEX_SEGMENT = "index"
+UNIQUE_KEY_SEGMENT = "unique_key"
+
+
+def build_field_path(path: FieldPath) -> str:
+    """Build the string of a lazily constructed field path.
+
+    :param path: the root path "" or a tuple of (parent_path, kind, segment), \
+        the segment of a unique key path is a tuple of (unique_key, unique_key_value).
+    """
+    segments = []
+    while isinstance(path, tuple):
+        path, kind, segment = path
+        segments.append((kind, segment))
+
+    field_path = path
+    for kind, segment in reversed(segments):
+        if kind == KEY_SEGMENT:
+            field_path = qualify_field_path(field_path, segment)
+        elif kind == INDEX_SEGMENT:
+            field_path = f"{field_path}[{segment}]"
+        else:
+            unique_key, unique_key_value = segment
+            field_path = format_unique_key(field_path, unique_key, unique_key_value)
+
+    return field_path
+
+
+def _normalize_simple_value(
+    value: Any, ignore_string_type_changes: bool, ignore_numeric_type_changes: bool
+) -> Any:
+    """Convert bytes to str, or numbers other than int and float to float, floats are rounded."""
+    if ignore_string_type_changes and isinstance(value, bytes):
+        try:
+            return value.decode("utf-8")
+        except UnicodeDecodeError:
+            return value
+
+    if not ignore_numeric_type_changes:
+        return value
+
+    if isinstance(value, Number) and not isinstance(value, (bool, int, float, complex)):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return value
+
+    if isinstance(value, float):
+        # the same as deepdiff, e.g. 0.1 + 0.2 vs. 0.3 are the same
+        return round(value, SIGNIFICANT_DIGITS_WHEN_IGNORE_NUMERIC_TYPES)
+
+    return value
+
+
+def normalize_json_types(
+    value: Any, ignore_string_type_changes: bool, ignore_numeric_type_changes: bool
+) -> Any:
+    """Copy the value with bytes converted to str and numbers other than int and float converted to float.
+
+    JSON objects and arrays are copied as dict and list, the original value is not modified.
+
+    :param value: the value to normalize.
+    :param ignore_string_type_changes: convert bytes to str if True.
+    :param ignore_numeric_type_changes: convert numbers other than int and float (e.g. Decimal) to float if True.
+    """
+    if not isinstance(value, (dict, list)):
+        return _normalize_simple_value(
+            value, ignore_string_type_changes, ignore_numeric_type_changes
+        )
+
+    root = {} if isinstance(value, dict) else []
+    stack = [(value, root)]
+    while stack:
+        source, target = stack.pop()
+        items = source.items() if isinstance(source, dict) else enumerate(source)
+        for key, item in items:
+            if isinstance(item, (dict, list)):
+                normalized_item = {} if isinstance(item, dict) else []
+                stack.append((item, normalized_item))
+            else:
+                normalized_item = _normalize_simple_value(
+                    item, ignore_string_type_changes, ignore_numeric_type_changes
+                )
+
+            if isinstance(target, dict):
+                target[key] = normalized_item
+            else:
+                target.append(normalized_item)
+
+    return root
+
+
+def is_type_group_ignored(
+    group: Any, ignore_string_type_changes: bool, ignore_numeric_type_changes: bool
+) -> bool:
+    """Returns True if types in the group are compared as the same type by JSONComparator.
+
+    That is all types are JSON objects, or JSON arrays, or numbers, or strings.
+
+    :param group: a group of types, as `ignore_type_in_groups` of DeepDiff.
+    :param ignore_string_type_changes: whether bytes are compared as str.
+    :param ignore_numeric_type_changes: whether numbers other than int and float are compared as float.
+    """
+    if not isinstance(group, (list, tuple)) or not all(
+        isinstance(type_, type) for type_ in group
+    ):
+        return False
+
+    def is_number_type(type_: type) -> bool:
+        if issubclass(type_, (bool, complex)):
+            return False
+        elif issubclass(type_, (int, float)):
+            return True
+        return ignore_numeric_type_changes and issubclass(type_, Number)
+
+    def is_string_type(type_: type) -> bool:
+        return type_ is str or (ignore_string_type_changes and type_ is bytes)
+
+    return (
+        all(issubclass(type_, dict) for type_ in group)
+        or all(issubclass(type_, list) for type_ in group)
+        or all(is_number_type(type_) for type_ in group)
+        or all(is_string_type(type_) for type_ in group)
+    )
+
+
+def are_type_groups_ignored(
+    ignore_type_in_groups: Any,
+    ignore_string_type_changes: bool,
+    ignore_numeric_type_changes: bool,
+) -> bool:
+    """Returns True if all groups of `ignore_type_in_groups` are compared as the same type by JSONComparator.
+
+    Like DeepDiff, `ignore_type_in_groups` can be a list of groups, or a single group of types.
+    """
+    if not ignore_type_in_groups:
+        return True
+
+    if isinstance(ignore_type_in_groups, (list, tuple)) and all(
+        isinstance(type_, type) for type_ in ignore_type_in_groups
+    ):
+        groups = [ignore_type_in_groups]
+    else:
+        groups = ignore_type_in_groups
+
+    return all(
+        is_type_group_ignored(
+            group, ignore_string_type_changes, ignore_numeric_type_changes
+        )
+        for group in groups
+    )
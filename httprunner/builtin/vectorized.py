@@ -0,0 +1,130 @@
+"""
+NumPy implementations of builtin comparators for large homogeneous int or float arrays.
+
+NumPy is optional, every function returns None if NumPy is not installed or the array is not suitable,
+the caller should check the array item by item then.
+"""
+
+from typing import Any, Optional
+
+from httprunner.configs.comparator import comparator_settings
+
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ModuleNotFoundError:
+    np = None
+    NUMPY_READY = False
+
+
+def to_numeric_array(values: Any) -> Optional["np.ndarray"]:
+    """Convert list or tuple of int or float to NumPy array.
+
+    Values must be all int or all float, bool and mixed types are not converted,
+    for NumPy may compare them differently from Python.
+    """
+    if (
+        not NUMPY_READY
+        or not comparator_settings.use_numpy
+        or not isinstance(values, (list, tuple))
+        or len(values) < comparator_settings.numpy_min_size
+    ):
+        return None
+
+    item_types = set(map(type, values))
+    if item_types == {int}:
+        dtype = np.int64
+    elif item_types == {float}:
+        dtype = np.float64
+    else:
+        return None
+
+    try:
+        return np.array(values, dtype=dtype)
+    except OverflowError:
+        # int out of range of int64
+        return None
+
+
+def get_unequal_indexes(values: Any, expect_value: Any) -> Optional[list[int]]:
+    """Get indexes of items not equal to expect_value."""
+    array = to_numeric_array(values)
+    if array is None or type(expect_value) is not type(values[0]):
+        return None
+
+    try:
+        return np.flatnonzero(array != expect_value).tolist()
+    except OverflowError:
+        return None
+
+
+def get_not_close_indexes(
+    values: Any, expect_value: Any, abs_tol: Any
+) -> Optional[list[int]]:
+    """Get indexes of items not close to expect_value, same as `not math.isclose(item, expect_value, abs_tol)`."""
+    array = to_numeric_array(values)
+    if (
+        array is None
+        or type(expect_value) not in (int, float)
+        or type(abs_tol) not in (int, float)
+        or abs_tol < 0
+    ):
+        # math.isclose() raises ValueError for negative tolerance
+        return None
+
+    try:
+        # math.isclose() compares values as float too
+        array = array.astype(np.float64, copy=False)
+        expect_value = float(expect_value)
+        abs_tol = float(abs_tol)
+    except OverflowError:
+        return None
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        diff = np.abs(array - expect_value)
+        # relative tolerance of math.isclose() defaults to 1e-09
+        rel_tol = 1e-09 * np.maximum(np.abs(array), abs(expect_value))
+        is_close = (array == expect_value) | (
+            np.isfinite(diff) & ((diff <= rel_tol) | (diff <= abs_tol))
+        )
+
+    return np.flatnonzero(~is_close).tolist()
+
+
+def get_duplicate_indexes(values: Any) -> Optional[list[list[int]]]:
+    """Get indexes of duplicate items, grouped by item and ordered by the first index of each group."""
+    array = to_numeric_array(values)
+    if array is None or (array.dtype == np.float64 and np.isnan(array).any()):
+        # NaN is never equal to another NaN in Python, but np.unique() treats them as equal
+        return None
+
+    _, inverse, counts = np.unique(array, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+
+    duplicate_indexes = np.flatnonzero(counts[inverse] > 1)
+    if not duplicate_indexes.size:
+        return []
+
+    # group indexes by item, indexes in each group are kept in ascending order by the stable sort
+    duplicate_inverse = inverse[duplicate_indexes]
+    order = np.argsort(duplicate_inverse, kind="stable")
+    sorted_inverse = duplicate_inverse[order]
+    groups = np.split(
+        duplicate_indexes[order], np.flatnonzero(np.diff(sorted_inverse)) + 1
+    )
+
+    duplicate_groups = [group.tolist() for group in groups]
+    duplicate_groups.sort(key=lambda group: group[0])
+    return duplicate_groups
+
+
+def is_sorted(values: Any, reverse: bool) -> Optional[bool]:
+    """Check if items are sorted in ascending order, or descending order if reverse is True."""
+    array = to_numeric_array(values)
+    if array is None or (array.dtype == np.float64 and np.isnan(array).any()):
+        return None
+
+    if reverse:
+        return bool(np.all(array[:-1] >= array[1:]))
+    return bool(np.all(array[:-1] <= array[1:]))
@@ -1,31 +1,73 @@
 import argparse
 import enum
 import os
+import re
+import subprocess
 import sys
-
-import pytest
-from loguru import logger
-from sentry_sdk import capture_message
+from typing import List, Text, Tuple
 
 from httprunner import __description__, __version__
-from httprunner.compat import ensure_cli_args
-from httprunner.ext.har2case import init_har2case_parser, main_har2case
-from httprunner.make import init_make_parser, main_make
-from httprunner.scaffold import init_parser_scaffold, main_scaffold
-from httprunner.utils import init_sentry_sdk
 
-init_sentry_sdk()
+# heavy modules, e.g. pytest/loguru/pydantic, are imported in sub-commands when needed,
+# keep `hrun -V` fast
+
+IMPORT_TIME_MODULES = ["httprunner.cli", "httprunner.runner", "httprunner.make"]
 
 
 def init_parser_run(subparsers):
     sub_parser_run = subparsers.add_parser(
-        "run", help="Make HttpRunner testcases and run with pytest."
+        "run",
+        help="Make HttpRunner testcases and run with pytest.",
+        allow_abbrev=False,
+    )
+    sub_parser_run.add_argument(
+        "--make-jobs",
+        type=int,
+        default=1,
+        help="Number of processes to make testcases in parallel, default to 1.",
+    )
+    sub_parser_run.add_argument(
+        "--no-format",
+        dest="is_format",
+        action="store_false",
+        default=True,
+        help="Do not format made pytest files with black.",
+    )
+    sub_parser_run.add_argument(
+        "--native",
+        action="store_true",
+        default=False,
+        help="Run YAML/JSON testcases directly, without making pytest files.",
+    )
+    sub_parser_run.add_argument(
+        "--native-jobs",
+        type=int,
+        default=1,
+        help="Number of processes to run testcases in native mode, default to 1.",
     )
     return sub_parser_run
 
 
-def main_run(extra_args) -> enum.IntEnum:
+def main_run(
+    extra_args,
+    make_jobs: int = 1,
+    is_format: bool = True,
+    is_native: bool = False,
+    native_jobs: int = 1,
+) -> enum.IntEnum:
+    import pytest
+    from loguru import logger
+
+    from httprunner.compat import ensure_cli_args
+    from httprunner.make import main_make
+    from httprunner.sentry import capture_message
+
     capture_message("start to run")
+    if is_native:
+        from httprunner.native import main_native
+
+        return main_native(extra_args, native_jobs)
+
     # keep compatibility with v2
     extra_args = ensure_cli_args(extra_args)
 
@@ -44,7 +86,9 @@ def main_run(extra_args) -> enum.IntEnum:
         logger.error(f"No valid testcase path in cli arguments: {extra_args}")
         sys.exit(1)
 
-    testcase_path_list = main_make(tests_path_list)
+    testcase_path_list = main_make(
+        tests_path_list, jobs=make_jobs, is_format=is_format
+    )
     if not testcase_path_list:
         logger.error("No valid testcases found, exit 1.")
         sys.exit(1)
@@ -57,19 +101,77 @@ def main_run(extra_args) -> enum.IntEnum:
     return pytest.main(extra_args_new)
 
 
+def get_import_time(modules: List[Text]) -> List[Tuple[Text, int, int, bool]]:
+    """import modules in a new interpreter with -X importtime.
+
+    Returns:
+        list: (module, self_us, cumulative_us, is_top_level) for each imported module
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    import_times = []
+    for line in result.stderr.splitlines():
+        # import time:       self [us] |  cumulative | imported package
+        matched = re.match(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)", line)
+        if matched:
+            self_us, cumulative_us, indent, module = matched.groups()
+            import_times.append(
+                (module, int(self_us), int(cumulative_us), not indent)
+            )
+
+    return import_times
+
+
+def main_import_time(modules: List[Text] = None, top: int = 20):
+    """print modules sorted by cumulative import time, e.g. hrun --import-time"""
+    modules = modules or IMPORT_TIME_MODULES
+    import_times = get_import_time(modules)
+    total_us = sum(item[2] for item in import_times if item[3])
+
+    print(f"import {', '.join(modules)}: {total_us / 1000:.1f} ms in total\n")
+    print(f"{'cumulative(ms)':>14} {'self(ms)':>9}  module")
+    for module, self_us, cumulative_us, _ in sorted(
+        import_times, key=lambda item: item[2], reverse=True
+    )[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {module}")
+
+
 def main():
     """ API test: parse command line options and run commands.
     """
+    if len(sys.argv) == 2 and sys.argv[1] in ["-V", "--version"]:
+        # httprunner -V, without building parsers of sub-commands
+        print(f"{__version__}")
+        sys.exit(0)
+
+    import pytest
+
+    from httprunner.ext.har2case import init_har2case_parser, main_har2case
+    from httprunner.ext.load import init_load_parser, main_load
+    from httprunner.make import init_make_parser, main_make
+    from httprunner.scaffold import init_parser_scaffold, main_scaffold
+
     parser = argparse.ArgumentParser(description=__description__)
     parser.add_argument(
         "-V", "--version", dest="version", action="store_true", help="show version"
     )
+    parser.add_argument(
+        "--import-time",
+        dest="import_time",
+        action="store_true",
+        help="show modules sorted by import time, to find out slow startup",
+    )
 
     subparsers = parser.add_subparsers(help="sub-command help")
     sub_parser_run = init_parser_run(subparsers)  # noqa: F841
     sub_parser_scaffold = init_parser_scaffold(subparsers)
     sub_parser_har2case = init_har2case_parser(subparsers)
     sub_parser_make = init_make_parser(subparsers)
+    sub_parser_load = init_load_parser(subparsers)
 
     if len(sys.argv) == 1:
         # httprunner
@@ -77,9 +179,9 @@ def main():
         sys.exit(0)
     elif len(sys.argv) == 2:
         # print help for sub-commands
-        if sys.argv[1] in ["-V", "--version"]:
-            # httprunner -V
-            print(f"{__version__}")
+        if sys.argv[1] == "--import-time":
+            # httprunner --import-time
+            main_import_time()
         elif sys.argv[1] in ["-h", "--help"]:
             # httprunner -h
             parser.print_help()
@@ -95,6 +197,9 @@ def main():
         elif sys.argv[1] == "make":
             # httprunner make
             sub_parser_make.print_help()
+        elif sys.argv[1] == "load":
+            # httprunner load
+            sub_parser_load.print_help()
         sys.exit(0)
     elif (
         len(sys.argv) == 3 and sys.argv[1] == "run" and sys.argv[2] in ["-h", "--help"]
@@ -114,24 +219,39 @@ def main():
         sys.exit(0)
 
     if sys.argv[1] == "run":
-        sys.exit(main_run(extra_args))
+        sys.exit(
+            main_run(
+                extra_args,
+                args.make_jobs,
+                args.is_format,
+                args.native,
+                args.native_jobs,
+            )
+        )
     elif sys.argv[1] == "startproject":
         main_scaffold(args)
     elif sys.argv[1] == "har2case":
         main_har2case(args)
     elif sys.argv[1] == "make":
-        main_make(args.testcase_path)
+        main_make(args.testcase_path, args.force, args.jobs, args.is_format)
+    elif sys.argv[1] == "load":
+        sys.exit(main_load(args))
 
 
 def main_hrun_alias():
     """ command alias
         hrun = httprunner run
     """
-    if len(sys.argv) == 2:
-        if sys.argv[1] in ["-V", "--version"]:
+    if len(sys.argv) >= 2 and sys.argv[1] == "load":
+        # hrun load /path/to/testcase --rate 10
+        pass
+    elif len(sys.argv) == 2:
+        if sys.argv[1] in ["-V", "--version", "--import-time"]:
             # hrun -V
-            sys.argv = ["httprunner", "-V"]
+            sys.argv = ["httprunner", sys.argv[1]]
         elif sys.argv[1] in ["-h", "--help"]:
+            import pytest
+
             pytest.main(["-h"])
             sys.exit(0)
         else:
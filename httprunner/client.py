@@ -105,7 +105,7 @@ def get_req_resp_record(requests_response: Response, **kwargs) -> ReqRespData:
             # try to record json data
             response_body = requests_response.json()
             if kwargs.get("is_expand_nested_json"):
-                expand_nested_json(response_body)
+                expand_nested_json(response_body, paths=kwargs.get("expand_json_paths"))
         except ValueError:
             # only record at most 512 text charactors
             resp_text = requests_response.text
@@ -189,6 +189,8 @@ class HttpSession(requests.Session):
             if String, path to ssl client cert file (.pem). If Tuple, ('cert', 'key') pair.
         :param raw_mock_response: (optional)
             raw_mock_response for mock response prepare.
+        :param expand_json_paths: (optional)
+            JMESPath expressions of response body subtrees to expand if header X-Json-Control is expand.
         """
         # create a new instance of SessionData for each request, to ensure data are isolated
         self.data = SessionData()
@@ -199,6 +201,8 @@ class HttpSession(requests.Session):
         # set stream to True, in order to get client/server IP/Port
         kwargs["stream"] = True
 
+        expand_json_paths = kwargs.pop("expand_json_paths", None)
+
         start_timestamp = time.time()
 
         # set header 'Date' to represent request timestamp
@@ -226,7 +230,9 @@ class HttpSession(requests.Session):
 
         self.data.req_resps = [
             get_req_resp_record(
-                requests_response_, is_expand_nested_json=is_expand_nested_json
+                requests_response_,
+                is_expand_nested_json=is_expand_nested_json,
+                expand_json_paths=expand_json_paths,
             )
             for requests_response_ in response_list
         ]
@@ -276,6 +276,25 @@ def ensure_cli_args(args: List) -> List:
     return args
 
 
+def get_summary_path(test_path: Text) -> Text:
+    """get path of summary.json for --save-tests, which is under logs folder of project root"""
+    project_meta = load_project_meta(test_path)
+    test_path = os.path.abspath(test_path)
+    logs_dir_path = os.path.join(project_meta.httprunner_root_path, "logs")
+    test_path_relative_path = convert_relative_project_root_dir(test_path)
+
+    if os.path.isdir(test_path):
+        file_foder_path = os.path.join(logs_dir_path, test_path_relative_path)
+        dump_file_name = "all.summary.json"
+    else:
+        file_relative_folder_path, test_file = os.path.split(test_path_relative_path)
+        file_foder_path = os.path.join(logs_dir_path, file_relative_folder_path)
+        test_file_name, _ = os.path.splitext(test_file)
+        dump_file_name = f"{test_file_name}.summary.json"
+
+    return os.path.join(file_foder_path, dump_file_name)
+
+
 def _generate_conftest_for_summary(args: List):
 
     for arg in args:
@@ -357,20 +376,7 @@ def session_fixture(request):
     project_root_dir = project_meta.httprunner_root_path
     conftest_path = os.path.join(project_root_dir, "conftest.py")
 
-    test_path = os.path.abspath(test_path)
-    logs_dir_path = os.path.join(project_root_dir, "logs")
-    test_path_relative_path = convert_relative_project_root_dir(test_path)
-
-    if os.path.isdir(test_path):
-        file_foder_path = os.path.join(logs_dir_path, test_path_relative_path)
-        dump_file_name = "all.summary.json"
-    else:
-        file_relative_folder_path, test_file = os.path.split(test_path_relative_path)
-        file_foder_path = os.path.join(logs_dir_path, file_relative_folder_path)
-        test_file_name, _ = os.path.splitext(test_file)
-        dump_file_name = f"{test_file_name}.summary.json"
-
-    summary_path = os.path.join(file_foder_path, dump_file_name)
+    summary_path = get_summary_path(test_path)
     conftest_content = conftest_content.replace(
         "{{SUMMARY_PATH_PLACEHOLDER}}", summary_path
     )
@@ -0,0 +1,16 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ComparatorSettings(BaseSettings):
+    """Settings for builtin comparators."""
+
+    # max items listed in failure messages, e.g. (index, value) pairs of each_equal
+    max_reported_items: int = 100
+    # check arrays with NumPy if it's installed, only for homogeneous int or float arrays
+    use_numpy: bool = True
+    # arrays shorter than this are checked item by item, converting them costs more than it saves
+    numpy_min_size: int = 1000
+    model_config = SettingsConfigDict(env_prefix="httprunner_comparator_")
+
+
+comparator_settings = ComparatorSettings()
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class LoaderSettings(BaseSettings):
+    """Settings for loading testcase files."""
+
+    # keep validated testcases in memory, keyed by absolute path, mtime and size
+    cache_enabled: bool = True
+    # max number of testcases cached in memory, least recently used ones are dropped first
+    max_cached_testcases: int = 1024
+    # keep validated testcases on disk too, keyed by content hash, disabled if not set
+    cache_dir: Optional[str] = None
+    model_config = SettingsConfigDict(env_prefix="httprunner_loader_")
+
+
+loader_settings = LoaderSettings()
@@ -0,0 +1,13 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class SentrySettings(BaseSettings):
+    """Settings for reporting usage and errors to sentry."""
+
+    # nothing is reported unless enabled, e.g. HTTPRUNNER_SENTRY_ENABLED=true
+    enabled: bool = False
+    dsn: str = "https://460e31339bcb428c879aafa6a2e78098@sentry.io/5263855"
+    model_config = SettingsConfigDict(env_prefix="httprunner_sentry_")
+
+
+sentry_settings = SentrySettings()
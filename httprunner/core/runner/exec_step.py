@@ -0,0 +1,173 @@
+from typing import Any, Dict, Optional
+
+from httprunner.models import TRequest, TRequestConfig, TStep
+from httprunner.parser import copy_parsable_data
+
+# fields changed while running, they are held by StepState and copied for each attempt
+STATE_FIELDS = (
+    "name",
+    "parametrize",
+    "parsed_parametrize_vars",
+    "remaining_retry_times",
+    "max_retry_times",
+    "retry_interval",
+    "is_retry_args_resolved",
+    "is_ever_retried",
+    "skip_if_condition",
+    "is_skip",
+    "request",
+    "variables",
+    "is_variables_resolved",
+    "private_variables",
+    "setup_hooks",
+    "teardown_hooks",
+    "extract",
+    "export",
+    "request_config",
+    "pre_delay_seconds",
+    "post_delay_seconds",
+)
+
+# fields never changed while running, they are shared by all copies of ExecStep
+TEMPLATE_FIELDS = tuple(
+    field for field in TStep.model_fields if field not in STATE_FIELDS
+)
+
+# fields holding data parsed in place by parse_data
+_PARSABLE_FIELDS = (
+    "parametrize",
+    "parsed_parametrize_vars",
+    "variables",
+    "private_variables",
+    "setup_hooks",
+    "teardown_hooks",
+)
+
+_REQUEST_PARSABLE_FIELDS = (
+    "params",
+    "headers",
+    "req_json",
+    "req_json_update",
+    "data",
+    "data_update",
+    "cookies",
+    "upload",
+)
+
+
+def _copy_request(request: Optional[TRequest]) -> Optional[TRequest]:
+    if request is None:
+        return None
+
+    return request.model_copy(
+        update={
+            field: copy_parsable_data(getattr(request, field))
+            for field in _REQUEST_PARSABLE_FIELDS
+        }
+    )
+
+
+def _copy_request_config(
+    request_config: Optional[TRequestConfig],
+) -> Optional[TRequestConfig]:
+    if request_config is None:
+        return None
+
+    # resources are never changed, see SharedResources
+    return request_config.model_copy(
+        update={"variables": copy_parsable_data(request_config.variables)}
+    )
+
+
+class StepState(object):
+    """Mutable state of a step, every attempt of running the step has its own copy."""
+
+    __slots__ = STATE_FIELDS
+
+    @classmethod
+    def from_tstep(cls, step: TStep) -> "StepState":
+        state = cls.__new__(cls)
+        for field in STATE_FIELDS:
+            setattr(state, field, getattr(step, field))
+        return state.copy()
+
+    def copy(self) -> "StepState":
+        state = StepState.__new__(StepState)
+        for field in STATE_FIELDS:
+            setattr(state, field, getattr(self, field))
+
+        for field in _PARSABLE_FIELDS:
+            setattr(state, field, copy_parsable_data(getattr(self, field)))
+
+        state.request = _copy_request(self.request)
+        state.request_config = _copy_request_config(self.request_config)
+        state.extract = list(self.extract)
+        if self.export is not None:
+            state.export = self.export.model_copy(deep=True)
+
+        return state
+
+
+class ExecStep(object):
+    """
+    Runtime representation of a step, compiled from TStep once.
+
+    Fields never changed while running are shared by all copies, e.g. validators and referenced testcase,
+    the others are held by a StepState record. Copying an ExecStep for retrying or parametrizing only copies
+    the state record, which is much cheaper than deep copying a pydantic TStep.
+
+    TStep is still the format for authoring and serialization, ExecStep has the same attributes as TStep.
+    """
+
+    __slots__ = TEMPLATE_FIELDS + ("state",)
+
+    def __init__(self, step: TStep):
+        for field in TEMPLATE_FIELDS:
+            object.__setattr__(self, field, getattr(step, field))
+        object.__setattr__(self, "state", StepState.from_tstep(step))
+
+    def __setattr__(self, key, value):
+        if key in TEMPLATE_FIELDS:
+            raise AttributeError(f"field '{key}' of ExecStep is read-only")
+        object.__setattr__(self, key, value)
+
+    def copy(self) -> "ExecStep":
+        """Copy step for one attempt, the template fields are shared."""
+        step = ExecStep.__new__(ExecStep)
+        for field in TEMPLATE_FIELDS:
+            object.__setattr__(step, field, getattr(self, field))
+        object.__setattr__(step, "state", self.state.copy())
+        return step
+
+    def model_copy(
+        self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False
+    ) -> "ExecStep":
+        """Same as TStep.model_copy(), the state is always copied."""
+        step = self.copy()
+        for key, value in (update or {}).items():
+            setattr(step.state, key, value)
+        return step
+
+    def to_tstep(self) -> TStep:
+        fields = {field: getattr(self, field) for field in TStep.model_fields}
+        return TStep.model_construct(**fields)
+
+    def model_dump(self, **kwargs) -> dict:
+        return self.to_tstep().model_dump(**kwargs)
+
+    def __repr__(self):
+        return f"ExecStep(name={self.name!r})"
+
+
+def _state_property(field: str) -> property:
+    def getter(self):
+        return getattr(self.state, field)
+
+    def setter(self, value):
+        setattr(self.state, field, value)
+
+    return property(getter, setter)
+
+
+for _field in STATE_FIELDS:
+    setattr(ExecStep, _field, _state_property(_field))
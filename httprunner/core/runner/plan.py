@@ -0,0 +1,137 @@
+import inspect
+import weakref
+from typing import TYPE_CHECKING, List, Type
+
+from httprunner.client import HttpSession
+from httprunner.core.runner.exec_step import ExecStep
+from httprunner.core.testcase.config import Config
+from httprunner.core.testcase.step.step import Step
+from httprunner.models import TConfig, TestCase, TStep, VariablesMapping
+from httprunner.response import compile_validator
+
+if TYPE_CHECKING:
+    from httprunner.runner import HttpRunner
+
+# testcase class -> compiled plan
+_plans: "weakref.WeakKeyDictionary[type, TestCasePlan]" = weakref.WeakKeyDictionary()
+
+
+def get_step_state(step) -> TStep:
+    """Current state of step builder, which may be changed in place by builder methods."""
+    if isinstance(step, Step):
+        # performed step is kept by Step, compare it without copying
+        return step._step_context
+    return step.perform()
+
+
+class TestCasePlan(object):
+    """
+    Executable plan compiled from a testcase class, reusable across many executions.
+
+    Config and steps are performed and validated only once when compiling, so are validators,
+    each execution runs on copies of them. Steps are run as ExecStep, copying which is much cheaper
+    than copying TStep.
+
+    Note: requests are still prepared by the runner in each execution, i.e. URLs are joined with
+    base url, headers are parsed and merged with global headers, functions are looked up when
+    parsed, as they may be changed by variables and setup hooks.
+
+    Examples:
+        plan = HttpRunner.compile(TestCaseRequestWithFunctions)
+        for _ in range(1000):
+            plan.execute(variables={"foo1": "bar"}, session=session)
+    """
+
+    __test__ = False  # not collected by pytest
+
+    def __init__(
+        self, testcase_cls: Type["HttpRunner"], config: Config = None, teststeps=None
+    ):
+        """
+        :param testcase_cls: testcase class, its instances are created to run the plan.
+        :param config: config builder, default to config of testcase class.
+        :param teststeps: step builders, default to teststeps of testcase class.
+        """
+        config = config if config is not None else testcase_cls.config
+        teststeps = teststeps if teststeps is not None else testcase_cls.teststeps
+
+        if config.path is None:
+            # config assigned after testcase class was created
+            config.path = inspect.getfile(testcase_cls)
+
+        self.testcase_cls = testcase_cls
+        self.config: TConfig = config.perform()
+        self.teststeps: List[TStep] = [step.perform() for step in teststeps]
+
+        # compiled plans of validators are shared by copies of steps
+        for step in self.teststeps:
+            for validator in step.validators:
+                compile_validator(validator)
+
+        # runtime steps sharing fields which are never changed while running
+        self.exec_steps: List[ExecStep] = [ExecStep(step) for step in self.teststeps]
+
+        # plan will be compiled again if builders were reassigned or changed in place
+        self._config_builder = config
+        self._config_version = getattr(config, "version", None)
+        self._teststep_builders = teststeps
+        self._teststep_items = list(teststeps)
+
+    def is_outdated(self) -> bool:
+        config = self.testcase_cls.config
+        teststeps = self.testcase_cls.teststeps
+        return (
+            config is not self._config_builder
+            or getattr(config, "version", None) != self._config_version
+            or teststeps is not self._teststep_builders
+            or len(teststeps) != len(self._teststep_items)
+            or any(
+                step is not compiled_step or get_step_state(step) != performed_step
+                for step, compiled_step, performed_step in zip(
+                    teststeps, self._teststep_items, self.teststeps
+                )
+            )
+        )
+
+    def new_testcase(self, variables: VariablesMapping = None) -> TestCase:
+        """Copy config and steps for one execution, variables will override config variables."""
+        config = self.config.model_copy(deep=True)
+        if variables:
+            config.variables.update(variables)
+
+        return TestCase.model_construct(
+            config=config,
+            teststeps=[step.copy() for step in self.exec_steps],
+        )
+
+    def execute(
+        self,
+        variables: VariablesMapping = None,
+        session: HttpSession = None,
+        runner: "HttpRunner" = None,
+    ) -> "HttpRunner":
+        """
+        Run the testcase once.
+
+        :param variables: variables overriding config variables.
+        :param session: HTTP session to send requests, a new one will be created if not specified.
+        :param runner: instance of the testcase class to run with, a new one will be created if not specified.
+        :return: the runner, its summary can be got by runner.get_summary()
+        """
+        runner = runner or self.testcase_cls()
+        if session is not None:
+            runner.with_session(session)
+
+        runner.run_testcase(self.new_testcase(variables))
+        # exception will be raised if testcase failed
+        runner.success = True
+        return runner
+
+
+def compile_testcase(testcase_cls: Type["HttpRunner"]) -> TestCasePlan:
+    """Compile testcase class to plan, plans are cached by class."""
+    plan = _plans.get(testcase_cls)
+    if plan is None or plan.is_outdated():
+        plan = _plans[testcase_cls] = TestCasePlan(testcase_cls)
+
+    return plan
@@ -0,0 +1,259 @@
+"""
+Results of referenced testcases shared by steps, see StepRefCase.shared().
+
+Exported variables and cookies of a referenced testcase, e.g. login, are saved once for each key,
+and reused by later steps instead of running the testcase again. Results of "worker" scope are kept
+in memory of the process, results of "session" scope are kept on disk as well, so that all workers
+of one run share them, e.g. pytest-xdist workers or `hrun --native-jobs` processes.
+
+Results on disk hold tokens and cookies, they are saved as JSON in a directory of the current user,
+which is not accessible by other users, and removed at the end of the run.
+"""
+import copy
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.cookiejar import Cookie, CookieJar
+from typing import Dict, Iterator, List, NamedTuple, Optional, Text
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, results of "session" scope are shared in one process only
+    fcntl = None
+
+from loguru import logger
+
+from httprunner import exceptions
+from httprunner.models import SharedScopeEnum, StepShare, TStep
+
+# id of one run, set by hrun or pytest-xdist and inherited by all workers
+SESSION_ID_ENVS = ("HTTPRUNNER_SHARED_SESSION_ID", "PYTEST_XDIST_TESTRUNUID")
+
+# attributes of http.cookiejar.Cookie, except rest, the same as arguments of Cookie()
+COOKIE_ATTRS = (
+    "version",
+    "name",
+    "value",
+    "port",
+    "port_specified",
+    "domain",
+    "domain_specified",
+    "domain_initial_dot",
+    "path",
+    "path_specified",
+    "secure",
+    "expires",
+    "discard",
+    "comment",
+    "comment_url",
+    "rfc2109",
+)
+
+
+class SharedResult(NamedTuple):
+    export_vars: Dict
+    cookies: List[Cookie]
+    created_at: float
+
+
+# shared key -> result saved in this process
+_worker_results: Dict[Text, SharedResult] = {}
+# shared key -> lock, so that threads run one referenced testcase once
+_key_locks: Dict[Text, threading.Lock] = {}
+_key_locks_lock = threading.Lock()
+
+
+def get_shared_key(step: TStep) -> Text:
+    """key of referenced testcase result, by testcase, key variables and export"""
+    if isinstance(step.testcase, Text):
+        testcase_id = step.testcase
+    else:
+        testcase_id = f"{step.testcase.__module__}.{step.testcase.__qualname__}"
+
+    key_values = []
+    for var_name in step.share.key:
+        if var_name not in step.variables:
+            raise exceptions.VariableNotFound(
+                f"variable of shared key not found: {var_name}"
+            )
+        key_values.append(step.variables[var_name])
+
+    export = step.export.model_dump() if step.export else None
+    content = repr((testcase_id, step.share.scope.value, key_values, export))
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def _get_session_path(key: Text, share: StepShare) -> Optional[Text]:
+    """path of result on disk for "session" scope, None if result is kept in memory only"""
+    if share.scope is not SharedScopeEnum.SESSION or fcntl is None:
+        return None
+
+    for env_name in SESSION_ID_ENVS:
+        session_id = os.environ.get(env_name)
+        if session_id:
+            break
+    else:
+        # not run with workers, "session" scope is the same as "worker" scope
+        return None
+
+    if not re.fullmatch(r"[\w.-]+", session_id):
+        logger.warning(
+            f"invalid shared session id, shared in this process: {session_id}"
+        )
+        return None
+
+    session_dir = _get_session_dir(session_id)
+    for path in (os.path.dirname(session_dir), session_dir):
+        if not _make_private_dir(path):
+            logger.warning(
+                f"shared directory is accessible by other users, shared in this process: {path}"
+            )
+            return None
+
+    return os.path.join(session_dir, f"{key}.json")
+
+
+def _make_private_dir(path: Text) -> bool:
+    """make directory only accessible by the current user, False if it exists and is not"""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+
+    path_stat = os.lstat(path)
+    return (
+        stat.S_ISDIR(path_stat.st_mode)
+        and path_stat.st_uid == os.getuid()
+        and not path_stat.st_mode & 0o077
+    )
+
+
+@contextmanager
+def lock_shared_result(key: Text, share: StepShare) -> Iterator[None]:
+    """lock result of key, in threads of this process and in workers of the run"""
+    with _key_locks_lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        session_path = _get_session_path(key, share)
+        if session_path is None:
+            yield
+            return
+
+        lock_fd = os.open(f"{session_path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_fd, fcntl.LOCK_UN)
+        finally:
+            os.close(lock_fd)
+
+
+def load_shared_result(
+    key: Text, share: StepShare, stale_before: float = None
+) -> Optional[SharedResult]:
+    """load result of key, None if not saved, expired, or created before stale_before"""
+    session_path = _get_session_path(key, share)
+    if session_path is None:
+        result = _worker_results.get(key)
+    else:
+        # always read from disk, result maybe refreshed by other workers
+        try:
+            with open(session_path, encoding="utf-8") as f:
+                result = _load_result(json.load(f))
+        except FileNotFoundError:
+            # maybe not JSON serializable, see save_shared_result
+            result = _worker_results.get(key)
+        except Exception as ex:
+            logger.warning(f"failed to load shared result {session_path}: {ex}")
+            result = None
+
+    if result is None:
+        return None
+
+    if share.ttl is not None and time.time() - result.created_at > share.ttl:
+        return None
+
+    if stale_before is not None and result.created_at <= stale_before:
+        return None
+
+    return result
+
+
+def save_shared_result(key: Text, share: StepShare, result: SharedResult) -> None:
+    session_path = _get_session_path(key, share)
+    if session_path is None:
+        _worker_results[key] = result
+        return
+
+    tmp_path = f"{session_path}.{os.getpid()}.tmp"
+    try:
+        content = json.dumps(_dump_result(result))
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, session_path)
+    except Exception as ex:
+        # not JSON serializable exported variables, shared in this process only
+        logger.warning(f"failed to save shared result {session_path}: {ex}")
+        _worker_results[key] = result
+
+
+def _dump_result(result: SharedResult) -> Dict:
+    cookies = []
+    for cookie in result.cookies:
+        cookie_dict = {attr: getattr(cookie, attr) for attr in COOKIE_ATTRS}
+        cookie_dict["rest"] = dict(cookie._rest)
+        cookies.append(cookie_dict)
+
+    return {
+        "export_vars": result.export_vars,
+        "cookies": cookies,
+        "created_at": result.created_at,
+    }
+
+
+def _load_result(content: Dict) -> SharedResult:
+    return SharedResult(
+        export_vars=content["export_vars"],
+        cookies=[Cookie(**cookie_dict) for cookie_dict in content["cookies"]],
+        created_at=content["created_at"],
+    )
+
+
+def get_new_cookies(cookie_jar: CookieJar, cookies_before: set) -> List[Cookie]:
+    """cookies added or changed, compared with snapshot_cookies() before"""
+    return [
+        copy.copy(cookie)
+        for cookie in cookie_jar
+        if (cookie.domain, cookie.path, cookie.name, cookie.value) not in cookies_before
+    ]
+
+
+def snapshot_cookies(cookie_jar: CookieJar) -> set:
+    return {
+        (cookie.domain, cookie.path, cookie.name, cookie.value) for cookie in cookie_jar
+    }
+
+
+def _get_session_dir(session_id: Text) -> Text:
+    # one directory for each user, used only if it is owned by the user and private, see _make_private_dir
+    shared_dir = os.path.join(tempfile.gettempdir(), f"httprunner-shared-{os.getuid()}")
+    return os.path.join(shared_dir, session_id)
+
+
+def clear_shared_results(session_id: Text = None) -> None:
+    """clear results of this process, and results on disk of session if specified"""
+    _worker_results.clear()
+    if session_id and fcntl is not None:
+        shutil.rmtree(_get_session_dir(session_id), ignore_errors=True)
@@ -1,4 +1,6 @@
-from httprunner.builtin import update_dict_recursively
+from copy import copy
+
+from httprunner.builtin import copy_and_update_dict_recursively
 
 
 def update_form(parsed_request_dict: dict) -> None:
@@ -22,7 +24,12 @@ def update_form(parsed_request_dict: dict) -> None:
                 f"the parsed value of argument `data_update` in method `update_json_object()` must a dict, "
                 f"but got: {type(data_)}"
             )
+        # the dict may be shared with other steps, e.g. one from evaluated resources,
+        # update a copy of it, nested dicts are copied only if they are on the updated paths.
         if is_deep:
-            update_dict_recursively(init_data, data_)
+            init_data = copy_and_update_dict_recursively(init_data, data_)
         else:
+            init_data = copy(init_data)
             init_data.update(data_)
+
+    parsed_request_dict["data"] = init_data
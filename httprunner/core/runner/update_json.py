@@ -1,4 +1,6 @@
-from httprunner.builtin import update_dict_recursively
+from copy import copy
+
+from httprunner.builtin import copy_and_update_dict_recursively
 
 
 def update_json(parsed_request_dict: dict) -> None:
@@ -23,7 +25,12 @@ def update_json(parsed_request_dict: dict) -> None:
                 f"the parsed value of argument `req_json_update` in method `update_json_object()` must a dict, "
                 f"but got: {type(req_json)}"
             )
+        # the dict may be shared with other steps, e.g. one from evaluated resources,
+        # update a copy of it, nested dicts are copied only if they are on the updated paths.
         if is_deep:
-            update_dict_recursively(req_json, update_data)
+            req_json = copy_and_update_dict_recursively(req_json, update_data)
         else:
+            req_json = copy(req_json)
             req_json.update(update_data)
+
+    parsed_request_dict["req_json"] = req_json
@@ -1,7 +1,188 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Set
+
+from dotwiz import DotWiz
+
 from httprunner import exceptions
 from httprunner.exceptions import OverrideReservedVariableError
 from httprunner.models import TStep
-from httprunner.parser import parse_data
+from httprunner.parser import (
+    ParseMe,
+    copy_parsable_data,
+    parse_data,
+    pyexec_regex_compile,
+    pyexp_regex_compile,
+    regex_findall_functions,
+    regex_findall_variables,
+)
+
+# max number of evaluated resources cached, least recently used ones are dropped first
+MAX_CACHED_RESOURCES = 1024
+
+# (resource id, resource name, extractor, referenced variable values) -> (resource, resource variables)
+_evaluated_resources: "OrderedDict[tuple, tuple]" = OrderedDict()
+# resource id -> (resource, referenced variables or None if the resource can not be cached)
+_referenced_variables: "OrderedDict[int, tuple]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _find_referenced_variables(content: Any, variables: Set) -> bool:
+    """
+    Collect variables referenced by content recursively.
+
+    False is returned if evaluating content may get different results with the same variables,
+    i.e. content calls functions or contains instances of ParseMe subclasses.
+    """
+    if isinstance(content, str):
+        if "$" not in content:
+            return True
+        if (
+            regex_findall_functions(content)
+            or pyexp_regex_compile.search(content)
+            or pyexec_regex_compile.search(content)
+        ):
+            return False
+        variables.update(regex_findall_variables(content))
+        return True
+
+    # note: DotWiz must be handled before `dict` for it subclassed `dict`
+    elif isinstance(content, DotWiz):
+        return True
+
+    elif isinstance(content, dict):
+        return all(
+            _find_referenced_variables(key, variables)
+            and _find_referenced_variables(value, variables)
+            for key, value in content.items()
+        )
+
+    elif isinstance(content, (list, set, tuple)):
+        return all(_find_referenced_variables(item, variables) for item in content)
+
+    elif isinstance(content, ParseMe):
+        return False
+
+    return True
+
+
+def get_referenced_variables(resource: Any) -> Optional[Set]:
+    """
+    Get names of variables referenced by resource, resource is inspected only once.
+
+    None is returned if the evaluated resource can not be cached.
+    """
+    with _lock:
+        cached = _referenced_variables.get(id(resource))
+        if cached is not None and cached[0] is resource:
+            _referenced_variables.move_to_end(id(resource))
+            return cached[1]
+
+    referenced_variables = set()
+    if not _find_referenced_variables(resource, referenced_variables):
+        referenced_variables = None
+
+    # hold the resource to make sure its id will not be reused by other objects
+    with _lock:
+        _referenced_variables[id(resource)] = (resource, referenced_variables)
+        if len(_referenced_variables) > MAX_CACHED_RESOURCES:
+            _referenced_variables.popitem(last=False)
+    return referenced_variables
+
+
+def _get_value_key(value: Any) -> Hashable:
+    try:
+        hash(value)
+    except TypeError:
+        # dict, list, etc.
+        return type(value), repr(value)
+
+    # 1, 1.0 and True are equal, but parsed to different results
+    return type(value), value
+
+
+def _parse_without_changing(
+    content: Any, variables_mapping: dict, functions_mapping: dict
+) -> Any:
+    """
+    Parse content like parse_data, but containers are not changed in place.
+
+    Containers referencing no variables are returned as they are, others are parsed to new containers,
+    so parsing a cacheable resource costs no more than parsing it in place.
+    """
+    content_type = type(content)
+    if content_type is str:
+        if "$" not in content:
+            return content
+        return parse_data(content, variables_mapping, functions_mapping)
+
+    elif content_type is dict:
+        parsed_content = {}
+        is_changed = False
+        for key, value in content.items():
+            parsed_key = _parse_without_changing(
+                key, variables_mapping, functions_mapping
+            )
+            parsed_value = _parse_without_changing(
+                value, variables_mapping, functions_mapping
+            )
+            parsed_content[parsed_key] = parsed_value
+            is_changed = (
+                is_changed or parsed_key is not key or parsed_value is not value
+            )
+        return parsed_content if is_changed else content
+
+    elif content_type is list or content_type is tuple:
+        parsed_content = [
+            _parse_without_changing(item, variables_mapping, functions_mapping)
+            for item in content
+        ]
+        if all(parsed is item for parsed, item in zip(parsed_content, content)):
+            return content
+        return content_type(parsed_content)
+
+    else:
+        # other containers, e.g. sets and subclasses of dict, are parsed on copies
+        return parse_data(
+            copy_parsable_data(content), variables_mapping, functions_mapping
+        )
+
+
+def _parse_resource(
+    step: TStep,
+    debugtalk_functions: dict,
+    resource_tuple: tuple,
+    is_cacheable: bool = False,
+) -> dict:
+    resource_variables = {}
+
+    resource_name, resource, variable_extractor = resource_tuple
+
+    # cacheable resource is kept untouched, for it is parsed again with other variables
+    parse = _parse_without_changing if is_cacheable else parse_data
+    resource_object = parse(
+        resource,
+        step.variables,
+        debugtalk_functions,
+    )
+
+    # one variable with the same name as `resource_name` will be set
+    resource_variables[resource_name] = resource_object
+
+    # extract variables from api docs object
+    if variable_extractor:
+        # variable_extractor must be a function defined in debugtalk.py if set
+        if variable_extractor not in debugtalk_functions:
+            raise exceptions.FunctionNotFound(
+                f"function '{variable_extractor}' not found in debugtalk.py"
+            )
+
+        # extract variables from api docs object
+        resource_variables.update(
+            debugtalk_functions[variable_extractor](resource_object)
+        )
+
+    return resource_variables
 
 
 def evaluate_resource(
@@ -10,6 +191,10 @@ def evaluate_resource(
     """
     Extract variables and preset json from api docs object.
 
+    Evaluated resources are cached by resource identity and values of the variables referenced by the resource,
+    steps referring to the same resource with the same variable values will not parse it again.
+    Evaluated resources are shared by these steps, so they should not be changed in place.
+
     >>> evaluate_resource(TStep(name="foo"), {...})
     {
         "resource_name": {...},  # evaluated resource
@@ -17,9 +202,6 @@ def evaluate_resource(
         ...
     }
     """
-    # preset variables set by resource
-    resource_variables = {}
-
     resource_name, resource, variable_extractor = resource_tuple
 
     # avoid variable with the name specified by `resource_name` being overwritten
@@ -38,29 +220,39 @@ def evaluate_resource(
             f"variable name `{resource_name}` is reserved, cannot override it (from step private variables)"
         )
 
-    resource_object = parse_data(
-        resource,
-        step.variables,
-        debugtalk_functions,
-    )
+    referenced_variables = get_referenced_variables(resource)
+    if referenced_variables is None:
+        return _parse_resource(step, debugtalk_functions, resource_tuple)
 
-    # one variable with the same name as `resource_name` will be set
-    resource_variables[resource_name] = resource_object
-
-    # extract variables from api docs object
-    if variable_extractor:
-        # variable_extractor must be a function defined in debugtalk.py if set
-        if variable_extractor not in debugtalk_functions:
-            raise exceptions.FunctionNotFound(
-                f"function '{variable_extractor}' not found in debugtalk.py"
-            )
+    cache_key = (
+        id(resource),
+        resource_name,
+        variable_extractor,
+        debugtalk_functions.get(variable_extractor) if variable_extractor else None,
+        tuple(
+            (name, _get_value_key(step.variables[name]))
+            for name in sorted(referenced_variables)
+            if name in step.variables
+        ),
+    )
+    with _lock:
+        cached = _evaluated_resources.get(cache_key)
+        if cached is not None:
+            _evaluated_resources.move_to_end(cache_key)
 
-        # extract variables from api docs object
-        resource_variables.update(
-            debugtalk_functions[variable_extractor](resource_object)
+    if cached is None or cached[0] is not resource:
+        resource_variables = _parse_resource(
+            step, debugtalk_functions, resource_tuple, is_cacheable=True
         )
+        cached = (resource, resource_variables)
+        with _lock:
+            _evaluated_resources[cache_key] = cached
+            if len(_evaluated_resources) > MAX_CACHED_RESOURCES:
+                _evaluated_resources.popitem(last=False)
 
-    return resource_variables
+    # evaluated resources are shared by steps, they are read-only,
+    # e.g. update_json() and update_form() update copies of them.
+    return dict(cached[1])
 
 
 def evaluate_resources(step: TStep, debugtalk_functions: dict) -> dict:
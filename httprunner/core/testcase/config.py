@@ -14,6 +14,8 @@ class Config(object):
         self.__export = []
         self.__weight = 1
         self.__path = None
+        # increased whenever config is changed, compiled plans of testcase are outdated then
+        self.__version = 0
 
     @property
     def name(self) -> Text:
@@ -26,6 +28,11 @@ class Config(object):
     @path.setter
     def path(self, testcase_file_path: Text) -> None:
         self.__path = testcase_file_path
+        self.__version += 1
+
+    @property
+    def version(self) -> int:
+        return self.__version
 
     @property
     def weight(self) -> int:
@@ -33,26 +40,32 @@ class Config(object):
 
     def variables(self, **variables) -> "Config":
         self.__variables.update(variables)
+        self.__version += 1
         return self
 
     def base_url(self, base_url: Text) -> "Config":
         self.__base_url = base_url
+        self.__version += 1
         return self
 
     def verify(self, verify: bool) -> "Config":
         self.__verify = verify
+        self.__version += 1
         return self
 
     def continue_on_failure(self) -> "Config":
         self.__continue_on_failure = True
+        self.__version += 1
         return self
 
     def export(self, *export_var_name: Text) -> "Config":
         self.__export.extend(export_var_name)
+        self.__version += 1
         return self
 
     def locust_weight(self, weight: int) -> "Config":
         self.__weight = weight
+        self.__version += 1
         return self
 
     def perform(self) -> TConfig:
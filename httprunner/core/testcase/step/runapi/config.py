@@ -7,6 +7,7 @@ from typing import (
 from httprunner.core.testcase.config import Config  # noqa
 from httprunner.models import (
     TRequestConfig,
+    SharedResources,
     StableDeepCopyDict,
 )
 
@@ -51,5 +52,5 @@ class RequestConfig(object):
         return TRequestConfig(
             name=self.__name,
             variables=self.__variables,
-            resources=self.__resources,
+            resources=SharedResources(self.__resources),
         )
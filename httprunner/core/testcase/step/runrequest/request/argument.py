@@ -147,6 +147,23 @@ class RequestWithOptionalArgs(
         self._step_context.request.allow_redirects = allow_redirects
         return self
 
+    def expand_nested_json(
+        self, *paths: str, lazy: bool = False
+    ) -> "RequestWithOptionalArgs":
+        """
+        Expand JSON strings nested in the response body, e.g. {"data": "{\\"id\\": 1}"}.
+
+        Same as header X-Json-Control: expand, with optional paths and lazy mode.
+
+        :param paths: JMESPath expressions of subtrees to expand, e.g. "data.detail",
+            the whole body is expanded if not specified.
+        :param lazy: expand values of the response body on first access instead of all at once.
+        """
+        self._step_context.request.headers["X-Json-Control"] = "expand"
+        self._step_context.request.expand_json_paths = list(paths)
+        self._step_context.request.expand_json_lazily = lazy
+        return self
+
     def upload(self, **file_info) -> "RequestWithOptionalArgs":
         self._step_context.request.upload.update(file_info)
         return self
@@ -20,6 +20,11 @@ class StepRequestValidation(object):
         self._step_context.validators.clear()
         return self
 
+    def fail_fast(self, enabled: bool = True) -> "StepRequestValidation":
+        """Stop validating at the first failed validator, validators left will not be run."""
+        self._step_context.validate_fail_fast = enabled
+        return self
+
     def assert_equal(
         self,
         jmespath_expression: Text,
@@ -372,10 +377,9 @@ class StepRequestValidation(object):
         """Equivalent to the JSONassert non-strict mode.
 
         By default, use java JSONassert (re-implemented with Python) as the comparator,
+        ignore_string_type_changes and ignore_numeric_type_changes are supported by it too,
         fallback to deepdiff version if any of the following conditions are met: \n
-            * ignore_string_type_changes is True
-            * ignore_numeric_type_changes is True
-            * ignore_type_in_groups is not None
+            * ignore_type_in_groups has groups of types not compared as the same JSON type, e.g. (int, str)
             * other_deepdiff_kwargs is not empty
             * expected_value is neither a dict nor a list
             * check_value is neither a dict nor a list
@@ -441,10 +445,9 @@ class StepRequestValidation(object):
         """Equivalent to the JSONassert strict mode.
 
         By default, use java JSONassert (re-implemented with Python) as the comparator,
+        ignore_string_type_changes and ignore_numeric_type_changes are supported by it too,
         fallback to deepdiff version if any of the following conditions are met: \n
-            * ignore_string_type_changes is True
-            * ignore_numeric_type_changes is True
-            * ignore_type_in_groups is not None
+            * ignore_type_in_groups has groups of types not compared as the same JSON type, e.g. (int, str)
             * other_deepdiff_kwargs is not empty
             * expected_value is neither a dict nor a list
             * check_value is neither a dict nor a list
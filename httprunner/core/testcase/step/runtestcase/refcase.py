@@ -1,8 +1,11 @@
 from httprunner.core.testcase.config import Config  # noqa
 from httprunner.core.testcase.step.hook.teardown import TeardownHookMixin
+from typing import List, Optional
+
 from httprunner.models import (
     TStep,
     StepExport,
+    StepShare,
 )
 
 
@@ -29,5 +32,28 @@ class StepRefCase(TeardownHookMixin):
             self._step_context.export.var_alias_mapping.update(var_alias_mapping)
         return self
 
+    def shared(
+        self,
+        scope: str = "worker",
+        key: List[str] = None,
+        ttl: Optional[float] = None,
+        refresh_on_status: List[int] = None,
+    ) -> "StepRefCase":
+        """
+        Run testcase referenced once, and reuse its exported variables and cookies, e.g. login.
+
+        :param scope: "worker" to share in one process, "session" to share by all workers in one run
+        :param key: names of step variables, testcase is run once for each values of them
+        :param ttl: seconds before testcase is run again, never expires if not set
+        :param refresh_on_status: testcase is run again if a later request got these status codes
+        """
+        self._step_context.share = StepShare(
+            scope=scope,
+            key=key or [],
+            ttl=ttl,
+            refresh_on_status=[401] if refresh_on_status is None else refresh_on_status,
+        )
+        return self
+
     def perform(self) -> TStep:
         return self._step_context
@@ -0,0 +1,469 @@
+"""
+Discover test files in folders.
+
+Folders are scanned with os.scandir, directories like .git, node_modules and virtualenvs are pruned,
+so are paths ignored by .gitignore/.hrunignore. YAML/JSON files are classified by sniffing their first
+bytes instead of loading them, and generated pytest files are skipped if their sources are discovered.
+
+Scanned directories are cached by mtime, classified files by mtime and size, in process and on disk
+if HTTPRUNNER_LOADER_CACHE_DIR is set.
+"""
+import json
+import os
+import re
+import threading
+from enum import Enum
+from typing import Dict, Iterator, List, NamedTuple, Optional, Pattern, Text, Tuple
+
+from loguru import logger
+
+from httprunner.configs.loader import loader_settings
+
+IGNORE_FILE_NAMES = (".gitignore", ".hrunignore")
+
+# directories never containing testcases
+IGNORED_DIR_NAMES = {
+    ".git",
+    ".hg",
+    ".svn",
+    ".idea",
+    ".vscode",
+    ".tox",
+    ".nox",
+    ".venv",
+    "venv",
+    "node_modules",
+    "__pycache__",
+    ".pytest_cache",
+    ".mypy_cache",
+    "logs",
+}
+
+TEST_FILE_SUFFIXES = (".yml", ".yaml", ".json", "_test.py")
+
+GENERATED_PYTEST_HEADER = b"# NOTE: Generated By HttpRunner"
+
+# bytes read to classify test file, the rest is read only if the head is not decisive
+SNIFF_SIZE = 4096
+
+_YAML_KEYS_REGEX = re.compile(
+    rb"""^["']?(config|teststeps|testcases|request)["']?[ \t]*:""", re.M
+)
+_JSON_KEYS_REGEX = re.compile(rb'"(config|teststeps|testcases|request)"\s*:')
+# keys deciding kind of test file, file is read to the end until one of them is found
+DECISIVE_KEYS = {b"teststeps", b"testcases", b"request"}
+_GENERATED_FROM_REGEX = re.compile(rb"^# FROM: (.+?)\s*$", re.M)
+
+
+class FileKind(Text, Enum):
+    TESTCASE = "testcase"
+    TESTSUITE = "testsuite"
+    PYTEST = "pytest"
+    OTHER = "other"
+
+
+class IgnoreRule(NamedTuple):
+    base_dir: Text
+    regex: Pattern
+    negate: bool
+    dir_only: bool
+
+
+class ScannedDir(NamedTuple):
+    # (mtime of directory, ignore files applied to it)
+    signature: Tuple
+    dir_names: List[Text]
+    file_names: List[Text]
+
+
+# directory path => scanned directory
+_scanned_dirs: Dict[Text, ScannedDir] = {}
+# file path => ((mtime, size), kind, source path of generated pytest file)
+_classified_files: Dict[Text, Tuple[Tuple[int, int], FileKind, Optional[Text]]] = {}
+# ignore file path => (mtime, rules)
+_ignore_rules: Dict[Text, Tuple[int, List[IgnoreRule]]] = {}
+_lock = threading.Lock()
+_is_disk_cache_loaded = False
+_is_cache_changed = False
+
+
+def _translate_glob(pattern: Text) -> Text:
+    """translate gitignore-style glob to regex, `*` does not match `/` while `**` does"""
+    regex = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**/", i):
+                regex.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                regex.append(".*")
+                i += 2
+                continue
+            regex.append("[^/]*")
+        elif c == "?":
+            regex.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                regex.append(re.escape(c))
+            else:
+                chars = pattern[i + 1 : end]  # noqa
+                if chars.startswith("!"):
+                    chars = "^" + chars[1:]
+                regex.append(f"[{chars}]")
+                i = end + 1
+                continue
+        elif c == "\\" and i + 1 < n:
+            regex.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            regex.append(re.escape(c))
+        i += 1
+
+    return "".join(regex)
+
+
+def parse_ignore_rules(lines: List[Text], base_dir: Text) -> List[IgnoreRule]:
+    """parse .gitignore-style lines, patterns are relative to base_dir"""
+    rules = []
+    for line in lines:
+        line = line.rstrip("\r\n").rstrip(" ")
+        if not line or line.startswith("#"):
+            continue
+
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+
+        # patterns with slash are matched from base_dir, others match names at any depth
+        if "/" in line:
+            regex = f"^{_translate_glob(line.lstrip('/'))}$"
+        else:
+            regex = f"^(?:.*/)?{_translate_glob(line)}$"
+
+        rules.append(IgnoreRule(base_dir, re.compile(regex), negate, dir_only))
+
+    return rules
+
+
+def _load_ignore_file(path: Text) -> Tuple[int, List[IgnoreRule]]:
+    """load rules of ignore file, rules are parsed again only if the file is changed"""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return 0, []
+
+    cached = _ignore_rules.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached
+
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            rules = parse_ignore_rules(f.readlines(), os.path.dirname(path))
+    except OSError:
+        rules = []
+
+    _ignore_rules[path] = (mtime, rules)
+    return mtime, rules
+
+
+def _load_dir_ignore_files(dir_path: Text) -> Tuple[Tuple, List[IgnoreRule]]:
+    signature, rules = [], []
+    for name in IGNORE_FILE_NAMES:
+        path = os.path.join(dir_path, name)
+        if not os.path.isfile(path):
+            continue
+        mtime, file_rules = _load_ignore_file(path)
+        signature.append((path, mtime))
+        rules.extend(file_rules)
+
+    return tuple(signature), rules
+
+
+def _load_ancestors_ignore_files(dir_path: Text) -> Tuple[Tuple, List[IgnoreRule]]:
+    """load ignore files in parent directories, up to the root of git repository"""
+    ancestors = []
+    parent = os.path.dirname(dir_path)
+    while parent and parent != dir_path:
+        ancestors.append(parent)
+        if os.path.isdir(os.path.join(parent, ".git")):
+            break
+        dir_path, parent = parent, os.path.dirname(parent)
+
+    signature, rules = (), []
+    for ancestor in reversed(ancestors):
+        ancestor_signature, ancestor_rules = _load_dir_ignore_files(ancestor)
+        signature += ancestor_signature
+        rules += ancestor_rules
+
+    return signature, rules
+
+
+def is_ignored(path: Text, is_dir: bool, rules: List[IgnoreRule]) -> bool:
+    """check if path is ignored by rules, the last matched rule wins"""
+    ignored = False
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+
+        # rules are loaded from ancestors of path
+        relative_path = path[len(rule.base_dir) :].lstrip(os.sep)  # noqa
+        if os.sep != "/":
+            relative_path = relative_path.replace(os.sep, "/")
+
+        if rule.regex.match(relative_path):
+            ignored = not rule.negate
+
+    return ignored
+
+
+def _is_virtualenv(dir_path: Text) -> bool:
+    return os.path.isfile(os.path.join(dir_path, "pyvenv.cfg"))
+
+
+def _scan_dir(
+    dir_path: Text, signature: Tuple, rules: List[IgnoreRule]
+) -> Optional[ScannedDir]:
+    """list sub directories and test files which are not ignored, cached by directory mtime"""
+    global _is_cache_changed
+    try:
+        signature = (os.stat(dir_path).st_mtime_ns, signature)
+    except OSError:
+        return None
+
+    cached = _scanned_dirs.get(dir_path)
+    if cached is not None and cached.signature == signature:
+        return cached
+
+    dir_names, file_names = [], []
+    try:
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+
+                if is_dir:
+                    if entry.name in IGNORED_DIR_NAMES or _is_virtualenv(entry.path):
+                        continue
+                    if not is_ignored(entry.path, True, rules):
+                        dir_names.append(entry.name)
+                elif entry.name.lower().endswith(TEST_FILE_SUFFIXES):
+                    if not is_ignored(entry.path, False, rules):
+                        file_names.append(entry.name)
+    except OSError as ex:
+        logger.warning(f"failed to scan directory {dir_path}: {ex}")
+        return None
+
+    scanned_dir = ScannedDir(signature, sorted(dir_names), sorted(file_names))
+    _scanned_dirs[dir_path] = scanned_dir
+    _is_cache_changed = True
+    return scanned_dir
+
+
+def iter_folder_files(folder_path: Text, recursive: bool = True) -> Iterator[Text]:
+    """iterate files endswith .yml/.yaml/.json/_test.py in folder, pruning ignored paths.
+    paths are joined with folder_path as it is, like os.walk.
+    """
+    abs_folder_path = os.path.abspath(folder_path)
+    if not os.path.isdir(abs_folder_path):
+        return
+
+    # rules in parent directories are applied to paths in folder, but not to folder itself
+    signature, rules = _load_ancestors_ignore_files(abs_folder_path)
+    stack = [(abs_folder_path, signature, rules)]
+    while stack:
+        dir_path, signature, rules = stack.pop()
+        dir_signature, dir_rules = _load_dir_ignore_files(dir_path)
+        signature, rules = signature + dir_signature, rules + dir_rules
+
+        scanned_dir = _scan_dir(dir_path, signature, rules)
+        if scanned_dir is None:
+            continue
+
+        relative_dir_path = dir_path[len(abs_folder_path) :].lstrip(os.sep)  # noqa
+        for file_name in scanned_dir.file_names:
+            yield os.path.join(folder_path, relative_dir_path, file_name)
+
+        if recursive:
+            for dir_name in reversed(scanned_dir.dir_names):
+                stack.append((os.path.join(dir_path, dir_name), signature, rules))
+
+
+def _sniff_keys(f, head: bytes, regex: Pattern) -> set:
+    keys = set(regex.findall(head))
+    if not keys & DECISIVE_KEYS and len(head) == SNIFF_SIZE:
+        # decisive keys may be after head, e.g. large config or long leading comments
+        keys.update(regex.findall(f.read()))
+
+    return keys
+
+
+def _classify(path: Text) -> Tuple[FileKind, Optional[Text]]:
+    with open(path, mode="rb") as f:
+        head = f.read(SNIFF_SIZE)
+
+        if path.lower().endswith("_test.py"):
+            if head.startswith(GENERATED_PYTEST_HEADER):
+                matched = _GENERATED_FROM_REGEX.search(head)
+                if matched:
+                    return FileKind.PYTEST, matched.group(1).decode("utf-8", "replace")
+            return FileKind.PYTEST, None
+
+        if path.lower().endswith(".json"):
+            if not head.lstrip().startswith(b"{"):
+                # arrays or scalars, e.g. data fixtures
+                return FileKind.OTHER, None
+            keys = _sniff_keys(f, head, _JSON_KEYS_REGEX)
+        else:
+            keys = _sniff_keys(f, head, _YAML_KEYS_REGEX)
+
+    if b"teststeps" in keys:
+        return FileKind.TESTCASE, None
+    elif b"testcases" in keys:
+        return FileKind.TESTSUITE, None
+    elif b"request" in keys:
+        # api in v2 format
+        return FileKind.TESTCASE, None
+
+    return FileKind.OTHER, None
+
+
+def classify_test_file(path: Text) -> Tuple[FileKind, Optional[Text]]:
+    """classify file by its first bytes, the source path is returned for generated pytest file"""
+    global _is_cache_changed
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return FileKind.OTHER, None
+
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _classified_files.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1], cached[2]
+
+    try:
+        kind, source = _classify(path)
+    except OSError:
+        return FileKind.OTHER, None
+
+    _classified_files[path] = (signature, kind, source)
+    _is_cache_changed = True
+    return kind, source
+
+
+def _get_disk_cache_path() -> Text:
+    return os.path.join(loader_settings.cache_dir, "discovery.json")
+
+
+def _as_tuple(value):
+    """signatures are nested tuples, which are loaded from JSON as lists"""
+    if isinstance(value, list):
+        return tuple(_as_tuple(item) for item in value)
+    return value
+
+
+def _is_names(value) -> bool:
+    return isinstance(value, list) and all(isinstance(name, str) for name in value)
+
+
+def _load_disk_cache() -> None:
+    global _is_disk_cache_loaded
+    _is_disk_cache_loaded = True
+    # cached as JSON instead of pickle, cache directory may be writable by others
+    try:
+        with open(_get_disk_cache_path(), mode="r", encoding="utf-8") as f:
+            content = json.load(f)
+
+        scanned_dirs = {}
+        for path, (signature, dir_names, file_names) in content["dirs"].items():
+            if not (_is_names(dir_names) and _is_names(file_names)):
+                raise ValueError(f"invalid names of directory {path}")
+            scanned_dirs[path] = ScannedDir(_as_tuple(signature), dir_names, file_names)
+
+        classified_files = {}
+        for path, (signature, kind, source) in content["files"].items():
+            if source is not None and not isinstance(source, str):
+                raise ValueError(f"invalid source of file {path}")
+            classified_files[path] = (_as_tuple(signature), FileKind(kind), source)
+    except FileNotFoundError:
+        return
+    except Exception as ex:
+        logger.warning(f"failed to load discovery cache: {ex}")
+        return
+
+    _scanned_dirs.update(scanned_dirs)
+    _classified_files.update(classified_files)
+
+
+def _save_disk_cache() -> None:
+    global _is_cache_changed
+    cache_path = _get_disk_cache_path()
+    tmp_cache_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    content = {
+        "dirs": {
+            path: list(scanned_dir) for path, scanned_dir in _scanned_dirs.items()
+        },
+        "files": {
+            path: [signature, kind.value, source]
+            for path, (signature, kind, source) in _classified_files.items()
+        },
+    }
+    try:
+        os.makedirs(loader_settings.cache_dir, exist_ok=True)
+        with open(tmp_cache_path, mode="w", encoding="utf-8") as f:
+            json.dump(content, f)
+        os.replace(tmp_cache_path, cache_path)
+        _is_cache_changed = False
+    except OSError as ex:
+        logger.warning(f"failed to save discovery cache: {ex}")
+
+
+def discover_test_files(folder_path: Text, recursive: bool = True) -> List[Text]:
+    """discover testcase/testsuite/pytest files in folder, other YAML/JSON files are skipped.
+
+    Generated pytest files are skipped if their sources are discovered too,
+    they will be made from sources again.
+    """
+    with _lock:
+        if loader_settings.cache_dir and not _is_disk_cache_loaded:
+            _load_disk_cache()
+
+        sources, pytest_files = [], []
+        for path in iter_folder_files(folder_path, recursive):
+            kind, source = classify_test_file(path)
+            if kind is FileKind.PYTEST:
+                pytest_files.append((path, source))
+            elif kind is not FileKind.OTHER:
+                sources.append(path)
+
+        # source paths in generated pytest files are relative to project root
+        sources_by_name: Dict[Text, List[Text]] = {}
+        for path in sources:
+            path = path.replace(os.sep, "/")
+            sources_by_name.setdefault(path.rsplit("/", 1)[-1], []).append(path)
+
+        test_files = list(sources)
+        for path, source in pytest_files:
+            if source:
+                source = "/" + source.replace("\\", "/").lstrip("/")
+                candidates = sources_by_name.get(source.rsplit("/", 1)[-1], [])
+                if any(candidate.endswith(source) for candidate in candidates):
+                    continue
+            test_files.append(path)
+
+        if loader_settings.cache_dir and _is_cache_changed:
+            _save_disk_cache()
+
+    return test_files
@@ -10,7 +10,7 @@ Usage:
 """
 
 from httprunner.ext.har2case.core import HarParser
-from sentry_sdk import capture_message
+from httprunner.sentry import capture_message
 
 
 def init_har2case_parser(subparsers):
@@ -6,11 +6,11 @@ import urllib.parse as urlparse
 from typing import Text
 
 from loguru import logger
-from sentry_sdk import capture_exception
 
 from httprunner.compat import ensure_path_sep
 from httprunner.ext.har2case import utils
-from httprunner.make import make_testcase, format_pytest_with_black
+from httprunner.make import make_testcase
+from httprunner.sentry import capture_exception
 
 try:
     from json.decoder import JSONDecodeError
@@ -371,7 +371,7 @@ class HarParser(object):
         else:
             # default to generate pytest file
             testcase["config"]["path"] = self.har_file_path
+            # made pytest file is formatted already
             output_testcase_file = make_testcase(testcase)
-            format_pytest_with_black(output_testcase_file)
 
         logger.info(f"generated testcase: {output_testcase_file}")
@@ -0,0 +1,149 @@
+""" Load testing with HttpRunner testcases, at target arrival rate independent of response latency.
+
+Usage:
+    # 50 testcase iterations per second for 60 seconds
+    $ hrun load testcases/demo_testcase.yml --rate 50 --duration 60
+
+    # ramp up from 10 to 200 iterations per second in 120 seconds, with 200 worker threads
+    $ hrun load testcases/ --ramp 10:200 --duration 120 --workers 200
+
+    # start from 10 iterations per second, increase by 10 every 30 seconds, save report
+    $ hrun load demo_test.py --step 10:10:30 --duration 300 --report-file load.json
+
+"""
+import importlib.util
+import inspect
+import json
+import os
+import sys
+from typing import List, Text, Type
+
+
+def init_load_parser(subparsers):
+    """load testing: parse command line options and run commands."""
+    parser = subparsers.add_parser(
+        "load",
+        help="Run HttpRunner testcases at target arrival rate for load testing.",
+    )
+    parser.add_argument(
+        "testcase_path",
+        nargs="*",
+        help="Specify YAML/JSON/pytest testcase file/folder path",
+    )
+    rate_group = parser.add_mutually_exclusive_group()
+    rate_group.add_argument(
+        "--rate",
+        type=float,
+        help="Constant arrival rate, testcase iterations started per second.",
+    )
+    rate_group.add_argument(
+        "--ramp",
+        metavar="START:END",
+        help="Arrival rate changes linearly from START to END in duration.",
+    )
+    rate_group.add_argument(
+        "--step",
+        metavar="START:INCREMENT:SECONDS",
+        help="Arrival rate starts from START, and is increased by INCREMENT every SECONDS.",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=60,
+        help="Seconds to start testcase iterations, default to 60.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=50,
+        help="Number of threads to run testcase iterations, default to 50.",
+    )
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=5,
+        help="Seconds between reports of latency percentiles, default to 5.",
+    )
+    parser.add_argument(
+        "--report-file",
+        help="Save stats of intervals and in total to JSON file.",
+    )
+
+    return parser
+
+
+def is_httprunner_testcase(item) -> bool:
+    """check if a variable is a HttpRunner testcase class"""
+    from httprunner import HttpRunner
+
+    return bool(
+        inspect.isclass(item)
+        and issubclass(item, HttpRunner)
+        and item.__name__ != "HttpRunner"
+    )
+
+
+def load_testcase_classes(pytest_files: List[Text]) -> List[Type]:
+    """import testcase classes defined in pytest files"""
+    testcase_classes = []
+    for pytest_file in pytest_files:
+        module_name = os.path.splitext(os.path.basename(pytest_file))[0]
+        spec = importlib.util.spec_from_file_location(module_name, pytest_file)
+        module = importlib.util.module_from_spec(spec)
+        # source file of testcase class is located by module
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+
+        for item in vars(module).values():
+            # referenced testcases imported from other pytest files are not run directly
+            if is_httprunner_testcase(item) and item.__module__ == module_name:
+                testcase_classes.append(item)
+
+    return testcase_classes
+
+
+def main_load(args) -> int:
+    from loguru import logger
+
+    from httprunner import exceptions
+    from httprunner.ext.load.engine import LoadRunner, format_summary
+    from httprunner.ext.load.profile import make_profile
+    from httprunner.make import main_make
+    from httprunner.sentry import capture_message
+    from httprunner.utils import ExtendJSONEncoder
+
+    capture_message("start to run load")
+
+    if not args.testcase_path:
+        logger.error("Testcase path is not specified, exit 1.")
+        sys.exit(1)
+
+    try:
+        profile = make_profile(args.duration, args.rate, args.ramp, args.step)
+    except exceptions.ParamsError as ex:
+        logger.error(ex)
+        sys.exit(1)
+
+    pytest_files = main_make(args.testcase_path)
+    testcase_classes = load_testcase_classes(pytest_files)
+    if not testcase_classes:
+        logger.error("No valid testcases found, exit 1.")
+        sys.exit(1)
+
+    # avoid print too much log details in console
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    report = LoadRunner(
+        testcase_classes,
+        profile,
+        workers=args.workers,
+        report_interval=args.report_interval,
+    ).run()
+    print(format_summary(report["total"], f"[total {report['duration']:.1f}s]"))
+
+    if args.report_file:
+        with open(args.report_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False, cls=ExtendJSONEncoder)
+
+    return 0
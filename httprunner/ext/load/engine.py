@@ -0,0 +1,253 @@
+"""
+Load engine: run HttpRunner testcases at the target arrival rate of profile, in a thread pool.
+
+Iterations are started at scheduled times whether or not former iterations are finished, so slow
+responses do not lower the load (open model). Latency of iteration is measured from its scheduled time,
+time waiting for an idle worker included, to avoid coordinated omission. Latencies of steps are the
+response times of requests, grouped by step name. Stats are reported for each interval and in total.
+"""
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Text, Tuple, Type
+
+from loguru import logger
+
+from httprunner.client import HttpSession
+from httprunner.core.runner.plan import TestCasePlan
+from httprunner.ext.load.histogram import PERCENTILES, Histogram
+from httprunner.ext.load.profile import ArrivalProfile
+from httprunner.models import SessionData, StepData
+from httprunner.runner import HttpRunner
+
+DEFAULT_WORKERS = 50
+# arrivals are dropped if so many iterations per worker are waiting, keep memory bounded
+MAX_PENDING_PER_WORKER = 10
+
+
+class LoadStats(object):
+    """latency histograms and errors by name, of testcases and steps"""
+
+    def __init__(self):
+        self.testcases: Dict[Text, Histogram] = {}
+        self.steps: Dict[Text, Histogram] = {}
+        self.errors: Dict[Tuple[Text, Text], int] = {}
+        self.started = 0
+        self.dropped = 0
+
+    def record(self, kind: Text, name: Text, latency_us: int, success: bool) -> None:
+        histograms = getattr(self, kind)
+        histograms.setdefault(name, Histogram()).record(latency_us)
+        if not success:
+            self.errors[(kind, name)] = self.errors.get((kind, name), 0) + 1
+
+    def merge(self, other: "LoadStats") -> None:
+        for kind in ("testcases", "steps"):
+            histograms = getattr(self, kind)
+            for name, histogram in getattr(other, kind).items():
+                histograms.setdefault(name, Histogram()).merge(histogram)
+
+        for key, count in other.errors.items():
+            self.errors[key] = self.errors.get(key, 0) + count
+        self.started += other.started
+        self.dropped += other.dropped
+
+    def summarize(self, seconds: float) -> Dict:
+        """percentiles in milliseconds, throughput per second and error rate by name"""
+        summary = {"started": self.started, "dropped": self.dropped}
+        for kind in ("testcases", "steps"):
+            summary[kind] = {}
+            for name, histogram in getattr(self, kind).items():
+                errors = self.errors.get((kind, name), 0)
+                item = {
+                    "count": histogram.count,
+                    "errors": errors,
+                    "error_rate": errors / histogram.count,
+                    "throughput": histogram.count / seconds if seconds > 0 else 0,
+                    "mean": histogram.mean / 1000,
+                    "max": histogram.max / 1000,
+                }
+                for percentile in PERCENTILES:
+                    item[f"p{percentile:g}"] = histogram.percentile(percentile) / 1000
+
+                summary[kind][name] = item
+
+        return summary
+
+
+def iter_step_latencies(step_datas: List[StepData]) -> Iterator[Tuple[Text, int]]:
+    """response time of requests in microseconds by step name, steps of referenced testcases included"""
+    for step_data in step_datas:
+        if isinstance(step_data.data, SessionData):
+            yield step_data.name, int(step_data.data.stat.response_time_ms * 1000)
+        elif isinstance(step_data.data, list):
+            yield from iter_step_latencies(step_data.data)
+
+
+def format_summary(summary: Dict, title: Text) -> Text:
+    percentile_names = [f"p{percentile:g}" for percentile in PERCENTILES]
+    lines = [
+        f"{title}  started: {summary['started']}  dropped: {summary['dropped']}",
+        f"  {'name':<40} {'count':>7} {'rps':>8} {'err%':>6} "
+        + " ".join(f"{name:>8}" for name in percentile_names)
+        + f" {'max':>8}",
+    ]
+    for kind in ("testcases", "steps"):
+        for name, item in summary[kind].items():
+            label = f"[{kind[:-1]}] {name}"
+            lines.append(
+                f"  {label[:40]:<40} {item['count']:>7} {item['throughput']:>8.1f} "
+                f"{item['error_rate'] * 100:>6.2f} "
+                + " ".join(f"{item[name]:>8.1f}" for name in percentile_names)
+                + f" {item['max']:>8.1f}"
+            )
+
+    return "\n".join(lines)
+
+
+def print_interval(elapsed: float, summary: Dict) -> None:
+    title = f"[{elapsed:>8.2f}s]  target rate: {summary['target_rate']:.1f}/s"
+    print(format_summary(summary, title), flush=True)
+
+
+class LoadRunner(object):
+    """
+    Run testcase classes at arrival rate of profile, testcases are picked in turn by their weight.
+
+    Examples:
+        profile = ConstantProfile(rate=50, duration=60)
+        report = LoadRunner([TestCaseLogin], profile, workers=100).run()
+    """
+
+    def __init__(
+        self,
+        testcase_classes: List[Type[HttpRunner]],
+        profile: ArrivalProfile,
+        workers: int = DEFAULT_WORKERS,
+        report_interval: float = 5.0,
+        reporter: Optional[Callable[[float, Dict], None]] = print_interval,
+    ):
+        self.plans = [
+            HttpRunner.compile(testcase_cls)
+            for testcase_cls in testcase_classes
+            for _ in range(max(testcase_cls.config.weight, 1))
+        ]
+        self.profile = profile
+        self.workers = workers
+        self.report_interval = report_interval
+        self.reporter = reporter
+
+        self.__lock = threading.Lock()
+        self.__interval_stats = LoadStats()
+        self.__total_stats = LoadStats()
+        self.__intervals: List[Dict] = []
+        self.__pending = 0
+        self.__local = threading.local()
+
+    def __get_session(self) -> HttpSession:
+        """one session for each worker thread, connections are reused by iterations"""
+        session = getattr(self.__local, "session", None)
+        if session is None:
+            session = self.__local.session = HttpSession()
+        return session
+
+    def __run_iteration(self, plan: TestCasePlan, scheduled_at: float) -> None:
+        session = self.__get_session()
+        # each iteration is a new user
+        session.cookies.clear()
+        runner = plan.testcase_cls()
+        success = True
+        try:
+            plan.execute(session=session, runner=runner)
+        except Exception as ex:
+            success = False
+            # failures are counted in stats, avoid flooding console under load
+            logger.debug(
+                f"testcase failed: {plan.config.name}\n{type(ex).__name__}: {ex}"
+            )
+
+        latency_us = int((time.perf_counter() - scheduled_at) * 1000000)
+        step_latencies = list(iter_step_latencies(runner.get_step_datas()))
+
+        with self.__lock:
+            self.__pending -= 1
+            stats = self.__interval_stats
+            stats.record("testcases", plan.config.name, latency_us, success)
+            for index, (name, step_latency_us) in enumerate(step_latencies):
+                # the last step run is the failed one
+                step_success = success or index < len(step_latencies) - 1
+                stats.record("steps", name, step_latency_us, step_success)
+
+    def __report(self, elapsed: float, seconds: float) -> None:
+        with self.__lock:
+            stats, self.__interval_stats = self.__interval_stats, LoadStats()
+            self.__total_stats.merge(stats)
+
+        summary = stats.summarize(seconds)
+        summary["elapsed"] = round(elapsed, 3)
+        summary["target_rate"] = self.profile.rate_at(
+            min(elapsed, self.profile.duration)
+        )
+        self.__intervals.append(summary)
+        if self.reporter:
+            self.reporter(elapsed, summary)
+
+    def __report_intervals(self, start: float, stopped: threading.Event) -> None:
+        for index in itertools.count(1):
+            if stopped.wait(start + index * self.report_interval - time.perf_counter()):
+                return
+            self.__report(index * self.report_interval, self.report_interval)
+
+    def __dispatch(self, executor: ThreadPoolExecutor, start: float) -> None:
+        max_pending = self.workers * MAX_PENDING_PER_WORKER
+        plans = itertools.cycle(self.plans)
+        for offset in self.profile.arrival_times():
+            scheduled_at = start + offset
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            plan = next(plans)
+            with self.__lock:
+                if self.__pending >= max_pending:
+                    self.__interval_stats.dropped += 1
+                    continue
+                self.__pending += 1
+                self.__interval_stats.started += 1
+
+            executor.submit(self.__run_iteration, plan, scheduled_at)
+
+    def run(self) -> Dict:
+        """run load test, return stats of intervals and in total"""
+        start = time.perf_counter()
+        stopped = threading.Event()
+        reporter_thread = threading.Thread(
+            target=self.__report_intervals, args=(start, stopped), daemon=True
+        )
+        reporter_thread.start()
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="hrun-load"
+        )
+        try:
+            self.__dispatch(executor, start)
+        except KeyboardInterrupt:
+            logger.warning("load test interrupted, wait for running iterations ...")
+            executor.shutdown(wait=True, cancel_futures=True)
+        finally:
+            executor.shutdown(wait=True)
+            stopped.set()
+            reporter_thread.join()
+
+        # the last incomplete interval
+        elapsed = time.perf_counter() - start
+        last_reported = len(self.__intervals) * self.report_interval
+        if elapsed > last_reported:
+            self.__report(elapsed, elapsed - last_reported)
+
+        return {
+            "duration": elapsed,
+            "intervals": self.__intervals,
+            "total": self.__total_stats.summarize(elapsed),
+        }
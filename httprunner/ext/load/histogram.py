@@ -0,0 +1,99 @@
+"""
+HDR-style histogram of latencies, recorded in integer microseconds.
+
+Values below 2 ** PRECISION_BITS are counted exactly, larger values are counted in log-linear buckets:
+each power of 2 range is divided into 2 ** (PRECISION_BITS - 1) sub-buckets, so any recorded value
+is reported within 0.1% of relative error, whatever its magnitude. Memory is bounded by the number of
+distinct buckets, not by the number of recorded values, and histograms of workers or intervals can be
+merged without losing precision.
+"""
+import math
+from typing import Dict
+
+PRECISION_BITS = 11
+SUB_BUCKET_HALF_COUNT = 1 << (PRECISION_BITS - 1)
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def get_bucket_index(value: int) -> int:
+    """index of bucket which the value is counted in, values of one bucket are equivalent"""
+    if value < (1 << PRECISION_BITS):
+        return value
+
+    # value = sub_bucket << shift, sub_bucket in [SUB_BUCKET_HALF_COUNT, 2 * SUB_BUCKET_HALF_COUNT)
+    shift = value.bit_length() - PRECISION_BITS
+    return shift * SUB_BUCKET_HALF_COUNT + (value >> shift)
+
+
+def get_highest_equivalent_value(index: int) -> int:
+    """highest value counted in bucket of index"""
+    if index < (1 << PRECISION_BITS):
+        return index
+
+    shift = index // SUB_BUCKET_HALF_COUNT - 1
+    sub_bucket = index - shift * SUB_BUCKET_HALF_COUNT
+    return ((sub_bucket + 1) << shift) - 1
+
+
+class Histogram(object):
+    """
+    Latency histogram, not thread safe, lock it if recorded by several threads.
+
+    Examples:
+        histogram = Histogram()
+        histogram.record(1500)
+        histogram.percentile(99.9)
+    """
+
+    def __init__(self):
+        # bucket index -> count
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value: int, count: int = 1) -> None:
+        value = max(int(value), 0)
+        index = get_bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += count
+        self.total += value * count
+
+    def merge(self, other: "Histogram") -> None:
+        if other.count == 0:
+            return
+
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+
+        if self.count == 0 or other.min < self.min:
+            self.min = other.min
+        if other.max > self.max:
+            self.max = other.max
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, percentile: float) -> int:
+        """value at percentile, e.g. 99.9, 0 if nothing recorded"""
+        if self.count == 0:
+            return 0
+
+        target = max(math.ceil(percentile / 100 * self.count), 1)
+        cumulative = 0
+        for index in sorted(self.counts):
+            cumulative += self.counts[index]
+            if cumulative >= target:
+                return min(get_highest_equivalent_value(index), self.max)
+
+        return self.max
@@ -0,0 +1,144 @@
+"""
+Arrival profiles of load testing, how many testcase iterations are started per second.
+
+Iterations are started at scheduled times whether or not former iterations are finished (open model),
+arrivals are evenly spaced, the n-th arrival is scheduled when the expected arrivals reach n.
+"""
+import math
+from typing import Iterator, Text
+
+from httprunner import exceptions
+
+# scheduled times are searched to the precision of 1 microsecond
+TIME_PRECISION = 1e-6
+
+
+class ArrivalProfile(object):
+    """target arrival rate (per second) varying with seconds elapsed since start"""
+
+    def __init__(self, duration: float):
+        if duration <= 0:
+            raise exceptions.ParamsError(f"duration should be positive: {duration}")
+        self.duration = duration
+
+    def rate_at(self, elapsed: float) -> float:
+        raise NotImplementedError
+
+    def arrivals_until(self, elapsed: float) -> float:
+        """expected number of arrivals in [0, elapsed], integral of rate"""
+        raise NotImplementedError
+
+    def arrival_times(self) -> Iterator[float]:
+        """scheduled times of arrivals, in seconds elapsed since start"""
+        total = self.arrivals_until(self.duration)
+        elapsed = 0.0
+        n = 0
+        while n < total:
+            # arrivals_until is non-decreasing, bisect in [elapsed, duration]
+            low, high = elapsed, self.duration
+            while high - low > TIME_PRECISION:
+                middle = (low + high) / 2
+                if self.arrivals_until(middle) >= n:
+                    high = middle
+                else:
+                    low = middle
+
+            elapsed = high
+            yield elapsed
+            n += 1
+
+
+class ConstantProfile(ArrivalProfile):
+    def __init__(self, rate: float, duration: float):
+        super().__init__(duration)
+        self.rate = rate
+
+    def rate_at(self, elapsed: float) -> float:
+        return self.rate
+
+    def arrivals_until(self, elapsed: float) -> float:
+        return self.rate * elapsed
+
+
+class RampProfile(ArrivalProfile):
+    """rate changes linearly from start_rate to end_rate in duration"""
+
+    def __init__(self, start_rate: float, end_rate: float, duration: float):
+        super().__init__(duration)
+        self.start_rate = start_rate
+        self.end_rate = end_rate
+
+    def rate_at(self, elapsed: float) -> float:
+        return (
+            self.start_rate
+            + (self.end_rate - self.start_rate) * elapsed / self.duration
+        )
+
+    def arrivals_until(self, elapsed: float) -> float:
+        return self.start_rate * elapsed + (
+            self.end_rate - self.start_rate
+        ) * elapsed**2 / (2 * self.duration)
+
+
+class StepProfile(ArrivalProfile):
+    """rate starts from start_rate, and is increased by step_rate every step_duration"""
+
+    def __init__(
+        self, start_rate: float, step_rate: float, step_duration: float, duration: float
+    ):
+        super().__init__(duration)
+        if step_duration <= 0:
+            raise exceptions.ParamsError(
+                f"step duration should be positive: {step_duration}"
+            )
+        self.start_rate = start_rate
+        self.step_rate = step_rate
+        self.step_duration = step_duration
+
+    def rate_at(self, elapsed: float) -> float:
+        steps = math.floor(elapsed / self.step_duration)
+        return self.start_rate + self.step_rate * steps
+
+    def arrivals_until(self, elapsed: float) -> float:
+        steps = math.floor(elapsed / self.step_duration)
+        # full steps: sum of start_rate + step_rate * i for i in [0, steps)
+        arrivals = (
+            self.start_rate * steps + self.step_rate * steps * (steps - 1) / 2
+        ) * self.step_duration
+        return arrivals + self.rate_at(elapsed) * (elapsed - steps * self.step_duration)
+
+
+def parse_rates(value: Text, count: int) -> list:
+    """parse rates joined with colon, e.g. 10:100 of --ramp"""
+    items = value.split(":")
+    if len(items) != count:
+        raise exceptions.ParamsError(
+            f"{count} numbers joined with colon expected: {value}"
+        )
+
+    try:
+        rates = [float(item) for item in items]
+    except ValueError:
+        raise exceptions.ParamsError(f"invalid number in {value}")
+
+    # rates of --ramp, start rate and increment of --step
+    if any(rate < 0 for rate in rates[:2]):
+        raise exceptions.ParamsError(f"rate should not be negative: {value}")
+
+    return rates
+
+
+def make_profile(
+    duration: float, rate: float = None, ramp: Text = None, step: Text = None
+) -> ArrivalProfile:
+    """make profile from cli options, --rate, --ramp START:END or --step START:INCREMENT:SECONDS"""
+    if ramp:
+        start_rate, end_rate = parse_rates(ramp, 2)
+        return RampProfile(start_rate, end_rate, duration)
+    elif step:
+        start_rate, step_rate, step_duration = parse_rates(step, 3)
+        return StepProfile(start_rate, step_rate, step_duration, duration)
+
+    if rate is None or rate <= 0:
+        raise exceptions.ParamsError(f"rate should be positive: {rate}")
+    return ConstantProfile(rate, duration)
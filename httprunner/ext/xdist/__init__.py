@@ -0,0 +1,64 @@
+"""
+pytest-xdist scheduler, tests estimated to take longest are sent to workers first.
+
+This module is imported by the pytest plugin only if pytest-xdist is installed and used.
+"""
+from typing import Dict, Text
+
+from xdist.scheduler import LoadScheduling
+
+from httprunner.timing import sort_longest_first
+
+
+class LongestFirstScheduling(LoadScheduling):
+    """Longest processing time first, the same as `--dist load` other than scheduling order.
+
+    Tests are sorted by durations of previous runs, each worker is sent one test more
+    than it is running, so that the next longest test goes to the first idle worker.
+    """
+
+    def __init__(self, config, log=None, timings: Dict[Text, float] = None):
+        super().__init__(config, log)
+        self.timings = timings or {}
+
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+
+        if self.pending:
+            node_pending = self.node2pending[node]
+            if len(node_pending) < 2:
+                self._send_tests(node, 2 - len(node_pending))
+        else:
+            node.shutdown()
+
+        self.log("num items waiting for node:", len(self.pending))
+
+    def schedule(self):
+        assert self.collection_is_completed
+
+        # initial distribution has been done already
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        # collections are identical, use the first one
+        self.collection = list(self.node2collection.values())[0]
+        self.pending[:] = sort_longest_first(self.collection, self.timings)
+        if not self.collection:
+            return
+
+        # send tests round robin, two tests for each worker at most
+        for _ in range(2):
+            for node in self.nodes:
+                if self.pending:
+                    self._send_tests(node, 1)
+
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
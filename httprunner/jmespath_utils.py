@@ -0,0 +1,39 @@
+from functools import lru_cache
+from typing import Any, List, Optional, Text, Tuple
+
+import jmespath
+from jmespath.parser import ParsedResult
+
+
+@lru_cache(maxsize=1024)
+def compile_jmespath(expr: Text) -> ParsedResult:
+    """Compile JMESPath expression and cache the compiled result.
+
+    The same expressions are searched again and again by validators and extractors,
+    compiling them only once avoids re-parsing each time.
+    """
+    return jmespath.compile(expr)
+
+
+def flatten_simple_path(node: dict) -> Optional[List[Tuple[Text, Any]]]:
+    """Flatten JMESPath AST to a list of steps, return None if it is not a simple field path.
+
+    Simple field paths only consist of fields and indexes, e.g. body.json.locations[0].name,
+    each step is a tuple of step type ("field" or "index") and the field name or index.
+    """
+    node_type = node["type"]
+    if node_type in ("field", "index"):
+        return [(node_type, node["value"])]
+    elif node_type == "identity":
+        return []
+    elif node_type in ("subexpression", "index_expression"):
+        steps = []
+        for child in node["children"]:
+            child_steps = flatten_simple_path(child)
+            if child_steps is None:
+                return None
+            steps.extend(child_steps)
+        return steps
+    else:
+        # projections, filters, functions, pipes, etc.
+        return None
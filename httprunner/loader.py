@@ -1,9 +1,11 @@
 import csv
+import hashlib
 import importlib
 import json
 import os
 import sys
-from argparse import ArgumentParser
+import threading
+from collections import OrderedDict
 from importlib.metadata import entry_points
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Text, Tuple, Union
@@ -11,9 +13,12 @@ from typing import Callable, Dict, List, Optional, Text, Tuple, Union
 import yaml
 from _pytest.pathlib import absolutepath
 from loguru import logger
+from pydantic import VERSION as PYDANTIC_VERSION
 from pydantic import ValidationError
 
-from httprunner import builtin, exceptions, utils
+from httprunner import __version__, builtin, exceptions, utils
+from httprunner.configs.loader import loader_settings
+from httprunner.discovery import iter_folder_files
 from httprunner.models import ProjectMeta, TestCase, TestSuite
 from httprunner.pyproject import locate_pyproject_toml_dir
 
@@ -24,15 +29,26 @@ try:
 except AttributeError:
     pass
 
+# C implementation is much faster, it's available only if PyYAML was built with libyaml
+YamlLoader = getattr(yaml, "CFullLoader", yaml.FullLoader)
 
 project_meta: Union[ProjectMeta, None] = None
 
+# project root path -> ((debugtalk.py mtime, .env mtime), loaded project meta)
+_cached_project_metas: Dict[Text, Tuple[Tuple[int, int], ProjectMeta]] = {}
+# functions from httprunner.debugtalk entry points, resolved once per process
+_entry_point_functions: Optional[Dict[Text, Callable]] = None
+
+# absolute path -> ((mtime, size), validated testcase)
+_cached_testcases: "OrderedDict[Text, Tuple[Tuple[int, int], TestCase]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
 
 def _load_yaml_file(yaml_file: Text) -> Dict:
     """load yaml file and check file content format"""
     with open(yaml_file, mode="rb") as stream:
         try:
-            yaml_content = yaml.load(stream)
+            yaml_content = yaml.load(stream, Loader=YamlLoader)
         except yaml.YAMLError as ex:
             err_msg = f"YAMLError:\nfile: {yaml_file}\nerror: {ex}"
             logger.error(err_msg)
@@ -83,10 +99,95 @@ def load_testcase(testcase: Dict) -> TestCase:
     return testcase_obj
 
 
-def load_testcase_file(testcase_file: Text) -> TestCase:
-    """load testcase file and validate with pydantic model"""
+def _validate_testcase_file(testcase_file: Text) -> TestCase:
     testcase_content = load_test_file(testcase_file)
-    testcase_obj = load_testcase(testcase_content)
+    return load_testcase(testcase_content)
+
+
+def _get_disk_cache_path(testcase_file: Text, content: bytes) -> Text:
+    """Testcases on disk are keyed by content, which stay valid after files are checked out again."""
+    digest = hashlib.sha1(content)
+    # file suffix decides how content is parsed, models may change between versions
+    file_suffix = os.path.splitext(testcase_file)[1].lower()
+    digest.update(f"{file_suffix}|{__version__}|{PYDANTIC_VERSION}".encode("utf-8"))
+    return os.path.join(loader_settings.cache_dir, f"{digest.hexdigest()}.json")
+
+
+def _load_validated_testcase(testcase_file: Text) -> TestCase:
+    """Load testcase from disk cache if enabled, otherwise parse and validate file content."""
+    if not loader_settings.cache_dir:
+        return _validate_testcase_file(testcase_file)
+
+    with open(testcase_file, mode="rb") as f:
+        cache_path = _get_disk_cache_path(testcase_file, f.read())
+
+    # cached as JSON instead of pickle, cache directory may be writable by others
+    try:
+        with open(cache_path, mode="r", encoding="utf-8") as f:
+            return TestCase.model_validate(json.load(f))
+    except FileNotFoundError:
+        pass
+    except Exception as ex:
+        logger.warning(f"failed to load cached testcase {cache_path}: {ex}")
+
+    testcase_obj = _validate_testcase_file(testcase_file)
+
+    try:
+        # fields not set are left to defaults when validated again
+        content = testcase_obj.model_dump_json(by_alias=True, exclude_unset=True)
+        # values not kept by JSON, e.g. dates in YAML, can not be cached
+        if TestCase.model_validate(json.loads(content)) != testcase_obj:
+            return testcase_obj
+    except ValueError as ex:
+        logger.debug(f"testcase {testcase_file} can not be cached: {ex}")
+        return testcase_obj
+
+    # write to temporary file first, other processes may be reading the same cache
+    tmp_cache_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(loader_settings.cache_dir, exist_ok=True)
+        with open(tmp_cache_path, mode="w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_cache_path, cache_path)
+    except OSError as ex:
+        logger.warning(f"failed to cache testcase {cache_path}: {ex}")
+
+    return testcase_obj
+
+
+def load_testcase_file(testcase_file: Text) -> TestCase:
+    """load testcase file and validate with pydantic model
+
+    Validated testcases are cached in memory until files are changed, cache hits skip both
+    parsing and validation. They are also cached on disk as JSON if HTTPRUNNER_LOADER_CACHE_DIR
+    is set, disk cache hits skip parsing test files.
+    Each call gets its own copy, which can be changed while running.
+    """
+    if not loader_settings.cache_enabled or not os.path.isfile(testcase_file):
+        testcase_obj = _validate_testcase_file(testcase_file)
+        testcase_obj.config.path = testcase_file
+        return testcase_obj
+
+    abs_path = os.path.abspath(testcase_file)
+    stat = os.stat(abs_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _cache_lock:
+        cached = _cached_testcases.get(abs_path)
+        if cached is not None and cached[0] == signature:
+            _cached_testcases.move_to_end(abs_path)
+            testcase_obj = cached[1]
+        else:
+            testcase_obj = None
+
+    if testcase_obj is None:
+        testcase_obj = _load_validated_testcase(abs_path)
+        with _cache_lock:
+            _cached_testcases[abs_path] = (signature, testcase_obj)
+            while len(_cached_testcases) > loader_settings.max_cached_testcases:
+                _cached_testcases.popitem(last=False)
+
+    testcase_obj = testcase_obj.model_copy(deep=True)
     testcase_obj.config.path = testcase_file
     return testcase_obj
 
@@ -192,6 +293,7 @@ def load_csv_file(csv_file: Text) -> List[Dict]:
 
 def load_folder_files(folder_path: Text, recursive: bool = True) -> List:
     """load folder path, return all files endswith .yml/.yaml/.json/_test.py in list.
+        directories like .git/node_modules/virtualenvs and paths ignored by .gitignore/.hrunignore are pruned.
 
     Args:
         folder_path (str): specified folder path to load
@@ -207,28 +309,7 @@ def load_folder_files(folder_path: Text, recursive: bool = True) -> List:
 
         return files
 
-    if not os.path.exists(folder_path):
-        return []
-
-    file_list = []
-
-    for dirpath, dirnames, filenames in os.walk(folder_path):
-        filenames_list = []
-
-        for filename in filenames:
-            if not filename.lower().endswith((".yml", ".yaml", ".json", "_test.py")):
-                continue
-
-            filenames_list.append(filename)
-
-        for filename in filenames_list:
-            file_path = os.path.join(dirpath, filename)
-            file_list.append(file_path)
-
-        if not recursive:
-            break
-
-    return file_list
+    return list(iter_folder_files(folder_path, recursive))
 
 
 def load_module_functions(module) -> Dict[Text, Callable]:
@@ -297,6 +378,19 @@ def locate_file(start_path: Text, file_name: Text) -> Text:
     return locate_file(parent_dir, file_name)
 
 
+def get_debugtalk_py_file_option(argv: List[Text]) -> Optional[Text]:
+    """get value of --debugtalk-py-file from command line arguments, the last one wins"""
+    option = "--debugtalk-py-file"
+    value = None
+    for index, arg in enumerate(argv):
+        if arg == option and index + 1 < len(argv):
+            value = argv[index + 1]
+        elif arg.startswith(f"{option}="):
+            value = arg[len(option) + 1 :]
+
+    return value
+
+
 def locate_httprunner_root_path() -> Tuple[Optional[Text], Text]:
     """locate debugtalk.py path as httprunner root path.
 
@@ -304,9 +398,7 @@ def locate_httprunner_root_path() -> Tuple[Optional[Text], Text]:
         (str, str): debugtalk.py path, httprunner root path
     """
     # try to locate debugtalk.py file from command line option
-    parser = ArgumentParser()
-    parser.add_argument("--debugtalk-py-file", action="store")
-    if debugtalk_py_file := parser.parse_known_args(sys.argv)[0].debugtalk_py_file:
+    if debugtalk_py_file := get_debugtalk_py_file_option(sys.argv):
         debugtalk_py_file = absolutepath(debugtalk_py_file)
 
         if not debugtalk_py_file.is_file():
@@ -405,10 +497,40 @@ def load_debugtalk_functions() -> Dict[Text, Callable]:
     return load_module_functions(imported_module)
 
 
+def load_entry_point_functions() -> Dict[Text, Callable]:
+    """load functions from httprunner.debugtalk entry points, only once per process"""
+    global _entry_point_functions
+    if _entry_point_functions is not None:
+        return _entry_point_functions
+
+    all_entry_points = entry_points()
+    if hasattr(all_entry_points, "select"):
+        debugtalk_entry_points = all_entry_points.select(group="httprunner.debugtalk")
+    else:
+        # Python < 3.10
+        debugtalk_entry_points = all_entry_points.get("httprunner.debugtalk", ())
+
+    functions = {}
+    for entry_point in debugtalk_entry_points:
+        functions.update(load_module_functions(entry_point.load()))
+
+    _entry_point_functions = functions
+    return functions
+
+
+def _get_mtime(path: Optional[Text]) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, TypeError):
+        return 0
+
+
 def load_project_meta(test_path: Text = None, reload: bool = False) -> ProjectMeta:
     """load testcases, .env, debugtalk.py, entry point functions.
         testcases folder is relative to project_root_directory.
         by default, project_meta will be loaded only once, unless set reload to true.
+        loaded project meta is cached for each project root, and loaded again
+        only if debugtalk.py or .env is modified.
 
     Args:
         test_path (str): test file/folder path, locate project RootDir from this path.
@@ -422,8 +544,6 @@ def load_project_meta(test_path: Text = None, reload: bool = False) -> ProjectMe
     if project_meta and (not reload):
         return project_meta
 
-    project_meta = ProjectMeta()
-
     # search recursively upward until file debugtalk.py was found starting from test_path and
     # project_root_directory was set to the parent directory of debugtalk.py.
     # WARNING: functions imported into debugtalk.py may not be recognized as debugtalk functions
@@ -436,24 +556,35 @@ def load_project_meta(test_path: Text = None, reload: bool = False) -> ProjectMe
     else:
         debugtalk_path, project_root_directory = locate_httprunner_root_path()
 
-    # add project RootDir to sys.path
-    sys.path.insert(0, project_root_directory)
+    # add project RootDir to sys.path, in front of other project roots
+    if not sys.path or sys.path[0] != project_root_directory:
+        if project_root_directory in sys.path:
+            sys.path.remove(project_root_directory)
+        sys.path.insert(0, project_root_directory)
+
+    dot_env_path = os.path.join(project_root_directory, ".env")
+    signature = (_get_mtime(debugtalk_path), _get_mtime(dot_env_path))
+    cached = _cached_project_metas.get(project_root_directory)
+    if cached and cached[0] == signature and cached[1].debugtalk_path == debugtalk_path:
+        project_meta = cached[1]
+        if project_meta.env:
+            # environment variables maybe overridden by another project
+            utils.set_os_environ(project_meta.env)
+        return project_meta
+
+    project_meta = ProjectMeta()
 
     # load .env file
     # NOTICE:
     # environment variable maybe loaded in debugtalk.py
     # thus .env file should be loaded before loading debugtalk.py
-    dot_env_path = os.path.join(project_root_directory, ".env")
     dot_env = load_dot_env_file(dot_env_path)
     if dot_env:
         project_meta.env = dot_env
         project_meta.dot_env_path = dot_env_path
 
-    debugtalk_functions = {}
-
     # load functions from entry_points
-    for entry_point in entry_points().get("httprunner.debugtalk", ()):
-        debugtalk_functions.update(load_module_functions(entry_point.load()))
+    debugtalk_functions = dict(load_entry_point_functions())
 
     # priority: debugtalk.py > entry_points
     if debugtalk_path:
@@ -464,6 +595,7 @@ def load_project_meta(test_path: Text = None, reload: bool = False) -> ProjectMe
     project_meta.functions = debugtalk_functions
     project_meta.debugtalk_path = debugtalk_path
 
+    _cached_project_metas[project_root_directory] = (signature, project_meta)
     return project_meta
 
 
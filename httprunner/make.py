@@ -1,12 +1,15 @@
+import hashlib
+import json
+import multiprocessing
 import os
 import string
-import subprocess
 import sys
-from typing import Dict, List, Set, Text, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Text, Tuple
 
 import jinja2
 from loguru import logger
-from sentry_sdk import capture_exception
 
 from httprunner import __version__, exceptions
 from httprunner.compat import (
@@ -15,15 +18,16 @@ from httprunner.compat import (
     ensure_testcase_v3,
     ensure_testcase_v3_api,
 )
+from httprunner.discovery import discover_test_files
 from httprunner.loader import (
     convert_relative_project_root_dir,
-    load_folder_files,
     load_project_meta,
     load_test_file,
     load_testcase,
     load_testsuite,
 )
 from httprunner.response import uniform_validator
+from httprunner.sentry import capture_exception
 from httprunner.utils import is_support_multiprocessing, merge_variables
 
 """ cache converted pytest files, avoid duplicate making
@@ -34,6 +38,42 @@ pytest_files_made_cache_mapping: Dict[Text, Text] = {}
 """
 pytest_files_run_set: Set = set()
 
+""" pytest files written in current making, others are unchanged and need no formatting
+"""
+pytest_files_written_set: Set = set()
+
+""" manifest of made pytest files, saved under project root to make changed files only
+    pytest file relative path => {
+        "input_hash": hash of testcase content,
+        "class_name": testcase class name,
+        "refs": {referenced testcase relative path: [file hash, pytest file relative path]},
+        "is_formatted": whether pytest file was formatted with black
+    }
+"""
+make_manifest: Dict[Text, Dict] = {}
+
+MANIFEST_FILE_NAME = ".hmake_manifest.json"
+
+# file path => content hash, files are hashed once in each making
+__file_hashes: Dict[Text, Text] = {}
+
+""" format generated pytest files with black, disabled by --no-format
+"""
+is_format_enabled: bool = True
+
+# max number of formatted contents cached, least recently used ones are dropped first
+MAX_FORMATTED_CONTENTS = 1024
+
+# black mode and hash of pytest file content => formatted content
+__formatted_contents: "OrderedDict[Text, Text]" = OrderedDict()
+# directory of pytest file => black mode configured in pyproject.toml
+__black_modes: Dict[Text, object] = {}
+
+""" pytest files claimed by worker processes when making in parallel, shared by all workers
+    pytest file absolute path => pid of the worker making it
+"""
+claimed_pytest_files: Optional[Dict[Text, int]] = None
+
 __TEMPLATE__ = jinja2.Template(
     """# NOTE: Generated By HttpRunner v{{ version }}
 # FROM: {{ testcase_path }}
@@ -164,28 +204,82 @@ def convert_testcase_path(testcase_abs_path: Text) -> Tuple[Text, Text]:
     return testcase_python_abs_path, name_in_title_case
 
 
-def format_pytest_with_black(*python_paths: Text) -> None:
-    logger.info("format pytest cases with black ...")
-    try:
-        if is_support_multiprocessing() or len(python_paths) <= 1:
-            subprocess.run(["black", *python_paths])
-        else:
-            logger.warning(
-                "this system does not support multiprocessing well, format files one by one ..."
+def __get_black_mode(black, dir_path: Text):
+    """black mode configured in [tool.black] of pyproject.toml, which is located as black does"""
+    if dir_path in __black_modes:
+        return __black_modes[dir_path]
+
+    mode = black.Mode()
+    pyproject_path = black.find_pyproject_toml((dir_path,))
+    if pyproject_path:
+        try:
+            config = black.parse_pyproject_toml(pyproject_path)
+            mode = black.Mode(
+                target_versions={
+                    black.TargetVersion[version.upper()]
+                    for version in config.get("target_version", [])
+                },
+                line_length=config.get("line_length", black.DEFAULT_LINE_LENGTH),
+                string_normalization=not config.get("skip_string_normalization"),
+                magic_trailing_comma=not config.get("skip_magic_trailing_comma"),
+                experimental_string_processing=config.get(
+                    "experimental_string_processing", False
+                ),
+                preview=config.get("preview", False),
             )
-            [subprocess.run(["black", path]) for path in python_paths]
-    except subprocess.CalledProcessError as ex:
+        except Exception as ex:
+            logger.warning(f"failed to load black config from {pyproject_path}: {ex}")
+
+    __black_modes[dir_path] = mode
+    return mode
+
+
+def format_pytest_content(content: Text, path: Text = None) -> Text:
+    """format pytest file content with black in process, formatted contents are cached by content hash.
+    black config is loaded from pyproject.toml located from directory of path, or cwd if path is None.
+    content is returned as it is if black is not installed or failed to format it.
+    """
+    try:
+        # black is imported only when there are files to format
+        import black
+    except ImportError:
+        logger.warning(
+            "missing dependency tool: black, pytest files will not be formatted\n"
+            "install black manually and try again:\n$ pip install black"
+        )
+        return content
+
+    dir_path = os.path.dirname(os.path.abspath(path)) if path else os.getcwd()
+    mode = __get_black_mode(black, dir_path)
+    content_hash = hashlib.sha1(content.encode("utf-8")).hexdigest()
+    cache_key = f"{mode.get_cache_key()}|{content_hash}"
+    if cache_key in __formatted_contents:
+        __formatted_contents.move_to_end(cache_key)
+        return __formatted_contents[cache_key]
+
+    try:
+        formatted_content = black.format_str(content, mode=mode)
+    except Exception as ex:
         capture_exception(ex)
-        logger.error(ex)
-        sys.exit(1)
-    except FileNotFoundError:
-        err_msg = """
-missing dependency tool: black
-install black manually and try again:
-$ pip install black
-"""
-        logger.error(err_msg)
-        sys.exit(1)
+        logger.warning(f"failed to format pytest file with black: {ex}")
+        return content
+
+    __formatted_contents[cache_key] = formatted_content
+    while len(__formatted_contents) > MAX_FORMATTED_CONTENTS:
+        __formatted_contents.popitem(last=False)
+    return formatted_content
+
+
+def format_pytest_with_black(*python_paths: Text) -> None:
+    logger.info("format pytest cases with black ...")
+    for path in python_paths:
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+
+        formatted_content = format_pytest_content(content, path)
+        if formatted_content != content:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(formatted_content)
 
 
 def make_config_chain_style(config: Dict) -> Text:
@@ -310,6 +404,16 @@ def make_teststep_chain_style(teststep: Dict) -> Text:
         export: List[Text] = teststep["export"]
         step_info += f".export(*{export})"
 
+    if "share" in teststep:
+        # reference testcase step, run once and reuse its exported variables and cookies
+        share = teststep["share"]
+        if share is True:
+            step_info += ".shared()"
+        elif isinstance(share, Dict):
+            step_info += f".shared(**{share})"
+        elif share:
+            raise exceptions.TestCaseFormatError(f"Invalid share: {share}")
+
     if "validate" in teststep:
         step_info += ".validate()"
 
@@ -335,14 +439,107 @@ def make_teststep_chain_style(teststep: Dict) -> Text:
     return f"Step({step_info})"
 
 
+def get_file_hash(file_path: Text) -> Text:
+    if file_path not in __file_hashes:
+        with open(file_path, mode="rb") as f:
+            __file_hashes[file_path] = hashlib.sha1(f.read()).hexdigest()
+
+    return __file_hashes[file_path]
+
+
+def get_content_hash(content: Dict) -> Text:
+    try:
+        dumped_content = json.dumps(content, sort_keys=True, default=str)
+    except TypeError:
+        # keys in different types can not be sorted
+        dumped_content = repr(content)
+
+    return hashlib.sha1(dumped_content.encode("utf-8")).hexdigest()
+
+
+def __get_manifest_path() -> Text:
+    return os.path.join(load_project_meta().httprunner_root_path, MANIFEST_FILE_NAME)
+
+
+def load_make_manifest() -> None:
+    """load manifest of made pytest files, manifest made by other version is discarded"""
+    make_manifest.clear()
+    manifest_path = __get_manifest_path()
+    if not os.path.isfile(manifest_path):
+        return
+
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as ex:
+        logger.warning(f"failed to load make manifest {manifest_path}: {ex}")
+        return
+
+    if manifest.get("version") == __version__:
+        make_manifest.update(manifest.get("files", {}))
+
+
+def save_make_manifest() -> None:
+    manifest_path = __get_manifest_path()
+    try:
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": __version__, "files": make_manifest}, f, sort_keys=True
+            )
+    except OSError as ex:
+        logger.warning(f"failed to save make manifest {manifest_path}: {ex}")
+
+
+def __is_made_file_fresh(pytest_file: Text, input_hash: Text = None) -> bool:
+    """check if pytest file made before is still valid, referenced testcases are checked recursively"""
+    entry = make_manifest.get(pytest_file)
+    if not entry:
+        return False
+
+    if input_hash and entry["input_hash"] != input_hash:
+        return False
+
+    if is_format_enabled and not entry.get("is_formatted"):
+        return False
+
+    root_path = load_project_meta().httprunner_root_path
+    if not os.path.isfile(os.path.join(root_path, pytest_file)):
+        return False
+
+    for ref_testcase_path, (ref_hash, ref_pytest_file) in entry["refs"].items():
+        ref_testcase_abs_path = os.path.join(root_path, ref_testcase_path)
+        if not os.path.isfile(ref_testcase_abs_path):
+            return False
+
+        if get_file_hash(ref_testcase_abs_path) != ref_hash:
+            return False
+
+        if not __is_made_file_fresh(ref_pytest_file):
+            return False
+
+    return True
+
+
+def __reuse_made_file(pytest_file: Text) -> None:
+    """cache pytest file made before with its referenced testcases, as if they were made"""
+    root_path = load_project_meta().httprunner_root_path
+    entry = make_manifest[pytest_file]
+    pytest_files_made_cache_mapping[os.path.join(root_path, pytest_file)] = entry[
+        "class_name"
+    ]
+
+    for _, ref_pytest_file in entry["refs"].values():
+        __reuse_made_file(ref_pytest_file)
+
+
 def make_testcase(testcase: Dict, dir_path: Text = None) -> Text:
     """convert valid testcase dict to pytest file path"""
+    # testcase with the same content will be made to the same pytest file
+    input_hash = get_content_hash(testcase)
+
     # ensure compatibility with testcase format v2
     testcase = ensure_testcase_v3(testcase)
 
-    # validate testcase format
-    load_testcase(testcase)
-
     testcase_abs_path = __ensure_absolute(testcase["config"]["path"])
     logger.info(f"start to make testcase: {testcase_abs_path}")
 
@@ -358,6 +555,24 @@ def make_testcase(testcase: Dict, dir_path: Text = None) -> Text:
     if testcase_python_abs_path in pytest_files_made_cache_mapping:
         return testcase_python_abs_path
 
+    if (
+        claimed_pytest_files is not None
+        and claimed_pytest_files.setdefault(testcase_python_abs_path, os.getpid())
+        != os.getpid()
+    ):
+        # referenced testcase is made by other worker process, its class name is known from path
+        pytest_files_made_cache_mapping[testcase_python_abs_path] = testcase_cls_name
+        return testcase_python_abs_path
+
+    pytest_file = convert_relative_project_root_dir(testcase_python_abs_path)
+    if __is_made_file_fresh(pytest_file, input_hash):
+        logger.info(f"testcase not changed, skip making: {testcase_abs_path}")
+        __reuse_made_file(pytest_file)
+        return testcase_python_abs_path
+
+    # validate testcase format
+    load_testcase(testcase)
+
     config = testcase["config"]
     config["path"] = convert_relative_project_root_dir(testcase_python_abs_path)
     config["variables"] = convert_variables(
@@ -366,6 +581,7 @@ def make_testcase(testcase: Dict, dir_path: Text = None) -> Text:
 
     # prepare reference testcase
     imports_list = []
+    refs = {}
     teststeps = testcase["teststeps"]
     for teststep in teststeps:
         if not teststep.get("testcase"):
@@ -384,6 +600,10 @@ def make_testcase(testcase: Dict, dir_path: Text = None) -> Text:
 
         test_content.setdefault("config", {})["path"] = ref_testcase_path
         ref_testcase_python_abs_path = make_testcase(test_content)
+        refs[convert_relative_project_root_dir(ref_testcase_path)] = [
+            get_file_hash(ref_testcase_path),
+            convert_relative_project_root_dir(ref_testcase_python_abs_path),
+        ]
 
         # override testcase export
         ref_testcase_export: List = test_content["config"].get("export", [])
@@ -425,6 +645,8 @@ def make_testcase(testcase: Dict, dir_path: Text = None) -> Text:
         ],
     }
     content = __TEMPLATE__.render(data)
+    if is_format_enabled:
+        content = format_pytest_content(content, testcase_python_abs_path)
 
     # ensure new file's directory exists
     dir_path = os.path.dirname(testcase_python_abs_path)
@@ -435,6 +657,13 @@ def make_testcase(testcase: Dict, dir_path: Text = None) -> Text:
         f.write(content)
 
     pytest_files_made_cache_mapping[testcase_python_abs_path] = testcase_cls_name
+    pytest_files_written_set.add(testcase_python_abs_path)
+    make_manifest[pytest_file] = {
+        "input_hash": input_hash,
+        "class_name": testcase_cls_name,
+        "refs": refs,
+        "is_formatted": is_format_enabled,
+    }
     __ensure_testcase_module(testcase_python_abs_path)
 
     logger.info(f"generated testcase: {testcase_python_abs_path}")
@@ -499,109 +728,211 @@ def make_testsuite(testsuite: Dict) -> None:
         pytest_files_run_set.add(testcase_pytest_path)
 
 
-def __make(tests_path: Text) -> None:
+def __make_test_file(test_file: Text) -> None:
+    """make testcase/testsuite file, pytest file is collected as it is"""
+    if test_file.lower().endswith("_test.py"):
+        pytest_files_run_set.add(test_file)
+        return
+
+    try:
+        test_content = load_test_file(test_file)
+    except (exceptions.FileNotFound, exceptions.FileFormatError) as ex:
+        logger.warning(f"Invalid test file: {test_file}\n{type(ex).__name__}: {ex}")
+        return
+
+    if not isinstance(test_content, Dict):
+        logger.warning(
+            f"Invalid test file: {test_file}\n"
+            f"reason: test content not in dict format."
+        )
+        return
+
+    # api in v2 format, convert to v3 testcase
+    if "request" in test_content and "name" in test_content:
+        test_content = ensure_testcase_v3_api(test_content)
+
+    if "config" not in test_content:
+        logger.warning(
+            f"Invalid testcase/testsuite file: {test_file}\n"
+            f"reason: missing config part."
+        )
+        return
+    elif not isinstance(test_content["config"], Dict):
+        logger.warning(
+            f"Invalid testcase/testsuite file: {test_file}\n"
+            f"reason: config should be dict type, got {test_content['config']}"
+        )
+        return
+
+    # ensure path absolute
+    test_content.setdefault("config", {})["path"] = test_file
+
+    # testcase
+    if "teststeps" in test_content:
+        try:
+            testcase_pytest_path = make_testcase(test_content)
+            pytest_files_run_set.add(testcase_pytest_path)
+        except exceptions.TestCaseFormatError as ex:
+            logger.warning(
+                f"Invalid testcase file: {test_file}\n{type(ex).__name__}: {ex}"
+            )
+
+    # testsuite
+    elif "testcases" in test_content:
+        try:
+            make_testsuite(test_content)
+        except exceptions.TestSuiteFormatError as ex:
+            logger.warning(
+                f"Invalid testsuite file: {test_file}\n{type(ex).__name__}: {ex}"
+            )
+
+    # invalid format
+    else:
+        logger.warning(
+            f"Invalid test file: {test_file}\n"
+            f"reason: file content is neither testcase nor testsuite"
+        )
+
+
+def _init_make_worker(
+    claimed_files: Dict[Text, int],
+    made_files: Dict[Text, Text],
+    manifest: Dict,
+    is_format: bool,
+) -> None:
+    global claimed_pytest_files, is_format_enabled
+    claimed_pytest_files = claimed_files
+    is_format_enabled = is_format
+    pytest_files_made_cache_mapping.clear()
+    pytest_files_made_cache_mapping.update(made_files)
+    make_manifest.clear()
+    make_manifest.update(manifest)
+
+
+def _make_test_file_in_worker(test_file: Text) -> Tuple[Dict, Set, Set, Dict]:
+    """make test file in worker process, return what is needed to merge back in parent process"""
+    pytest_files_run_set.clear()
+    pytest_files_written_set.clear()
+    __make_test_file(test_file)
+
+    manifest_entries = {}
+    for pytest_file in pytest_files_written_set:
+        pytest_file = convert_relative_project_root_dir(pytest_file)
+        manifest_entries[pytest_file] = make_manifest[pytest_file]
+
+    return (
+        pytest_files_made_cache_mapping,
+        pytest_files_run_set,
+        pytest_files_written_set,
+        manifest_entries,
+    )
+
+
+def __make_in_parallel(test_files: List[Text], jobs: int) -> None:
+    """make test files in process pool, each referenced testcase is made by only one worker"""
+    logger.info(f"make {len(test_files)} test files with {jobs} processes")
+    with multiprocessing.Manager() as manager:
+        claimed_files = manager.dict(
+            {path: os.getpid() for path in pytest_files_made_cache_mapping}
+        )
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_make_worker,
+            initargs=(
+                claimed_files,
+                dict(pytest_files_made_cache_mapping),
+                dict(make_manifest),
+                is_format_enabled,
+            ),
+        ) as executor:
+            results = executor.map(
+                _make_test_file_in_worker,
+                test_files,
+                chunksize=max(1, len(test_files) // (jobs * 4)),
+            )
+            for made_files, run_files, written_files, manifest_entries in results:
+                pytest_files_made_cache_mapping.update(made_files)
+                pytest_files_run_set.update(run_files)
+                pytest_files_written_set.update(written_files)
+                make_manifest.update(manifest_entries)
+
+
+def __make(tests_path: Text, jobs: int = 1) -> None:
     """make testcase(s) with testcase/testsuite/folder absolute path
         generated pytest file path will be cached in pytest_files_made_cache_mapping
 
     Args:
         tests_path: should be in absolute path
+        jobs: number of processes to make test files in parallel
 
     """
     logger.info(f"make path: {tests_path}")
     test_files = []
     if os.path.isdir(tests_path):
-        files_list = load_folder_files(tests_path)
+        files_list = discover_test_files(tests_path)
         test_files.extend(files_list)
     elif os.path.isfile(tests_path):
         test_files.append(tests_path)
     else:
         raise exceptions.TestcaseNotFound(f"Invalid tests path: {tests_path}")
 
-    for test_file in test_files:
-        if test_file.lower().endswith("_test.py"):
-            pytest_files_run_set.add(test_file)
-            continue
-
-        try:
-            test_content = load_test_file(test_file)
-        except (exceptions.FileNotFound, exceptions.FileFormatError) as ex:
-            logger.warning(f"Invalid test file: {test_file}\n{type(ex).__name__}: {ex}")
-            continue
+    if jobs > 1 and len(test_files) > 1:
+        if is_support_multiprocessing():
+            __make_in_parallel(test_files, jobs)
+            return
 
-        if not isinstance(test_content, Dict):
-            logger.warning(
-                f"Invalid test file: {test_file}\n"
-                f"reason: test content not in dict format."
-            )
-            continue
+        logger.warning(
+            "this system does not support multiprocessing well, make files one by one ..."
+        )
 
-        # api in v2 format, convert to v3 testcase
-        if "request" in test_content and "name" in test_content:
-            test_content = ensure_testcase_v3_api(test_content)
+    for test_file in test_files:
+        __make_test_file(test_file)
 
-        if "config" not in test_content:
-            logger.warning(
-                f"Invalid testcase/testsuite file: {test_file}\n"
-                f"reason: missing config part."
-            )
-            continue
-        elif not isinstance(test_content["config"], Dict):
-            logger.warning(
-                f"Invalid testcase/testsuite file: {test_file}\n"
-                f"reason: config should be dict type, got {test_content['config']}"
-            )
-            continue
 
-        # ensure path absolute
-        test_content.setdefault("config", {})["path"] = test_file
-
-        # testcase
-        if "teststeps" in test_content:
-            try:
-                testcase_pytest_path = make_testcase(test_content)
-                pytest_files_run_set.add(testcase_pytest_path)
-            except exceptions.TestCaseFormatError as ex:
-                logger.warning(
-                    f"Invalid testcase file: {test_file}\n{type(ex).__name__}: {ex}"
-                )
-                continue
-
-        # testsuite
-        elif "testcases" in test_content:
-            try:
-                make_testsuite(test_content)
-            except exceptions.TestSuiteFormatError as ex:
-                logger.warning(
-                    f"Invalid testsuite file: {test_file}\n{type(ex).__name__}: {ex}"
-                )
-                continue
-
-        # invalid format
-        else:
-            logger.warning(
-                f"Invalid test file: {test_file}\n"
-                f"reason: file content is neither testcase nor testsuite"
-            )
+def main_make(
+    tests_paths: List[Text], force: bool = False, jobs: int = 1, is_format: bool = True
+) -> List[Text]:
+    """make testcases, only changed testcases and their dependents are made again unless force is set
 
+    Args:
+        tests_paths: testcase/testsuite/folder paths
+        force: make all testcases, including unchanged ones
+        jobs: number of processes to make test files in parallel
+        is_format: format made pytest files with black
 
-def main_make(tests_paths: List[Text]) -> List[Text]:
+    """
     if not tests_paths:
         return []
 
+    global is_format_enabled
+    is_format_enabled = is_format
+
+    __file_hashes.clear()
+    pytest_files_written_set.clear()
+    is_manifest_loaded = False
+
     for tests_path in tests_paths:
         tests_path = ensure_path_sep(tests_path)
         if not os.path.isabs(tests_path):
             tests_path = os.path.join(os.getcwd(), tests_path)
 
+        if not is_manifest_loaded:
+            # project root is located from the first tests path
+            load_project_meta(tests_path)
+            if force:
+                make_manifest.clear()
+            else:
+                load_make_manifest()
+            is_manifest_loaded = True
+
         try:
-            __make(tests_path)
+            __make(tests_path, jobs)
         except exceptions.MyBaseError as ex:
             logger.error(ex)
             sys.exit(1)
 
-    # format pytest files
-    pytest_files_format_list = pytest_files_made_cache_mapping.keys()
-    format_pytest_with_black(*pytest_files_format_list)
+    if pytest_files_written_set:
+        save_make_manifest()
 
     return list(pytest_files_run_set)
 
@@ -615,5 +946,25 @@ def init_make_parser(subparsers):
     parser.add_argument(
         "testcase_path", nargs="*", help="Specify YAML/JSON testcase file/folder path"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        default=False,
+        help="Make all testcases, including unchanged ones.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes to make testcases in parallel, default to 1.",
+    )
+    parser.add_argument(
+        "--no-format",
+        dest="is_format",
+        action="store_false",
+        default=True,
+        help="Do not format made pytest files with black.",
+    )
 
     return parser
@@ -3,9 +3,19 @@ from copy import deepcopy
 from enum import Enum
 from typing import IO, Any, Callable, Dict, List, Optional, Text, Union
 
-from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    HttpUrl,
+    PrivateAttr,
+    computed_field,
+)
+from pydantic_core import core_schema
 from requests_toolbelt import MultipartEncoder
 
+from httprunner.configs.validation import validation_settings
+
 Name = Text
 Url = Text
 BaseUrl = Union[HttpUrl, Text]
@@ -46,6 +56,48 @@ class StableDeepCopyDict(dict):
 
         return d
 
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type, handler):
+        """Instances are kept as they are, plain dicts loaded from testcase files are converted."""
+        return core_schema.union_schema(
+            [
+                core_schema.is_instance_schema(cls),
+                core_schema.no_info_after_validator_function(
+                    cls, core_schema.dict_schema()
+                ),
+            ]
+        )
+
+
+class SharedCache(dict):
+    """
+    Custom dict that is shared rather than copied by copy/deepcopy.
+
+    It is used to hold data compiled from a model, e.g. validator plan,
+    so that copies of the model made for retries or parametrized runs can reuse it.
+    """
+
+    def __copy__(self) -> "SharedCache":
+        return self
+
+    def __deepcopy__(self, memo) -> "SharedCache":
+        return self
+
+
+class SharedResources(list):
+    """
+    Custom list of resources that is shared rather than copied by copy/deepcopy.
+
+    Resources are never changed by evaluation, sharing them among copies of the step
+    keeps their identities, which evaluated resources are cached by.
+    """
+
+    def __copy__(self) -> "SharedResources":
+        return self
+
+    def __deepcopy__(self, memo) -> "SharedResources":
+        return self
+
 
 class RawMockResponse(BaseModel):
     content: Union[dict, str]
@@ -83,7 +135,7 @@ class TConfig(BaseModel):
 class TRequestConfig(BaseModel):
     name: Name
     variables: Union[StableDeepCopyDict, Text] = StableDeepCopyDict()
-    resources: List[tuple[Text, Any, Optional[Text]]] = []
+    resources: Union[SharedResources, List[tuple[Text, Any, Optional[Text]]]] = []
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -106,9 +158,26 @@ class TRequest(BaseModel):
     verify: Verify = False
     upload: Dict = {}  # used for upload files
     raw_mock_response: RawMockResponse = None
+    # only take effect when nested json is expanded by header X-Json-Control: expand
+    expand_json_paths: List[Text] = []  # JMESPath expressions of subtrees to expand
+    expand_json_lazily: bool = False  # expand values on first access
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
+class SharedScopeEnum(Text, Enum):
+    SESSION = "session"  # shared by all workers in one run, e.g. pytest-xdist workers
+    WORKER = "worker"  # shared in one process
+
+
+class StepShare(BaseModel):
+    """referenced testcase is run once and its result is reused, e.g. login"""
+
+    scope: SharedScopeEnum = SharedScopeEnum.WORKER
+    key: list[str] = []  # names of step variables, run once for each values of them
+    ttl: Optional[float] = None  # seconds, never expires if not set
+    refresh_on_status: list[int] = [401]  # run again if later request got status
+
+
 class StepExport(BaseModel):
     # fix: AttributeError: 'tuple' object has no attribute 'extend'.
     # remove type hint `tuple`, retain `list` only, pydantic will coerce `tuple` to `list`
@@ -140,6 +209,20 @@ class Validator(BaseModel):
     message: Optional[str] = None
     config: dict = {}
 
+    # compiled validator plan, shared by copies of the validator
+    _compiled: SharedCache = PrivateAttr(default_factory=SharedCache)
+    # increased whenever a field is reassigned, compiled plan of validator is outdated then
+    _version: int = PrivateAttr(default=0)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in Validator.model_fields:
+            self._version += 1
+
+    @property
+    def version(self) -> int:
+        return self._version
+
 
 class TStep(BaseModel):
     name: Name
@@ -179,8 +262,11 @@ class TStep(BaseModel):
 
     # used to export session variables from referenced testcase, only take effect for RunTestCase step
     export: StepExport = None
+    # reuse exported variables and cookies of referenced testcase, only take effect for RunTestCase step
+    share: StepShare = None
 
     validators: list[Validator] = []
+    validate_fail_fast: bool = False  # stop validating at the first failed validator
     validate_script: List[Text] = []
 
     # HttpRunnerRequest config
@@ -258,6 +344,40 @@ class ReqRespData(BaseModel):
     response: ResponseData
 
 
+def build_validation_results(validation_records: List[tuple]) -> Dict:
+    """Build validation results from raw records of validators, one tuple per validator."""
+    if not validation_records:
+        return {}
+
+    keys = validation_settings.content.keys
+    return {
+        "validate_extractor": [
+            {
+                keys.result: result,
+                keys.assert_: {
+                    keys.actual_value: check_value,
+                    keys.comparator: assert_method,
+                    keys.expect_value: expect_value,
+                },
+                keys.message: message,
+                keys.validator_config: validator_config,
+                keys.jmespath_: check_item,
+                keys.raw_expect_value: expect_item,
+            }
+            for (
+                result,
+                check_value,
+                assert_method,
+                expect_value,
+                message,
+                validator_config,
+                check_item,
+                expect_item,
+            ) in validation_records
+        ]
+    }
+
+
 class SessionData(BaseModel):
     """request session data, including request, response, validators and stat data"""
 
@@ -267,9 +387,29 @@ class SessionData(BaseModel):
     req_resps: List[ReqRespData] = []
     stat: RequestStat = RequestStat()
     address: AddressData = AddressData()
-    validation_results: Dict = {}
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    # raw records of validators, validation results are built from them only when read, e.g. in summary
+    _validation_records: List[tuple] = PrivateAttr(default_factory=list)
+    _validation_results: Optional[Dict] = PrivateAttr(default=None)
+
+    @computed_field
+    @property
+    def validation_results(self) -> Dict:
+        if self._validation_results is None:
+            self._validation_results = build_validation_results(
+                self._validation_records
+            )
+        return self._validation_results
+
+    @validation_results.setter
+    def validation_results(self, validation_results: Dict) -> None:
+        self._validation_results = validation_results
+
+    def set_validation_records(self, validation_records: List[tuple]) -> None:
+        self._validation_records = validation_records
+        self._validation_results = None
+
 
 class StepData(BaseModel):
     """teststep data, each step maybe corresponding to one request or one testcase"""
@@ -0,0 +1,295 @@
+"""
+Run YAML/JSON testcases natively, without making pytest files.
+
+Testcases are loaded with loader.load_testcase_file and run with HttpRunner.run_testcase,
+in a process pool if jobs > 1. Summary and exit codes are the same as running with pytest.
+"""
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Text, Tuple
+
+import pytest
+from loguru import logger
+
+from httprunner import exceptions
+from httprunner.compat import convert_variables, ensure_path_sep, get_summary_path
+from httprunner.core.runner.shared import SESSION_ID_ENVS, clear_shared_results
+from httprunner.discovery import FileKind, classify_test_file, discover_test_files
+from httprunner.loader import (
+    load_project_meta,
+    load_test_file,
+    load_testcase_file,
+    load_testsuite,
+)
+from httprunner.models import StableDeepCopyDict, TestCase
+from httprunner.parser import parse_data, parse_parameters
+from httprunner.runner import HttpRunner
+from httprunner.utils import (
+    ExtendJSONEncoder,
+    get_platform,
+    is_support_multiprocessing,
+    merge_variables,
+)
+
+SHARED_SESSION_ID_ENV = SESSION_ID_ENVS[0]
+
+
+class NativeTestCase(NamedTuple):
+    """one run of testcase file"""
+
+    path: Text
+    # overridden config, e.g. name/base_url/verify/variables from testsuite
+    config: Dict = {}
+    # parameters for this run, from config parameters
+    parameters: Optional[Dict] = None
+
+
+def expand_parameters(native_testcase: NativeTestCase) -> List[NativeTestCase]:
+    """expand testcase to one run for each parameters, testcase file is loaded"""
+    testcase_obj = load_testcase_file(native_testcase.path)
+    parameters = testcase_obj.config.parameters
+    if not parameters:
+        return [native_testcase]
+
+    return [
+        native_testcase._replace(parameters=parameters_item)
+        for parameters_item in parse_parameters(parameters)
+    ]
+
+
+def __collect_testsuite(testsuite_path: Text) -> List[NativeTestCase]:
+    testsuite = load_test_file(testsuite_path)
+    testsuite.setdefault("config", {})["path"] = testsuite_path
+    load_testsuite(testsuite)
+
+    testsuite_config = testsuite["config"]
+    testsuite_variables = convert_variables(
+        testsuite_config.get("variables", {}), testsuite_path
+    )
+    project_root_path = load_project_meta(testsuite_path).httprunner_root_path
+
+    native_testcases = []
+    for testcase in testsuite["testcases"]:
+        testcase_path = ensure_path_sep(testcase["testcase"])
+        if not os.path.isabs(testcase_path):
+            testcase_path = os.path.join(project_root_path, testcase_path)
+
+        # testsuite testcase variables > testsuite config variables > testcase config variables
+        testcase_variables = convert_variables(
+            testcase.get("variables", {}), testcase_path
+        )
+        config = {
+            "name": testcase["name"],
+            "variables": merge_variables(testcase_variables, testsuite_variables),
+        }
+        base_url = testsuite_config.get("base_url") or testcase.get("base_url")
+        if base_url:
+            config["base_url"] = base_url
+        if "verify" in testsuite_config:
+            config["verify"] = testsuite_config["verify"]
+
+        native_testcases.append(NativeTestCase(testcase_path, config))
+
+    return native_testcases
+
+
+def collect_native_testcases(tests_paths: List[Text]) -> List[NativeTestCase]:
+    """collect testcases in YAML/JSON files, testsuites and parameters are expanded to testcases"""
+    test_files = []
+    for tests_path in tests_paths:
+        tests_path = os.path.abspath(ensure_path_sep(tests_path))
+        if os.path.isdir(tests_path):
+            test_files.extend(discover_test_files(tests_path))
+        elif os.path.isfile(tests_path):
+            test_files.append(tests_path)
+        else:
+            raise exceptions.TestcaseNotFound(f"Invalid tests path: {tests_path}")
+
+    native_testcases = []
+    for test_file in test_files:
+        try:
+            for native_testcase in collect_test_file(test_file):
+                native_testcases.extend(expand_parameters(native_testcase))
+        except exceptions.MyBaseError as ex:
+            logger.warning(f"Invalid test file: {test_file}\n{type(ex).__name__}: {ex}")
+
+    return native_testcases
+
+
+def collect_test_file(test_file: Text) -> List[NativeTestCase]:
+    """collect testcases in one YAML/JSON file, testcase files are not loaded"""
+    kind, _ = classify_test_file(test_file)
+    if kind is FileKind.TESTCASE:
+        return [NativeTestCase(test_file)]
+    elif kind is FileKind.TESTSUITE:
+        return __collect_testsuite(test_file)
+    elif kind is FileKind.PYTEST:
+        logger.warning(f"pytest file is not run in native mode: {test_file}")
+    else:
+        logger.warning(
+            f"Invalid test file: {test_file}\n"
+            f"reason: file content is neither testcase nor testsuite"
+        )
+
+    return []
+
+
+def prepare_native_testcase(
+    native_testcase: NativeTestCase,
+) -> Tuple[HttpRunner, TestCase]:
+    """load testcase with overridden config and parameters applied, return runner and testcase"""
+    testcase_obj = load_testcase_file(native_testcase.path)
+    config = testcase_obj.config
+
+    if isinstance(config.variables, Text):
+        # variables prepared in debugtalk.py, ${gen_variables()}
+        config.variables = StableDeepCopyDict(
+            convert_variables(config.variables, native_testcase.path)
+        )
+
+    overridden_config = dict(native_testcase.config)
+    config.variables.update(overridden_config.pop("variables", {}))
+    for key, value in overridden_config.items():
+        setattr(config, key, value)
+
+    if native_testcase.parameters:
+        config.variables.update(native_testcase.parameters)
+
+    project_meta = load_project_meta(native_testcase.path)
+    config.name = parse_data(config.name, config.variables, project_meta.functions)
+
+    runner = (
+        HttpRunner()
+        .with_project_meta(project_meta)
+        .set_continue_on_failure(config.continue_on_failure)
+    )
+    return runner, testcase_obj
+
+
+def run_native_testcase(native_testcase: NativeTestCase) -> Dict:
+    """run testcase, return summary of testcase in dict"""
+    runner, testcase_obj = prepare_native_testcase(native_testcase)
+    name = testcase_obj.config.name
+    logger.info(f"Start to run testcase: {name}")
+
+    try:
+        runner.run_testcase(testcase_obj)
+        runner.success = True
+    except Exception as ex:
+        # any exception fails testcase, as it does when running with pytest
+        logger.error(f"testcase failed: {name}\n{type(ex).__name__}: {ex}")
+
+    return runner.get_summary().model_dump()
+
+
+def aggregate_summaries(testcase_summaries: List[Dict], start_at: float) -> Dict:
+    """aggregate testcase summaries, in the same format as summary.json generated for --save-tests"""
+    summary = {
+        "success": True,
+        "stat": {
+            "testcases": {"total": 0, "success": 0, "fail": 0},
+            "teststeps": {"total": 0, "failures": 0, "successes": 0},
+        },
+        "time": {"start_at": start_at, "duration": time.time() - start_at},
+        "platform": get_platform(),
+        "details": [],
+    }
+
+    for testcase_summary in testcase_summaries:
+        steps_count = len(testcase_summary["step_datas"])
+        summary["success"] &= testcase_summary["success"]
+        summary["stat"]["testcases"]["total"] += 1
+        summary["stat"]["teststeps"]["total"] += steps_count
+        if testcase_summary["success"]:
+            summary["stat"]["testcases"]["success"] += 1
+            summary["stat"]["teststeps"]["successes"] += steps_count
+        else:
+            summary["stat"]["testcases"]["fail"] += 1
+            summary["stat"]["teststeps"]["successes"] += steps_count - 1
+            summary["stat"]["teststeps"]["failures"] += 1
+
+        testcase_summary = dict(testcase_summary)
+        testcase_summary["records"] = testcase_summary.pop("step_datas")
+        summary["details"].append(testcase_summary)
+
+    return summary
+
+
+def run_native(tests_paths: List[Text], jobs: int = 1) -> Optional[Dict]:
+    """run testcases natively, None is returned if no valid testcases found"""
+    native_testcases = collect_native_testcases(tests_paths)
+    if not native_testcases:
+        return None
+
+    start_at = time.time()
+    if jobs > 1 and len(native_testcases) > 1:
+        if is_support_multiprocessing():
+            # results of shared testcases in "session" scope are shared by workers
+            session_id = uuid.uuid4().hex
+            os.environ[SHARED_SESSION_ID_ENV] = session_id
+            try:
+                with ProcessPoolExecutor(max_workers=jobs) as executor:
+                    testcase_summaries = list(
+                        executor.map(run_native_testcase, native_testcases)
+                    )
+            finally:
+                os.environ.pop(SHARED_SESSION_ID_ENV, None)
+                clear_shared_results(session_id)
+            return aggregate_summaries(testcase_summaries, start_at)
+
+        logger.warning(
+            "this system does not support multiprocessing well, run testcases one by one ..."
+        )
+
+    testcase_summaries = [run_native_testcase(item) for item in native_testcases]
+    return aggregate_summaries(testcase_summaries, start_at)
+
+
+def main_native(args: List[Text], jobs: int = 1) -> int:
+    """hrun --native: run YAML/JSON testcases without making pytest files, return exit code"""
+    tests_paths = []
+    is_save_tests = False
+    for arg in args:
+        if os.path.exists(arg):
+            tests_paths.append(arg)
+        elif arg == "--save-tests":
+            is_save_tests = True
+        else:
+            logger.warning(f"argument is not supported in native mode, ignored: {arg}")
+
+    if not tests_paths:
+        logger.error(f"No valid testcase path in cli arguments: {args}")
+        sys.exit(1)
+
+    try:
+        summary = run_native(tests_paths, jobs)
+    except exceptions.MyBaseError as ex:
+        logger.error(ex)
+        sys.exit(1)
+
+    if summary is None:
+        logger.error("No valid testcases found, exit 1.")
+        sys.exit(1)
+
+    stat = summary["stat"]["testcases"]
+    logger.info(
+        f"{stat['total']} testcases run, {stat['success']} passed, {stat['fail']} failed "
+        f"in {summary['time']['duration']:.2f} seconds"
+    )
+
+    if is_save_tests:
+        # FIXME: several test paths maybe specified, the same as --save-tests with pytest
+        summary_path = get_summary_path(tests_paths[0])
+        os.makedirs(os.path.dirname(summary_path), exist_ok=True)
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=4, ensure_ascii=False, cls=ExtendJSONEncoder)
+        logger.info(f"generated task summary: {summary_path}")
+
+    if summary["success"]:
+        return pytest.ExitCode.OK
+
+    return pytest.ExitCode.TESTS_FAILED
@@ -3,16 +3,17 @@ import builtins
 import os
 import re
 import time
+from copy import deepcopy
 from typing import Any, Callable, Dict, List, Set, Text
 from urllib.parse import urlparse
 
 from dotwiz import DotWiz
 from loguru import logger
-from sentry_sdk import capture_exception
 
 from httprunner import exceptions, loader, utils
 from httprunner.exceptions import VariableNotFound
 from httprunner.models import FunctionsMapping, StableDeepCopyDict, VariablesMapping
+from httprunner.sentry import capture_exception
 
 absolute_http_url_regexp = re.compile(r"^https?://", re.I)
 
@@ -608,14 +609,52 @@ def parse_data(
         return raw_data
 
 
+def copy_parsable_data(raw_data: Any) -> Any:
+    """Copy containers in data which may be changed in place by `parse_data`.
+
+    It is much cheaper than deepcopy, for other objects are shared rather than copied.
+    """
+    data_type = type(raw_data)
+    if data_type is list:
+        return [copy_parsable_data(item) for item in raw_data]
+
+    elif data_type is tuple:
+        return tuple([copy_parsable_data(item) for item in raw_data])
+
+    elif data_type is set:
+        return {copy_parsable_data(item) for item in raw_data}
+
+    elif data_type is dict or data_type is StableDeepCopyDict:
+        copied_data = data_type()
+        for key, value in raw_data.items():
+            copied_data[key] = copy_parsable_data(value)
+        return copied_data
+
+    elif isinstance(raw_data, (list, set, dict, ParseMe)) and not isinstance(
+        raw_data, DotWiz
+    ):
+        # subclasses of containers and ParseMe instances
+        try:
+            return deepcopy(raw_data)
+        except TypeError:
+            return raw_data
+
+    else:
+        # strings, numbers, DotWiz, etc. are not changed by parse_data
+        return raw_data
+
+
 def parse_variables_mapping(
-    variables_mapping: VariablesMapping, functions_mapping: FunctionsMapping = None
+    variables_mapping: VariablesMapping,
+    functions_mapping: FunctionsMapping = None,
+    parsed_names: Set[Text] = frozenset(),
 ) -> StableDeepCopyDict:
     """
     All variables specified in argument 'variables_mapping' must be parsed on variables_mapping and functions_mapping.
 
     Note:
-        Variables whose name starting with '_r_' will be marked as parsed and the value will be kept as is.
+        Variables whose name starting with '_r_' or in argument 'parsed_names' will be marked as parsed
+        and the value will be kept as is.
     """
     parsed_variables: StableDeepCopyDict = StableDeepCopyDict()
     not_found_variables: set = set()
@@ -642,7 +681,7 @@ def parse_variables_mapping(
             outer_var_value = variables_mapping[outer_var_name]
 
             # mark variables whose name starting with '_r_' as parsed and keep the value as is
-            if outer_var_name.startswith("_r_"):
+            if outer_var_name.startswith("_r_") or outer_var_name in parsed_names:
                 parsed_variables[outer_var_name] = outer_var_value
                 continue
 
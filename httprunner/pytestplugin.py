@@ -1,6 +1,18 @@
+import os
+import sys
+import time
+import uuid
+
 import pytest
 
-from httprunner import Config, HttpRunner
+from httprunner import exceptions
+
+# plugin is loaded for every pytest run, runner and loader are imported when needed
+
+TESTCASE_FILE_SUFFIXES = (".yml", ".yaml", ".json")
+
+# user property of test reports, carries testcase duration from xdist workers
+DURATION_PROPERTY = "httprunner_duration"
 
 
 def pytest_addoption(parser):
@@ -17,6 +29,224 @@ def pytest_addoption(parser):
         action="store",
         help="load debugtalk functions from `FILE` instead of trying to locate one debugtalk.py file",
     )
+    parser.addoption(
+        "--collect-testcases",
+        action="store_true",
+        help="collect YAML/JSON testcases and testsuites directly, without making pytest files",
+    )
+    parser.addoption(
+        "--timings-file",
+        action="store",
+        help="durations of testcases are saved to `FILE` and used to schedule longest "
+        "testcases first with pytest-xdist, default to .hrun_timings.json in rootdir, "
+        "set to empty to disable",
+    )
+
+
+def __get_timings_path(config):
+    from httprunner.timing import TIMINGS_FILE_NAME
+
+    timings_path = config.getoption("--timings-file")
+    if timings_path is None:
+        return os.path.join(str(config.rootpath), TIMINGS_FILE_NAME)
+
+    return timings_path or None
+
+
+def __get_httprunner_duration(item):
+    """duration of HttpRunner testcase run by item, None if item is not a HttpRunner test"""
+    if isinstance(item, HttpRunnerItem):
+        return item.duration
+
+    runner_module = sys.modules.get("httprunner.runner")
+    instance = getattr(item, "instance", None)
+    if runner_module is None or not isinstance(instance, runner_module.HttpRunner):
+        return None
+
+    try:
+        return instance.get_summary().time.duration
+    except Exception:
+        # testcase not started
+        return None
+
+
+class DurationRecorder:
+    """Record durations of HttpRunner testcases, and save them to timings file at the end."""
+
+    def __init__(self, timings_path):
+        self.timings_path = timings_path
+        # node id -> duration of testcase in this session
+        self.durations = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call":
+            return
+
+        for name, value in report.user_properties:
+            if name == DURATION_PROPERTY:
+                self.durations[report.nodeid] = value
+
+    def pytest_sessionfinish(self):
+        if not self.durations:
+            return
+
+        from httprunner.timing import load_timings, save_timings, update_timings
+
+        timings = load_timings(self.timings_path)
+        update_timings(timings, self.durations)
+        save_timings(self.timings_path, timings)
+
+
+def pytest_configure(config):
+    # durations are recorded in xdist controller, or in the only process without xdist
+    timings_path = __get_timings_path(config)
+    if timings_path and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(
+            DurationRecorder(timings_path), "httprunner-duration-recorder"
+        )
+
+    # id of xdist run is decided in controller, results shared by workers are removed at the end
+    if (
+        not hasattr(config, "workerinput")
+        and hasattr(config.option, "testrunuid")
+        and config.option.testrunuid is None
+    ):
+        config.option.testrunuid = uuid.uuid4().hex
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    """Remove results of shared testcases in "session" scope, after xdist workers are finished."""
+    config = session.config
+    testrunuid = getattr(config.option, "testrunuid", None)
+    if hasattr(config, "workerinput") or not testrunuid:
+        return
+
+    from httprunner.core.runner.shared import clear_shared_results
+
+    clear_shared_results(testrunuid)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_makereport(item, call):
+    """Add duration of HttpRunner testcase to report, before report is made."""
+    if call.when != "call":
+        return
+
+    duration = __get_httprunner_duration(item)
+    if duration:
+        item.user_properties.append((DURATION_PROPERTY, duration))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Schedule longest testcases first with `--dist load`, if durations of previous runs found."""
+    if config.getoption("dist", None) != "load":
+        return None
+
+    timings_path = __get_timings_path(config)
+    if not timings_path:
+        return None
+
+    from httprunner.timing import load_timings
+
+    timings = load_timings(timings_path)
+    if not timings:
+        return None
+
+    from httprunner.ext.xdist import LongestFirstScheduling
+
+    return LongestFirstScheduling(config, log, timings)
+
+
+def pytest_collect_file(file_path, parent):
+    """Collect YAML/JSON testcases if --collect-testcases is specified.
+
+    Files are classified by their first bytes only, testcases are loaded and validated
+    when items are run.
+    """
+    if file_path.suffix.lower() not in TESTCASE_FILE_SUFFIXES:
+        return None
+
+    if not parent.config.getoption("--collect-testcases"):
+        return None
+
+    from httprunner.discovery import FileKind, classify_test_file
+
+    kind, _ = classify_test_file(str(file_path))
+    if kind not in (FileKind.TESTCASE, FileKind.TESTSUITE):
+        return None
+
+    return HttpRunnerFile.from_parent(parent, path=file_path)
+
+
+class HttpRunnerFile(pytest.File):
+    """YAML/JSON testcase or testsuite file, one item is collected for each testcase"""
+
+    def collect(self):
+        # lazy import, collecting is kept away from loading runner
+        from httprunner.discovery import FileKind, classify_test_file
+        from httprunner.native import collect_test_file
+
+        test_file = str(self.path)
+        try:
+            native_testcases = collect_test_file(test_file)
+        except exceptions.MyBaseError as ex:
+            raise self.CollectError(f"{type(ex).__name__}: {ex}")
+
+        kind, _ = classify_test_file(test_file)
+        if kind is FileKind.TESTCASE:
+            name = os.path.splitext(self.path.name)[0]
+            yield HttpRunnerItem.from_parent(
+                self, name=name, native_testcase=native_testcases[0]
+            )
+            return
+
+        # testsuite file, testcases are named in testsuite, index is appended to repeated names
+        # to keep node ids unique, e.g. for -k, --lf and timings
+        names = set()
+        for index, native_testcase in enumerate(native_testcases):
+            name = native_testcase.config.get("name") or f"testcase_{index}"
+            if name in names:
+                name = f"{name}_{index}"
+            names.add(name)
+            yield HttpRunnerItem.from_parent(
+                self, name=name, native_testcase=native_testcase
+            )
+
+
+class HttpRunnerItem(pytest.Item):
+    """testcase loaded and validated lazily, parameters are expanded and run in order"""
+
+    def __init__(self, *, native_testcase, **kwargs):
+        super().__init__(**kwargs)
+        self.native_testcase = native_testcase
+        # total duration of testcase runs, for all parameters
+        self.duration = 0
+
+    def runtest(self):
+        from httprunner.native import expand_parameters, prepare_native_testcase
+
+        for native_testcase in expand_parameters(self.native_testcase):
+            runner, testcase_obj = prepare_native_testcase(native_testcase)
+            if self.config.getoption("--continue-on-failure"):
+                runner.set_continue_on_failure(True)
+
+            # timed here, building summary of failed testcase may raise and hide the failure
+            start = time.perf_counter()
+            try:
+                runner.run_testcase(testcase_obj)
+            finally:
+                self.duration += time.perf_counter() - start
+
+    def repr_failure(self, excinfo):
+        if isinstance(excinfo.value, exceptions.MyBaseError):
+            return f"{type(excinfo.value).__name__}: {excinfo.value}"
+
+        return super().repr_failure(excinfo)
+
+    def reportinfo(self):
+        return self.path, None, f"testcase: {self.name}"
 
 
 @pytest.fixture
@@ -24,7 +254,12 @@ def is_httprunner_test(request) -> bool:
     """
     Return True if request test is a HttpRunner test.
     """
-    if request.instance and isinstance(request.instance, HttpRunner):
+    runner_module = sys.modules.get("httprunner.runner")
+    if runner_module is None:
+        # HttpRunner is not imported by any test, keep runner away from other tests
+        return False
+
+    if request.instance and isinstance(request.instance, runner_module.HttpRunner):
         return True
     else:
         return False
@@ -37,7 +272,7 @@ def continue_on_failure(request, is_httprunner_test):
         return
 
     if request.config.getoption("--continue-on-failure"):
-        config: Config = request.cls.config
+        config = request.cls.config
         config.continue_on_failure()
 
 
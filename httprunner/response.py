@@ -1,21 +1,29 @@
-from typing import Any, Dict, Text, Union
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Text, Tuple, Union
 
-import jmespath
 import requests
 from jmespath.exceptions import JMESPathError
+from jmespath.parser import ParsedResult
 from loguru import logger
 
 from httprunner import exceptions
 from httprunner.configs.emoji import emojis
-from httprunner.configs.validation import validation_settings
 from httprunner.exceptions import ParamsError, ValidationFailure
+from httprunner.jmespath_utils import compile_jmespath, flatten_simple_path
 from httprunner.models import (
     FunctionsMapping,
     JMESPathExtractor,
     Validator,
     VariablesMapping,
+    build_validation_results,
+)
+from httprunner.parser import (
+    ParseMe,
+    copy_parsable_data,
+    get_mapping_function,
+    parse_data,
+    parse_string_value,
 )
-from httprunner.parser import get_mapping_function, parse_data, parse_string_value
 from httprunner.utils import omit_long_data
 
 
@@ -128,7 +136,169 @@ def uniform_validator(validator):
     }
 
 
+def _step_into(value: Any, step_type: Text, step_value: Any) -> Any:
+    """Search one step with the same semantics as JMESPath field and index."""
+    if value is None:
+        return None
+
+    if step_type == "field":
+        try:
+            return value.get(step_value)
+        except AttributeError:
+            return None
+
+    # index
+    if not isinstance(value, list):
+        return None
+    try:
+        return value[step_value]
+    except IndexError:
+        return None
+
+
+class _PathTrieNode(object):
+    def __init__(self):
+        self.children: Dict[Tuple[Text, Any], "_PathTrieNode"] = {}
+        self.expressions: List[Text] = []
+
+
+class ExtractionPlan(object):
+    """Collect values of many JMESPath expressions in a single traversal.
+
+    Simple field paths (fields and indexes only) are grouped into a trie, so paths sharing the same prefix
+    are only walked once. Other expressions are left in `complex_expressions`, callers should fall back to
+    the normal JMESPath search for them.
+    """
+
+    def __init__(self, expressions: Iterable[Text]):
+        self._root = _PathTrieNode()
+        self.simple_expressions: List[Text] = []
+        self.complex_expressions: List[Text] = []
+
+        for expr in expressions:
+            try:
+                steps = flatten_simple_path(compile_jmespath(expr).parsed)
+            except JMESPathError:
+                # error will be raised and logged when searching it normally
+                steps = None
+
+            if steps is None:
+                self.complex_expressions.append(expr)
+                continue
+
+            node = self._root
+            for step in steps:
+                node = node.children.setdefault(step, _PathTrieNode())
+            node.expressions.append(expr)
+            self.simple_expressions.append(expr)
+
+    def collect(self, data: Any) -> Dict[Text, Any]:
+        """Collect values of all simple field paths from data."""
+        results = {}
+        stack = [(self._root, data)]
+        while stack:
+            node, value = stack.pop()
+            for expr in node.expressions:
+                results[expr] = value
+
+            for (step_type, step_value), child in node.children.items():
+                stack.append((child, _step_into(value, step_type, step_value)))
+
+        return results
+
+
+@lru_cache(maxsize=256)
+def compile_extraction_plan(expressions: Tuple[Text, ...]) -> ExtractionPlan:
+    """Build extraction plan for expressions of one step, the plan is cached for steps run repeatedly."""
+    return ExtractionPlan(expressions)
+
+
+def is_dynamic_data(data: Any) -> bool:
+    """Check if data may be changed by `parse_data`, i.e. it contains variables or functions."""
+    if isinstance(data, Text):
+        return "$" in data
+    elif isinstance(data, (list, tuple)):
+        return any(is_dynamic_data(item) for item in data)
+    elif isinstance(data, dict):
+        return any(
+            is_dynamic_data(key) or is_dynamic_data(value)
+            for key, value in data.items()
+        )
+    elif isinstance(data, (set, ParseMe)):
+        # resolved by parse_data in place, treat as dynamic to be safe
+        return True
+    else:
+        return False
+
+
+class ValidatorPlan(object):
+    """Things of a validator that do not change between runs, e.g. compiled check path and comparator.
+
+    Parts containing variables or functions are flagged as dynamic and parsed on every run,
+    static parts are used as is.
+    """
+
+    def __init__(self, validator: Validator):
+        self.method = validator.method
+        self.expression = validator.expression
+        self.is_expression_dynamic = (
+            isinstance(validator.expression, Text) and "$" in validator.expression
+        )
+        self.compiled_expression: Optional[ParsedResult] = None
+        if isinstance(validator.expression, Text) and not self.is_expression_dynamic:
+            try:
+                self.compiled_expression = compile_jmespath(validator.expression)
+            except JMESPathError:
+                # error will be raised and logged when searching it normally
+                pass
+
+        self.is_expect_dynamic = is_dynamic_data(validator.expect)
+        self.is_message_dynamic = is_dynamic_data(validator.message)
+        self.is_config_dynamic = is_dynamic_data(validator.config)
+        # validator may be changed after the plan was compiled
+        self.version = validator.version
+
+        # comparator bound to the functions mapping it was looked up from
+        self._bound_comparator: Optional[Tuple[FunctionsMapping, Any]] = None
+
+    def is_outdated(self, validator: Validator) -> bool:
+        """Check if any field of validator was reassigned after the plan was compiled.
+
+        Static parts changed in place, e.g. `validator.expect["key"] = "$var"`, are not detected,
+        reassign the field to take effect.
+        """
+        return (
+            self.version != validator.version
+            or self.method != validator.method
+            or self.expression != validator.expression
+        )
+
+    def get_comparator(self, functions_mapping: FunctionsMapping):
+        bound = self._bound_comparator
+        if bound is not None and bound[0] is functions_mapping:
+            return bound[1]
+
+        # functions found in package httprunner.builtin will be added to functions mapping too
+        assert_func = get_mapping_function(self.method, functions_mapping)
+        self._bound_comparator = (functions_mapping, assert_func)
+        return assert_func
+
+
+def compile_validator(validator: Validator) -> ValidatorPlan:
+    """Get plan of validator, it is compiled once and shared by copies of the validator."""
+    plan = validator._compiled.get("plan")
+    if plan is None or plan.is_outdated(validator):
+        plan = ValidatorPlan(validator)
+        validator._compiled["plan"] = plan
+
+    return plan
+
+
 class ResponseObject(object):
+    # attributes of which the search context is made up,
+    # search context will be rebuilt if any of them was reassigned.
+    _search_context_keys = ("status_code", "headers", "cookies", "body")
+
     def __init__(self, requests_response: requests.Response):
         """initialize with a requests.Response object
 
@@ -137,7 +307,8 @@ class ResponseObject(object):
 
         """
         self.resp_obj = requests_response
-        self.validation_results: Dict = {}
+        # one record per validator, converted to validation results only when needed
+        self._validation_records: List[Tuple] = []
 
     def __getattr__(self, key):
         if key in ["json", "content", "body"]:
@@ -158,15 +329,55 @@ class ResponseObject(object):
         self.__dict__[key] = value
         return value
 
-    def _search_jmespath(self, expr: Text) -> Any:
+    def __setattr__(self, key, value):
+        # drop the cached search context if any part of it was reassigned, e.g. in teardown hooks
+        if key in self._search_context_keys:
+            self.__dict__.pop("_search_context", None)
+
+        super().__setattr__(key, value)
+
+    @property
+    def search_context(self) -> Dict[Text, Any]:
+        """Data searched by JMESPath expressions, it is built only once per response."""
+        try:
+            return self.__dict__["_search_context"]
+        except KeyError:
+            pass
+
         resp_obj_meta = {
             "status_code": self.status_code,
             "headers": self.headers,
             "cookies": self.cookies,
             "body": self.body,
         }
+        self.__dict__["_search_context"] = resp_obj_meta
+        return resp_obj_meta
+
+    @property
+    def validation_records(self) -> List[Tuple]:
+        """Raw records of the latest validate(), one tuple per validator."""
+        return self._validation_records
+
+    @property
+    def validation_results(self) -> Dict:
+        """Validation results of the latest validate(), built from validation records on first access."""
+        try:
+            return self.__dict__["_validation_results"]
+        except KeyError:
+            pass
+
+        validation_results = build_validation_results(self._validation_records)
+        self.__dict__["_validation_results"] = validation_results
+        return validation_results
+
+    def _search_jmespath(
+        self, expr: Text, compiled_expression: Optional[ParsedResult] = None
+    ) -> Any:
+        resp_obj_meta = self.search_context
         try:
-            check_value = jmespath.search(expr, resp_obj_meta)
+            if compiled_expression is None:
+                compiled_expression = compile_jmespath(expr)
+            check_value = compiled_expression.search(resp_obj_meta)
         except JMESPathError as ex:
             logger.error(
                 f"failed to search with jmespath\n"
@@ -178,15 +389,40 @@ class ResponseObject(object):
 
         return check_value
 
+    def _prefetch_jmespath(self, expressions: Iterable[Any]) -> Dict[Text, Any]:
+        """Search all simple field paths in one pass.
+
+        Only values of simple field paths are returned, other expressions should be searched with
+        `_search_jmespath()` as usual.
+        """
+        # keep order and remove duplicates
+        expressions = tuple(
+            dict.fromkeys(expr for expr in expressions if isinstance(expr, Text))
+        )
+        if not expressions:
+            return {}
+
+        plan = compile_extraction_plan(expressions)
+        return plan.collect(self.search_context)
+
     def extract(self, extractors: list[Union[JMESPathExtractor]]) -> Dict[Text, Any]:
         if not extractors:
             return {}
 
+        prefetched_values = self._prefetch_jmespath(
+            extractor.expression
+            for extractor in extractors
+            if isinstance(extractor, JMESPathExtractor)
+        )
+
         extract_mapping = {}
         extractor: Union[JMESPathExtractor]
         for extractor in extractors:
             if isinstance(extractor, JMESPathExtractor):
-                field_value = self._search_jmespath(extractor.expression)
+                if extractor.expression in prefetched_values:
+                    field_value = prefetched_values[extractor.expression]
+                else:
+                    field_value = self._search_jmespath(extractor.expression)
 
                 if extractor.sub_extractor:
                     field_value = extractor.sub_extractor(field_value)
@@ -201,86 +437,101 @@ class ResponseObject(object):
         validators: list[Validator],
         variables_mapping: VariablesMapping = None,
         functions_mapping: FunctionsMapping = None,
+        fail_fast: bool = False,
     ) -> None:
-        variables_mapping = variables_mapping or {}
-        functions_mapping = functions_mapping or {}
+        """Validate response with validators.
+
+        :param validators: validators of the step
+        :param variables_mapping: variables used to parse validators
+        :param functions_mapping: functions used to parse validators
+        :param fail_fast: stop validating at the first failed validator
+        """
+        if variables_mapping is None:
+            variables_mapping = {}
+        if functions_mapping is None:
+            functions_mapping = {}
 
-        self.validation_results = {}
+        self._validation_records = []
+        self.__dict__.pop("_validation_results", None)
         if not validators:
             return
 
-        validate_pass = True
-        failures = []
+        plans = [compile_validator(validator) for validator in validators]
 
-        for validator in validators:
-            if "validate_extractor" not in self.validation_results:
-                self.validation_results["validate_extractor"] = []
+        # values of static check items are searched in one pass,
+        # check items containing variables or functions are searched after being parsed.
+        prefetched_values = self._prefetch_jmespath(
+            plan.expression for plan in plans if plan.compiled_expression is not None
+        )
 
+        failures = []
+        for validator, plan in zip(validators, plans):
             # check item (jmespath)
             check_item = validator.expression
-            if isinstance(check_item, Text) and "$" in check_item:
+            compiled_expression = plan.compiled_expression
+            if plan.is_expression_dynamic:
                 # check_item is variable or function
                 check_item = parse_data(
                     check_item, variables_mapping, functions_mapping
                 )
                 check_item = parse_string_value(check_item)
+                compiled_expression = None
 
             if check_item and isinstance(check_item, Text):
-                check_value = self._search_jmespath(check_item)  # actual value
+                if check_item in prefetched_values:
+                    check_value = prefetched_values[check_item]  # actual value
+                else:
+                    check_value = self._search_jmespath(
+                        check_item, compiled_expression
+                    )  # actual value
             else:
                 # variable or function evaluation result is "" or not text
                 check_value = check_item
 
-            # stringify check value and omit long text
-            omitted_check_value = omit_long_data(str(check_value))
-
             # comparator
             assert_method = validator.method
-
-            # functions found in package httprunner.builtin will be added to functions mapping too
-            assert_func = get_mapping_function(assert_method, functions_mapping)
+            assert_func = plan.get_comparator(functions_mapping)
 
             # expect item
             expect_item = validator.expect
             # parse expected value with config/teststep/extracted variables
-            expect_value = parse_data(expect_item, variables_mapping, functions_mapping)
-            # omit expect value
-            omitted_expect_value = omit_long_data(str(expect_value))
+            if plan.is_expect_dynamic:
+                # parse a copy, validators are shared by copies of the step
+                expect_value = parse_data(
+                    copy_parsable_data(expect_item),
+                    variables_mapping,
+                    functions_mapping,
+                )
+            else:
+                expect_value = expect_item
 
             # message
             message = validator.message
             # parse message with config/teststep/extracted variables
-            message = parse_data(message, variables_mapping, functions_mapping)
+            if plan.is_message_dynamic:
+                message = parse_data(message, variables_mapping, functions_mapping)
 
             # parse validator config
-            validator.config = parse_data(
-                validator.config, variables_mapping, functions_mapping
-            )
-
-            validate_msg = f"assert {check_item} {assert_method} {omitted_expect_value}({type(expect_value).__name__})"
-
-            validator_dict = {
-                validation_settings.content.keys.result: None,
-                validation_settings.content.keys.assert_: {
-                    validation_settings.content.keys.actual_value: check_value,
-                    validation_settings.content.keys.comparator: assert_method,
-                    validation_settings.content.keys.expect_value: expect_value,
-                },
-                validation_settings.content.keys.message: message,
-                validation_settings.content.keys.validator_config: validator.config,
-                validation_settings.content.keys.jmespath_: check_item,
-                validation_settings.content.keys.raw_expect_value: expect_item,
-            }
+            validator_config = validator.config
+            if plan.is_config_dynamic:
+                validator_config = parse_data(
+                    copy_parsable_data(validator_config),
+                    variables_mapping,
+                    functions_mapping,
+                )
 
             try:
-                assert_func(check_value, expect_value, message, **validator.config)
-                validate_msg += "\t==> pass"
-                logger.info(validate_msg)
-                validator_dict["Result"] = emojis.success
+                assert_func(check_value, expect_value, message, **validator_config)
+                result = emojis.success
+                logger.info(
+                    f"assert {check_item} {assert_method} {omit_long_data(str(expect_value))}"
+                    f"({type(expect_value).__name__})\t==> pass"
+                )
             except AssertionError as ex:
-                validate_pass = False
-                validator_dict["Result"] = emojis.failure
-                validate_msg += "\t==> fail"
+                result = emojis.failure
+                # stringify check value and expect value, omit long text
+                omitted_check_value = omit_long_data(str(check_value))
+                omitted_expect_value = omit_long_data(str(expect_value))
                 allure_failure_message = f"""\
 * JMESPath 及断言方法
 {check_item} -> {assert_method}
@@ -294,14 +545,29 @@ class ResponseObject(object):
 * 错误信息
 {str(ex) if str(ex) else "NA"}
                 """
-                validate_msg += f"\n{allure_failure_message}"
-
-                logger.error(validate_msg)
+                logger.error(
+                    f"assert {check_item} {assert_method} {omitted_expect_value}"
+                    f"({type(expect_value).__name__})\t==> fail\n{allure_failure_message}"
+                )
                 failures.append(allure_failure_message)
 
-            self.validation_results["validate_extractor"].append(validator_dict)
+            self._validation_records.append(
+                (
+                    result,
+                    check_value,
+                    assert_method,
+                    expect_value,
+                    message,
+                    validator_config,
+                    check_item,
+                    expect_item,
+                )
+            )
+
+            if failures and fail_fast:
+                break
 
-        if not validate_pass:
+        if failures:
             # add headers for each element if more than 1 exist
             if len(failures) > 1:
                 indexed_failures = []
@@ -3,7 +3,7 @@ import os
 import time
 import warnings
 from datetime import datetime
-from typing import Dict, List, Text, Union
+from typing import Dict, List, Text, Type, Union
 
 import allure
 from jmespath.exceptions import JMESPathError
@@ -11,7 +11,7 @@ from loguru import logger
 from requests import ConnectTimeout, HTTPError
 
 from httprunner import exceptions
-from httprunner.builtin import expand_nested_json
+from httprunner.builtin import expand_nested_json, expand_nested_json_lazily
 from httprunner.client import HttpSession
 from httprunner.configs.http import global_http_settings
 from httprunner.configs.mock import mock_settings
@@ -22,7 +22,17 @@ from httprunner.core.runner.export_request_step_vars import (
     extract_request_variables,
 )
 from httprunner.core.runner.parametrized_step import expand_parametrized_step
+from httprunner.core.runner.plan import TestCasePlan, compile_testcase
 from httprunner.core.runner.retry import parse_retry_args
+from httprunner.core.runner.shared import (
+    SharedResult,
+    get_new_cookies,
+    get_shared_key,
+    load_shared_result,
+    lock_shared_result,
+    save_shared_result,
+    snapshot_cookies,
+)
 from httprunner.core.runner.skip_step import is_skip_step
 from httprunner.core.runner.step_shell_variables import get_step_shell_variables
 from httprunner.core.runner.timer import display_delay_in_step_name
@@ -55,6 +65,7 @@ from httprunner.models import (
 )
 from httprunner.parser import (
     build_url,
+    copy_parsable_data,
     parse_data,
     parse_variables_mapping,
     update_url_origin,
@@ -126,9 +137,32 @@ class HttpRunner(object):
         else:
             raise AttributeError(f"{self.__class__.__name__} has no attribute {item}")
 
+    @classmethod
+    def compile(cls, testcase_cls: Type["HttpRunner"] = None) -> TestCasePlan:
+        """Compile testcase class to an executable plan, which can be executed many times.
+
+        Examples:
+            plan = HttpRunner.compile(TestCaseRequestWithFunctions)
+            plan.execute(variables={"foo1": "bar"}, session=HttpSession())
+        """
+        return compile_testcase(testcase_cls or cls)
+
+    def __compile_self(self) -> TestCasePlan:
+        """plan of this instance, config and teststeps are taken from instance if overridden"""
+        testcase_cls = type(self)
+        if (
+            self.config is testcase_cls.config
+            and self.teststeps is testcase_cls.teststeps
+        ):
+            return self.compile(testcase_cls)
+
+        # not cached, instance attributes are owned by the instance only
+        return TestCasePlan(testcase_cls, self.config, self.teststeps)
+
     def __init_tests__(self) -> None:
-        self.__config = self.config.perform()
-        self.__teststeps = [step.perform() for step in self.teststeps]
+        testcase = self.__compile_self().new_testcase()
+        self.__config = testcase.config
+        self.__teststeps = testcase.teststeps
         self.__failed_steps: list[tuple[TStep, Exception]] = []
 
     def set_use_allure(self, is_use_allure: bool) -> "HttpRunner":  # noqa
@@ -146,7 +180,10 @@ class HttpRunner(object):
         if not hasattr(self, "__config"):
             self.__init_tests__()
 
-        return TestCase(config=self.__config, teststeps=self.__teststeps)
+        return TestCase(
+            config=self.__config,
+            teststeps=[step.to_tstep() for step in self.__teststeps],
+        )
 
     def with_project_meta(self, project_meta: ProjectMeta) -> "HttpRunner":
         self.__project_meta = project_meta
@@ -291,6 +328,12 @@ class HttpRunner(object):
         parsed_request_dict["verify"] = self.__config.verify
         parsed_request_dict["json"] = parsed_request_dict.pop("req_json", {})
 
+        # options of expanding nested json are handled in __preprocess_response,
+        # paths are passed to session to expand recorded response bodies as well.
+        parsed_request_dict.pop("expand_json_lazily", None)
+        if not parsed_request_dict.get("expand_json_paths"):
+            parsed_request_dict.pop("expand_json_paths", None)
+
         return method, url, parsed_request_dict
 
     def __preprocess_response(
@@ -300,7 +343,20 @@ class HttpRunner(object):
         # expand nested json if headers contain 'X-Json-Control' and its value is 'expand'.
         # Note: The header is case-sensitive.
         if parsed_request_dict["headers"].get("X-Json-Control") == "expand":
-            expand_nested_json(resp_obj.body)
+            if step.request.expand_json_lazily:
+                resp_obj.body = expand_nested_json_lazily(resp_obj.body)
+            else:
+                # body has been expanded by session when recording the response, reuse it
+                # rather than parsing and expanding it again, containers are copied to keep
+                # the record untouched.
+                req_resps = self.__session.data.req_resps
+                recorded_body = req_resps[-1].response.body if req_resps else None
+                if isinstance(recorded_body, (dict, list)):
+                    resp_obj.body = copy_parsable_data(recorded_body)
+                else:
+                    expand_nested_json(
+                        resp_obj.body, paths=step.request.expand_json_paths or None
+                    )
 
         step.variables["response"] = resp_obj
 
@@ -308,13 +364,26 @@ class HttpRunner(object):
         if step.teardown_hooks:
             self.__call_hooks(step.teardown_hooks, step.variables, "teardown request")
 
-    def __run_step_request(self, step: TStep) -> None:
-        """run teststep: request"""
+    def __run_step_request(self, step: TStep, raw_step: TStep = None) -> None:
+        """run teststep: request
+
+        :param raw_step: copy of step before its variables were resolved, the request is sent again
+            with it if any shared step was refreshed for the response status, e.g. token expired.
+        """
         step_data = StepData(name=step.name)  # noqa
 
         method, url, parsed_request_dict = self.__prepare_step_request(step)
         # request
         resp = self.__session.request(method, url, **parsed_request_dict)
+
+        if raw_step is not None and self.__refresh_shared_steps(resp.status_code):
+            # only once, with session variables and cookies refreshed
+            logger.info("send request again with refreshed shared testcases")
+            step = raw_step
+            self.__resolve_step_variables(step)
+            method, url, parsed_request_dict = self.__prepare_step_request(step)
+            resp = self.__session.request(method, url, **parsed_request_dict)
+
         resp_obj = ResponseObject(resp)
 
         # preprocess before extracting and validating
@@ -339,7 +408,10 @@ class HttpRunner(object):
                 pass
 
             resp_obj.validate(
-                step.validators, step.variables, self.__project_meta.functions
+                step.validators,
+                step.variables,
+                self.__project_meta.functions,
+                fail_fast=step.validate_fail_fast,
             )
             save_run_request_retry(
                 step,
@@ -368,12 +440,68 @@ class HttpRunner(object):
             # log testcase duration before raise ValidationFailure
             self.__duration = time.time() - self.__start_at
 
-            self.__session.data.validation_results = resp_obj.validation_results
+            # validation results are built from records only when read, e.g. in summary
+            self.__session.data.set_validation_records(resp_obj.validation_records)
             step_data.data = self.__session.data
             self.__step_datas.append(step_data)
 
-    def __run_step_testcase(self, step: TStep) -> None:
-        """run teststep: referenced testcase"""
+    def __run_step_testcase(self, step: TStep, stale_before: float = None) -> None:
+        """run teststep: referenced testcase, result is reused if the step is shared"""
+        if not step.share:
+            self.__run_step_testcase_once(step)
+            return
+
+        key = get_shared_key(step)
+        with lock_shared_result(key, step.share):
+            shared_result = load_shared_result(key, step.share, stale_before)
+            if shared_result:
+                logger.info(f"reuse result of shared testcase: {step.name}")
+                step_data = StepData(name=step.name)
+                for cookie in shared_result.cookies:
+                    self.__session.cookies.set_cookie(cookie)
+                export_extracted_variables(
+                    step_data, self._session_variables, shared_result.export_vars
+                )
+                self.__step_datas.append(step_data)
+            else:
+                cookies_before = snapshot_cookies(self.__session.cookies)
+                export_vars = self.__run_step_testcase_once(step)
+                shared_result = SharedResult(
+                    export_vars=export_vars,
+                    cookies=get_new_cookies(self.__session.cookies, cookies_before),
+                    created_at=time.time(),
+                )
+                save_shared_result(key, step.share, shared_result)
+
+        self.__shared_steps[key] = (step, shared_result.created_at)
+
+    def __is_refreshable(self, step: TStep) -> bool:
+        """check if request of step may trigger refreshing shared steps, it is sent again then"""
+        return step.request is not None and any(
+            shared_step.share.refresh_on_status
+            for shared_step, _ in self.__shared_steps.values()
+        )
+
+    def __refresh_shared_steps(self, status_code: int) -> bool:
+        """run shared steps again if request got status such as 401, e.g. token expired.
+        return True if any shared step was refreshed.
+        """
+        is_refreshed = False
+        for step, created_at in list(self.__shared_steps.values()):
+            if status_code not in step.share.refresh_on_status:
+                continue
+
+            logger.warning(
+                f"got status code {status_code}, refresh shared testcase: {step.name}"
+            )
+            # result refreshed by others after this one was used will be reused
+            self.__run_step_testcase(step, stale_before=created_at)
+            is_refreshed = True
+
+        return is_refreshed
+
+    def __run_step_testcase_once(self, step: TStep) -> Dict:
+        """run referenced testcase, return exported variables"""
         step_data = StepData(name=step.name)
 
         # setup hooks,
@@ -440,6 +568,7 @@ class HttpRunner(object):
             )
 
             self.__step_datas.append(step_data)
+            return extract_mapping
         except Exception:
             # list of step data
             step_data.data = httprunner_obj.get_step_datas()
@@ -520,9 +649,16 @@ class HttpRunner(object):
                 step.variables, step.request_config.variables
             )
 
+            # evaluated resources and variables extracted from them have been parsed already
+            parsed_names = {
+                name
+                for name, value in resource_preset_variables.items()
+                if step.variables.get(name) is value
+            }
+
             # step config variables are supposed to be self-parsed before merged into step.variables
             step.variables = parse_variables_mapping(
-                step.variables, self.__project_meta.functions
+                step.variables, self.__project_meta.functions, parsed_names
             )
 
             if step.private_variables:
@@ -531,15 +667,26 @@ class HttpRunner(object):
                 # extracted variables > testcase config variables > HttpRunnerRequest config variables
                 step.variables = merge_variables(step.private_variables, step.variables)
 
-                # parse variables
+                # parse variables, except evaluated ones not overridden by step private variables
+                parsed_names = {
+                    name
+                    for name in parsed_names
+                    if step.variables.get(name) is resource_preset_variables[name]
+                }
                 step.variables = parse_variables_mapping(
-                    step.variables, self.__project_meta.functions
+                    step.variables, self.__project_meta.functions, parsed_names
                 )
 
         step.is_variables_resolved = True
 
     def __try_step_once(self, step: TStep):
         """Core function for running step (maybe a request or referenced testcase)."""
+        # request may be sent again with variables resolved after refreshing shared steps
+        raw_step = (
+            step.model_copy(deep=True)
+            if not step.is_variables_resolved and self.__is_refreshable(step)
+            else None
+        )
         self.__resolve_step_variables(step)
 
         if step.pre_delay_seconds:
@@ -550,7 +697,7 @@ class HttpRunner(object):
             logger.info(f"run step begin: {step.name} >>>>>>")
 
             if step.request:
-                self.__run_step_request(step)
+                self.__run_step_request(step, raw_step)
             elif step.testcase:
                 self.__run_step_testcase(step)
             else:
@@ -600,8 +747,9 @@ class HttpRunner(object):
         # parse step retry args (retry times and retry interval)
         parse_retry_args(step, step_shell_variables, self.__project_meta.functions)
         # otherwise, parse step name with parsed step variables
-        if step.remaining_retry_times > 0:
+        if step.remaining_retry_times > 0 or self.__is_refreshable(step):
             # if retrying is needed, step variables need to be parsed each time retrying,
+            # so are requests sent again after refreshing shared steps,
             # so the original step should stay untouched.
             step_copy = step.model_copy(deep=True)
             self.__resolve_step_variables(step_copy)
@@ -733,6 +881,7 @@ class HttpRunner(object):
         """
         self.__config = testcase.config
         self.__teststeps = testcase.teststeps
+        self.__failed_steps: list[tuple[TStep, Exception]] = []
 
         # prepare
         self.__project_meta = self.__project_meta or load_project_meta()
@@ -750,6 +899,8 @@ class HttpRunner(object):
 
         self.__start_at = time.time()
         self.__step_datas: List[StepData] = []
+        # shared steps run in this testcase, shared key -> (step, created_at of result used)
+        self.__shared_steps: Dict[Text, tuple] = {}
         self.__session = self.__session or HttpSession()
 
         self.__run_steps(self.__teststeps)
@@ -771,9 +922,7 @@ class HttpRunner(object):
         Examples:
             TestCaseRequestWithFunctions().run()
         """
-        self.__init_tests__()
-        testcase_obj = TestCase(config=self.__config, teststeps=self.__teststeps)
-        return self.run_testcase(testcase_obj)
+        return self.__compile_self().execute(runner=self)
 
     def get_step_datas(self) -> List[StepData]:
         return self.__step_datas
@@ -915,7 +1064,7 @@ class HttpRunner(object):
         logger.info(f"Start to run testcase: {self.__config.name}")
 
         case_result = self.run_testcase(
-            TestCase(config=self.__config, teststeps=self.__teststeps)
+            TestCase.model_construct(config=self.__config, teststeps=self.__teststeps)
         )
 
         self.success = True
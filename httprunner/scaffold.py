@@ -3,7 +3,8 @@ import subprocess
 import sys
 
 from loguru import logger
-from sentry_sdk import capture_message
+
+from httprunner.sentry import capture_message
 
 
 def init_parser_scaffold(subparsers):
@@ -157,7 +158,16 @@ teststeps:
         - eq: ["body.form.foo2", "bar21"]
 """
     ignore_content = "\n".join(
-        [".env", "reports/*", "__pycache__/*", "*.pyc", ".python-version", "logs/*"]
+        [
+            ".env",
+            "reports/*",
+            "__pycache__/*",
+            "*.pyc",
+            ".python-version",
+            "logs/*",
+            ".hrun_timings.json",
+            ".hmake_manifest.json",
+        ]
     )
     demo_debugtalk_content = """import time
 
@@ -0,0 +1,50 @@
+"""
+Report usage and errors to sentry, only if enabled with HTTPRUNNER_SENTRY_ENABLED=true.
+
+sentry_sdk is imported and initialized at the first report, not when importing httprunner.
+"""
+import uuid
+
+from httprunner import __version__
+
+# None: not initialized yet, True/False: sentry sdk is initialized or disabled
+_sentry_initialized = None
+
+
+def init_sentry_sdk() -> bool:
+    """init sentry sdk once if enabled, return True if reports will be sent"""
+    global _sentry_initialized
+    if _sentry_initialized is not None:
+        return _sentry_initialized
+
+    from httprunner.configs.sentry import sentry_settings
+
+    if not sentry_settings.enabled:
+        _sentry_initialized = False
+        return False
+
+    import sentry_sdk
+
+    sentry_sdk.init(
+        dsn=sentry_settings.dsn,
+        release="httprunner@{}".format(__version__),
+    )
+    with sentry_sdk.configure_scope() as scope:
+        scope.set_user({"id": uuid.getnode()})
+
+    _sentry_initialized = True
+    return True
+
+
+def capture_message(message: str) -> None:
+    if init_sentry_sdk():
+        import sentry_sdk
+
+        sentry_sdk.capture_message(message)
+
+
+def capture_exception(ex: BaseException) -> None:
+    if init_sentry_sdk():
+        import sentry_sdk
+
+        sentry_sdk.capture_exception(ex)
@@ -0,0 +1,75 @@
+"""
+Durations of testcases in previous runs, keyed by pytest node id.
+
+Durations are recorded from HttpRunner.get_summary().time.duration by the pytest plugin,
+and used to schedule the longest testcases first across pytest-xdist workers.
+"""
+import json
+import os
+import statistics
+from typing import Dict, List, Text
+
+from loguru import logger
+
+TIMINGS_FILE_NAME = ".hrun_timings.json"
+
+# weight of the latest duration, smooth out durations varying from run to run
+LATEST_DURATION_WEIGHT = 0.5
+
+
+def load_timings(timings_path: Text) -> Dict[Text, float]:
+    """load durations of testcases, empty if timings file not exists or is invalid"""
+    if not os.path.isfile(timings_path):
+        return {}
+
+    try:
+        with open(timings_path, encoding="utf-8") as f:
+            timings = json.load(f)
+    except (OSError, ValueError) as ex:
+        logger.warning(f"failed to load timings {timings_path}: {ex}")
+        return {}
+
+    if not isinstance(timings, dict):
+        return {}
+
+    return {
+        node_id: float(duration)
+        for node_id, duration in timings.items()
+        if isinstance(duration, (int, float))
+    }
+
+
+def update_timings(timings: Dict[Text, float], durations: Dict[Text, float]) -> None:
+    """update timings with durations of this run, averaged with durations of previous runs"""
+    for node_id, duration in durations.items():
+        if node_id in timings:
+            duration = (
+                LATEST_DURATION_WEIGHT * duration
+                + (1 - LATEST_DURATION_WEIGHT) * timings[node_id]
+            )
+        timings[node_id] = round(duration, 6)
+
+
+def save_timings(timings_path: Text, timings: Dict[Text, float]) -> None:
+    tmp_path = f"{timings_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(timings, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, timings_path)
+    except OSError as ex:
+        logger.warning(f"failed to save timings {timings_path}: {ex}")
+
+
+def estimate_durations(
+    node_ids: List[Text], timings: Dict[Text, float]
+) -> Dict[Text, float]:
+    """estimate durations of testcases, new testcases are estimated with median of known ones"""
+    known_durations = [timings[node_id] for node_id in node_ids if node_id in timings]
+    fallback_duration = statistics.median(known_durations) if known_durations else 0
+    return {node_id: timings.get(node_id, fallback_duration) for node_id in node_ids}
+
+
+def sort_longest_first(node_ids: List[Text], timings: Dict[Text, float]) -> List[int]:
+    """return indexes of node ids, longest processing time first, collected order is kept for ties"""
+    durations = estimate_durations(node_ids, timings)
+    return sorted(range(len(node_ids)), key=lambda index: -durations[node_ids[index]])
@@ -3,26 +3,16 @@ import itertools
 import json
 import os.path
 import platform
-import uuid
 from multiprocessing import Queue
 from typing import Dict, List, Any
 
-import sentry_sdk
 from allpairspy import AllPairs
 from loguru import logger
 
 from httprunner import __version__
 from httprunner import exceptions
 from httprunner.models import VariablesMapping, StableDeepCopyDict
-
-
-def init_sentry_sdk():
-    sentry_sdk.init(
-        dsn="https://460e31339bcb428c879aafa6a2e78098@sentry.io/5263855",
-        release="httprunner@{}".format(__version__),
-    )
-    with sentry_sdk.configure_scope() as scope:
-        scope.set_user({"id": uuid.getnode()})
+from httprunner.sentry import init_sentry_sdk  # noqa: F401, keep compatibility
 
 
 def set_os_environ(variables_mapping):
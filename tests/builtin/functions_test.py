@@ -0,0 +1,122 @@
+import copy
+import json
+import random
+
+import jmespath
+
+from httprunner.builtin.functions import (
+    expand_nested_json,
+    expand_nested_json_lazily,
+)
+
+
+def old_expand_nested_json(target):
+    """Implementation before adding the prefix check, lists are rebuilt instead of changed in place."""
+    if isinstance(target, dict):
+        for k, v in target.items():
+            target[k] = old_expand_nested_json(v)
+        return target
+    elif isinstance(target, str) and '"' in target:
+        try:
+            target = json.loads(target)
+        except json.decoder.JSONDecodeError:
+            return target
+        return old_expand_nested_json(target)
+    elif isinstance(target, list):
+        return [old_expand_nested_json(i) for i in target]
+    else:
+        return target
+
+
+def random_nested_json(rnd: random.Random, depth: int = 0):
+    simple_values = [1, 1.5, True, None, "a", 'a"b', " [1]", '{"a"', '"a"', '  "1"']
+    if depth >= 3 or rnd.random() < 0.3:
+        return rnd.choice(simple_values)
+
+    if rnd.random() < 0.3:
+        value = json.dumps(random_nested_json(rnd, depth + 1))
+        return rnd.choice(["", " ", "\n"]) + value
+    if rnd.random() < 0.5:
+        return {
+            key: random_nested_json(rnd, depth + 1)
+            for key in rnd.sample(["a", "b", "c"], rnd.randint(0, 3))
+        }
+    return [random_nested_json(rnd, depth + 1) for _ in range(rnd.randint(0, 3))]
+
+
+def test_same_result_as_old_implementation():
+    rnd = random.Random(20231019)
+    for _ in range(2000):
+        target = {"body": random_nested_json(rnd)}
+        expected = old_expand_nested_json(copy.deepcopy(target))
+
+        assert expand_nested_json(copy.deepcopy(target)) == expected
+        assert expand_nested_json_lazily(copy.deepcopy(target)) == expected
+        assert json.loads(json.dumps(expand_nested_json_lazily(target))) == expected
+
+
+def test_expand_in_place():
+    item = {"a": '{"b": 1}'}
+    target = [item, '["c"]']
+    assert expand_nested_json(target) is target
+    assert target == [{"a": {"b": 1}}, ["c"]]
+    assert target[0] is item
+
+
+def test_no_decoding_without_json_prefix():
+    target = {"a": 'key="value"', "b": "1", "c": "[1, 2]", "d": ' {"e": "f"} '}
+    assert expand_nested_json(target) == {
+        "a": 'key="value"',
+        "b": "1",
+        "c": "[1, 2]",
+        "d": {"e": "f"},
+    }
+
+
+def test_expand_paths():
+    target = {
+        "data": json.dumps({"detail": json.dumps({"id": 1}), "extra": '["x"]'}),
+        "items": [{"payload": '{"id": 2}', "tag": '["y"]'}],
+        "other": '{"id": 3}',
+    }
+
+    expanded = expand_nested_json(copy.deepcopy(target), paths=["data.detail"])
+    assert expanded["data"] == {"detail": {"id": 1}, "extra": '["x"]'}
+    assert expanded["other"] == '{"id": 3}'
+
+    expanded = expand_nested_json(copy.deepcopy(target), paths=["items[0].payload"])
+    assert expanded["items"] == [{"payload": {"id": 2}, "tag": '["y"]'}]
+    assert expanded["data"] == target["data"]
+
+    # the selected containers are expanded in place if projections are used
+    expanded = expand_nested_json(copy.deepcopy(target), paths=["items[*]"])
+    assert expanded["items"] == [{"payload": {"id": 2}, "tag": ["y"]}]
+
+    # paths not found are ignored
+    expanded = expand_nested_json(
+        copy.deepcopy(target), paths=["missing.a", "other.id", "items[3]"]
+    )
+    assert expanded["other"] == {"id": 3}
+    assert expanded["items"] == target["items"]
+
+    assert expand_nested_json(copy.deepcopy(target), paths=["@"]) == (
+        expand_nested_json(copy.deepcopy(target))
+    )
+
+
+def test_expand_lazily():
+    target = {"a": '{"b": "[{\\"c\\": 1}]"}', "d": ['{"e": "f"}']}
+    expanded = expand_nested_json_lazily(target)
+
+    # the original object is not changed
+    assert target["a"] == '{"b": "[{\\"c\\": 1}]"}'
+    assert dict.__getitem__(expanded, "a") == target["a"]
+
+    assert jmespath.search("a.b[0].c", expanded) == 1
+    assert dict.__getitem__(expanded, "a") == {"b": [{"c": 1}]}
+    assert expanded["d"] == [{"e": "f"}]
+
+    expanded = expand_nested_json_lazily(target)
+    assert dict(expanded) == {"a": {"b": [{"c": 1}]}, "d": [{"e": "f"}]}
+    assert type(copy.deepcopy(expanded)) is dict
+    assert {**expand_nested_json_lazily(target)} == dict(expanded)
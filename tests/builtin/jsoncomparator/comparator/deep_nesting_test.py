@@ -0,0 +1,46 @@
+import sys
+
+from httprunner.builtin.jsoncomparator.comparator import JSONComparator
+
+
+def build_nested_json(depth: int, leaf_value):
+    """Build GraphQL-style JSON, e.g. {"node": {"edges": [{"node": ...}]}}."""
+    root = current = {}
+    for _ in range(depth):
+        child = {}
+        current["node"] = {"edges": [child]}
+        current = child
+    current["value"] = leaf_value
+    return root
+
+
+class TestDeepNesting:
+    depth = sys.getrecursionlimit() * 2
+
+    def test_deeper_than_recursion_limit(self):
+        expected = build_nested_json(self.depth, 1)
+        for is_strict in (True, False):
+            json_comparator = JSONComparator(is_strict)
+            assert json_comparator.compare_json(
+                expected, build_nested_json(self.depth, 1.0)
+            ).is_success
+            assert json_comparator.matches(expected, build_nested_json(self.depth, 1))
+
+            result = json_comparator.compare_json(
+                expected, build_nested_json(self.depth, 2)
+            )
+            assert not result.is_success
+            assert not json_comparator.matches(
+                expected, build_nested_json(self.depth, 2)
+            )
+
+    def test_field_path_of_mismatch(self):
+        result = JSONComparator(True).compare_json(
+            build_nested_json(2, 1), build_nested_json(2, 2)
+        )
+        assert result.mismatch_fields[0].field_path == (
+            "node.edges[0].node.edges[0].value"
+        )
+        assert result.fail_messages == (
+            "node.edges[0].node.edges[0].value\nexpected: 1\n     got: 2\n"
+        )
@@ -1,6 +1,9 @@
+import random
+
 from dotwiz import DotWiz
 
 from httprunner.builtin.jsoncomparator.comparator import JSONComparator
+from httprunner.builtin.jsoncomparator.result import JSONCompareResult
 
 
 class TestRecursively:
@@ -94,3 +97,51 @@ class TestRecursively:
         )
         print(result.fail_messages)
         assert not result.is_success
+
+    def test_extra_keys_and_numbers_in_buckets(self):
+        expected = [{"a": 1, "b": {"c": 2.0}}, {"a": 1}, {"a": 1.0, "b": {}}]
+        actual = [
+            {"a": 1, "b": {"c": 3}},
+            {"a": 1.0, "b": {"c": 2, "d": 4}, "e": 5},
+            {"a": 1, "b": {"c": 1}},
+        ]
+        result = self.json_comparator.compare_json(expected, actual)
+        assert result.is_success
+
+        # True is not equal to 1, even if they are in the same bucket of Python dict.
+        result = self.json_comparator.compare_json([{"a": 1}], [{"a": True}])
+        assert not result.is_success
+
+    def test_same_result_as_comparing_one_by_one(self):
+        rnd = random.Random(20231019)
+
+        def random_item():
+            item = {
+                "a": rnd.choice([1, 1.0, 2, True, "1", None]),
+                "b": rnd.choice([[], [1], [1, 2], {"c": 1}, {"c": 1.0, "d": 2}]),
+            }
+            if rnd.random() < 0.5:
+                item["e"] = rnd.choice([1, "x"])
+            return item
+
+        for _ in range(200):
+            expected = [random_item() for _ in range(6)]
+            for item in expected:
+                if rnd.random() < 0.3:
+                    item.pop("a")
+            actual = [random_item() for _ in range(6)]
+            if rnd.random() < 0.5:
+                actual = [dict(item) for item in expected]
+                rnd.shuffle(actual)
+                actual[0]["f"] = 1
+
+            result = JSONCompareResult()
+            self.json_comparator._compare_json_arrays_recursively(
+                "", expected, actual, result
+            )
+            one_by_one_result = JSONCompareResult()
+            self.json_comparator._compare_json_arrays_one_by_one(
+                "", expected, actual, one_by_one_result
+            )
+            assert result.is_success == one_by_one_result.is_success
+            assert result.fail_messages == one_by_one_result.fail_messages
@@ -0,0 +1,137 @@
+import copy
+import itertools
+import os
+import random
+import time
+
+import pytest
+
+from httprunner.builtin.jsoncomparator.comparator import JSONComparator
+
+lenient_comparator = JSONComparator(False)
+strict_comparator = JSONComparator(True)
+
+
+def random_json(rnd: random.Random, depth: int = 0):
+    simple_values = [0, 1, 1.0, 2, True, False, "1", "a", None]
+    if depth >= 3 or rnd.random() < 0.4:
+        return rnd.choice(simple_values)
+
+    if rnd.random() < 0.5:
+        keys = rnd.sample(["a", "b", "c", "d"], rnd.randint(0, 3))
+        return {key: random_json(rnd, depth + 1) for key in keys}
+
+    return [random_json(rnd, depth + 1) for _ in range(rnd.randint(0, 3))]
+
+
+def mutate_json(rnd: random.Random, value):
+    """Copy the value with a few random changes."""
+    if isinstance(value, dict):
+        value = {key: mutate_json(rnd, item) for key, item in value.items()}
+        if value and rnd.random() < 0.1:
+            value.pop(rnd.choice(list(value)))
+        if rnd.random() < 0.2:
+            value["e"] = random_json(rnd)
+        return value
+
+    if isinstance(value, list):
+        value = [mutate_json(rnd, item) for item in value]
+        rnd.shuffle(value)
+        return value
+
+    return random_json(rnd, 3) if rnd.random() < 0.1 else value
+
+
+def test_same_result_as_compare_json():
+    rnd = random.Random(20231019)
+    for _ in range(2000):
+        expected = random_json(rnd)
+        actual = mutate_json(rnd, expected)
+        for json_comparator in (lenient_comparator, strict_comparator):
+            assert (
+                json_comparator.matches(expected, actual)
+                is json_comparator.compare_json(expected, actual).is_success
+            ), (expected, actual)
+
+
+def test_invalid_json_data_type():
+    assert not lenient_comparator.matches({"a": (1, 2)}, {"a": (1, 2)})
+    assert not lenient_comparator.matches([{"a": 1}, 1], [1, {"a", 1}])
+
+
+def make_5k_nested_objects():
+    """Array of nested objects without unique key, and a shuffled array matching it."""
+    rnd = random.Random(5000)
+    expected = [
+        {
+            "type": rnd.choice(["a", "b", "c"]),
+            "detail": {"id": i, "tags": [rnd.randint(0, 9) for _ in range(3)]},
+            "items": [{"price": rnd.random()} for _ in range(2)],
+        }
+        for i in range(5000)
+    ]
+    actual = [
+        {
+            **copy.deepcopy(item),
+            "detail": {**item["detail"], "extra": True},
+        }
+        for item in expected
+    ]
+    rnd.shuffle(actual)
+    return expected, actual
+
+
+def test_5k_nested_objects():
+    """Array of nested objects without unique key, compared recursively."""
+    expected, actual = make_5k_nested_objects()
+
+    assert lenient_comparator.matches(expected, actual)
+    assert lenient_comparator.compare_json(expected, actual).is_success
+
+    # Change one value deep inside to fail the comparison.
+    actual[-1]["items"][-1]["price"] = -1
+    assert not lenient_comparator.matches(expected, actual)
+    result = lenient_comparator.compare_json(expected, actual)
+    assert not result.is_success
+    assert "Could not find match for element" in result.fail_messages
+
+
+@pytest.mark.skipif(
+    not os.environ.get("HTTPRUNNER_BENCHMARK"),
+    reason="benchmark, set HTTPRUNNER_BENCHMARK=1 to run",
+)
+def test_benchmark_5k_nested_objects():
+    """Probe items of the 5k array with matches() and compare_json(), as array items are looked for."""
+    expected, actual = make_5k_nested_objects()
+    actual_by_id = {item["detail"]["id"]: item for item in actual}
+    probes = {
+        "matched": [(item, actual_by_id[item["detail"]["id"]]) for item in expected],
+        "mismatched": [
+            (item, actual_by_id[(item["detail"]["id"] + 1) % len(actual)])
+            for item in expected
+        ],
+    }
+    methods = {
+        "matches": lenient_comparator.matches,
+        "compare_json": lambda e, a: lenient_comparator.compare_json(e, a).is_success,
+    }
+
+    durations = {}
+    for (probe_name, pairs), (method_name, method) in itertools.product(
+        probes.items(), methods.items()
+    ):
+        # best of 3 runs to reduce noise
+        duration = float("inf")
+        for _ in range(3):
+            start_at = time.perf_counter()
+            results = [method(e, a) for e, a in pairs]
+            duration = min(duration, time.perf_counter() - start_at)
+
+        assert results == [probe_name == "matched"] * len(pairs)
+        durations[(probe_name, method_name)] = duration
+        print(f"{probe_name} {method_name}: {duration:.3f}s")
+
+    # most probes fail when items are looked for, no fail message is built by matches()
+    assert (
+        durations[("mismatched", "matches")] < durations[("mismatched", "compare_json")]
+    )
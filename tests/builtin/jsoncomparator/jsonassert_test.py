@@ -1,5 +1,84 @@
-from httprunner.builtin.jsoncomparator.jsonassert import json_contains_v2
+from decimal import Decimal
+
+import pytest
+from dotwiz import DotWiz
+
+from httprunner.builtin import jsonassert
+from httprunner.builtin.jsoncomparator.jsonassert import json_contains_v2, json_equal_v2
 
 
 def test_string():
     json_contains_v2("Joe", "Joe")
+
+
+def test_ignore_type_changes():
+    expected = {"name": "Joe", "scores": [Decimal("1.5"), 2]}
+    actual = {"name": b"Joe", "scores": [2.0, 1.5], "age": 18}
+
+    with pytest.raises(AssertionError):
+        json_contains_v2(actual, expected)
+
+    json_contains_v2(
+        actual,
+        expected,
+        ignore_string_type_changes=True,
+        ignore_numeric_type_changes=True,
+    )
+    with pytest.raises(AssertionError):
+        json_equal_v2(
+            actual,
+            expected,
+            ignore_string_type_changes=True,
+            ignore_numeric_type_changes=True,
+        )
+
+    # Values are not modified.
+    assert actual["name"] == b"Joe"
+
+
+def test_json_contains_without_deepdiff(monkeypatch):
+    def deepdiff_not_allowed(*args, **kwargs):
+        raise RuntimeError("should be compared natively")
+
+    monkeypatch.setattr(jsonassert, "json_assert", deepdiff_not_allowed)
+
+    jsonassert.json_contains(
+        {"a": 1.0, "b": b"x", "c": 3},
+        {"a": 1, "b": "x"},
+        ignore_numeric_type_changes=True,
+        ignore_string_type_changes=True,
+    )
+    jsonassert.json_equal(
+        {"a": [1, 2.0]},
+        {"a": [1.0, 2]},
+        ignore_type_in_groups=[(int, float), (dict, DotWiz)],
+    )
+    with pytest.raises(RuntimeError):
+        jsonassert.json_equal({"a": 1}, {"a": "1"}, ignore_type_in_groups=[(int, str)])
+
+
+def test_float_tolerance_when_ignore_numeric_type_changes():
+    # floats are compared to 12 digits after the decimal point, the same as deepdiff
+    jsonassert.json_contains(
+        {"a": 0.1 + 0.2, "b": 1}, {"a": 0.3}, ignore_numeric_type_changes=True
+    )
+    jsonassert.json_equal(
+        {"a": [0.1 + 0.2]}, {"a": [0.3]}, ignore_numeric_type_changes=True
+    )
+    with pytest.raises(AssertionError):
+        jsonassert.json_equal(
+            {"a": [0.31]}, {"a": [0.3]}, ignore_numeric_type_changes=True
+        )
+    with pytest.raises(AssertionError):
+        jsonassert.json_equal({"a": [0.1 + 0.2]}, {"a": [0.3]})
+
+
+def test_json_assert_with_deepdiff():
+    # Groups of types not compared as the same JSON type are still compared with deepdiff.
+    jsonassert.json_contains(
+        {"a": 1, "b": 2}, {"a": True}, ignore_type_in_groups=[(int, bool)]
+    )
+    assert jsonassert.get_json_contains_diff_message({"a": 1, "b": 2}, {"a": 1}) is None
+    assert "Value Changes" in jsonassert.get_json_contains_diff_message(
+        {"a": 1, "b": 2}, {"a": 2}
+    )
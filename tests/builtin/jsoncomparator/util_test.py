@@ -1,7 +1,19 @@
+from decimal import Decimal
+
+from dotwiz import DotWiz
+
 from httprunner.builtin.jsoncomparator.util import (
+    INDEX_SEGMENT,
+    KEY_SEGMENT,
     SALT,
+    UNIQUE_KEY_SEGMENT,
+    are_type_groups_ignored,
+    build_field_path,
     get_actual_value,
+    get_candidate_indexes,
     get_cardinality_mapping,
+    get_json_fingerprint,
+    get_json_shape,
     is_number_but_not_bool,
     is_usable_as_unique_key,
 )
@@ -79,3 +91,53 @@ def test_is_number_but_not_bool():
     assert not is_number_but_not_bool(None)
     assert not is_number_but_not_bool([])
     assert not is_number_but_not_bool({})
+
+
+def test_get_json_fingerprint():
+    shape = get_json_shape({"a": 1, "b": {"c": [1, 2]}})
+    fingerprint = get_json_fingerprint({"a": 1, "b": {"c": [3, 4]}}, shape)
+
+    # 1.0 is equal to 1, extra keys are left out, only length of arrays is taken.
+    assert (
+        get_json_fingerprint({"a": 1.0, "b": {"c": [2, 1], "d": 1}, "e": 1}, shape)
+        == fingerprint
+    )
+    assert get_json_fingerprint({"a": True, "b": {"c": [1, 2]}}, shape) != fingerprint
+    assert get_json_fingerprint({"a": 1, "b": {"c": [1]}}, shape) != fingerprint
+
+    # Values that can never match.
+    assert get_json_fingerprint({"a": 1}, shape) is None
+    assert get_json_fingerprint({"a": 1, "b": []}, shape) is None
+    assert get_json_fingerprint([1], shape) is None
+
+
+def test_get_candidate_indexes():
+    assert get_candidate_indexes(
+        [{"a": 1}, {"a": 2}, {"b": 1}], [{"a": 2}, {"a": 1, "b": 1}, {"a": 1.0}]
+    ) == [[1, 2], [0], [1]]
+
+    # Not valid JSON types.
+    assert get_candidate_indexes([{"a": (1, 2)}], [{"a": 1}]) is None
+    assert get_candidate_indexes([{"a": 1}], [(1, 2)]) is None
+
+
+def test_build_field_path():
+    assert build_field_path("") == ""
+    assert build_field_path(("", KEY_SEGMENT, "a")) == "a"
+
+    path = (("", KEY_SEGMENT, "a"), INDEX_SEGMENT, 0)
+    path = (path, UNIQUE_KEY_SEGMENT, ("id", 1))
+    path = (path, KEY_SEGMENT, "b")
+    assert build_field_path(path) == "a[0][id=1].b"
+
+
+def test_are_type_groups_ignored():
+    assert are_type_groups_ignored(None, False, False)
+    assert are_type_groups_ignored([(dict, DotWiz), (int, float)], False, False)
+    assert are_type_groups_ignored((int, float), False, False)
+    assert not are_type_groups_ignored([(int, Decimal)], False, False)
+    assert are_type_groups_ignored([(int, Decimal)], False, True)
+    assert not are_type_groups_ignored([(str, bytes)], False, False)
+    assert are_type_groups_ignored([(str, bytes)], True, False)
+    assert not are_type_groups_ignored([(int, bool)], True, True)
+    assert not are_type_groups_ignored([(list, tuple)], True, True)
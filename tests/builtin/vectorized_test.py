@@ -0,0 +1,116 @@
+import math
+import random
+
+import pytest
+
+from httprunner.builtin import comparators, vectorized
+from httprunner.configs.comparator import comparator_settings
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def use_numpy(request, monkeypatch):
+    monkeypatch.setattr(comparator_settings, "use_numpy", request.param)
+    monkeypatch.setattr(comparator_settings, "numpy_min_size", 10)
+    return request.param
+
+
+def get_error_message(func, *args, **kwargs) -> str:
+    with pytest.raises(AssertionError) as exc_info:
+        func(*args, **kwargs)
+    return str(exc_info.value)
+
+
+def test_to_numeric_array(monkeypatch):
+    monkeypatch.setattr(comparator_settings, "numpy_min_size", 2)
+    assert vectorized.to_numeric_array([1, 2, 3]).dtype.kind == "i"
+    assert vectorized.to_numeric_array((1.0, 2.0)).dtype.kind == "f"
+
+    # not homogeneous int or float arrays
+    assert vectorized.to_numeric_array([1, 2.0]) is None
+    assert vectorized.to_numeric_array([1, True]) is None
+    assert vectorized.to_numeric_array(["1", "2"]) is None
+    assert vectorized.to_numeric_array([1, 2**64]) is None
+
+    # too short
+    assert vectorized.to_numeric_array([1]) is None
+
+
+def test_each_equal(use_numpy):
+    values = [1] * 50
+    comparators.each_equal(values, 1, is_not_empty=True)
+
+    values[3] = 2
+    values[30] = 0
+    message = get_error_message(comparators.each_equal, values, 1, is_not_empty=True)
+    assert "[(3, 2), (30, 0)]" in message
+
+
+def test_each_equal_capped(use_numpy, monkeypatch):
+    monkeypatch.setattr(comparator_settings, "max_reported_items", 2)
+    message = get_error_message(
+        comparators.each_equal, list(range(20)), 0, is_not_empty=True
+    )
+    assert "[(1, 1), (2, 2)]" in message
+    assert "共 19 个" in message
+
+
+def test_is_close(use_numpy):
+    values = [1.0 + i * 1e-4 for i in range(20)]
+    comparators.is_close(values, (1.0, 0.002))
+    comparators.is_close(1.001, (1.0, 0.002))
+
+    values[5] = 1.1
+    values[7] = math.nan
+    values[9] = math.inf
+    message = get_error_message(comparators.is_close, values, (1.0, 0.002))
+    assert "[(5, 1.1), (7, nan), (9, inf)]" in message
+
+
+def test_no_keys_duplicate(use_numpy):
+    comparators.no_keys_duplicate(list(range(20)), None)
+
+    values = list(range(20))
+    values[10] = 5
+    values[15] = 2
+    values[19] = 5
+    message = get_error_message(comparators.no_keys_duplicate, values, None)
+    assert "[(2, [2, 15]), (5, [5, 10, 19])]" in message
+
+
+def test_list_sorted_in(use_numpy):
+    comparators.list_sorted_in(list(range(20)), "ASC")
+    comparators.list_sorted_in(list(range(20, 0, -1)), "DSC")
+    comparators.list_sorted_in([1.0] * 20, "DSC")
+
+    with pytest.raises(AssertionError):
+        comparators.list_sorted_in(list(range(20)), "DSC")
+
+
+def test_same_result_as_python(monkeypatch):
+    monkeypatch.setattr(comparator_settings, "numpy_min_size", 10)
+    rnd = random.Random(20231019)
+
+    for _ in range(50):
+        ints = [rnd.randint(-5, 5) for _ in range(100)]
+        floats = [rnd.choice([0.5, 1.0, 1.0 + 1e-12, -0.0, 0.0]) for _ in range(100)]
+        for values in (ints, floats):
+            assert vectorized.get_unequal_indexes(values, values[0]) == [
+                index for index, item in enumerate(values) if item != values[0]
+            ]
+            assert vectorized.get_not_close_indexes(values, 1, 0.1) == [
+                index
+                for index, item in enumerate(values)
+                if not math.isclose(item, 1, abs_tol=0.1)
+            ]
+            assert vectorized.is_sorted(values, False) is (values == sorted(values))
+            assert vectorized.is_sorted(sorted(values), False) is True
+            assert vectorized.is_sorted(sorted(values, reverse=True), True) is True
+
+            groups = {}
+            for index, item in enumerate(values):
+                groups.setdefault(item, []).append(index)
+            assert vectorized.get_duplicate_indexes(values) == [
+                indexes for indexes in groups.values() if len(indexes) > 1
+            ]
@@ -1,12 +1,14 @@
 import io
 import os
+import subprocess
 import sys
 import unittest
 from pathlib import Path
 
 import pytest
 
-from httprunner.cli import main
+from httprunner import __version__
+from httprunner.cli import main, main_hrun_alias
 from httprunner.loader import load_project_meta
 from httprunner.pyproject import locate_pyproject_toml_dir
 
@@ -31,6 +33,28 @@ class TestCli(unittest.TestCase):
 
         self.assertIn(__version__, self.captured_output.getvalue().strip())
 
+    def test_show_version_without_heavy_imports(self):
+        code = (
+            "import sys; sys.argv = ['hrun', '-V']\n"
+            "from httprunner.cli import main_hrun_alias\n"
+            "try:\n    main_hrun_alias()\nexcept SystemExit:\n    pass\n"
+            "print(sorted(m for m in ['pytest', 'loguru', 'sentry_sdk', 'pydantic', "
+            "'httprunner.runner'] if m in sys.modules))"
+        )
+        output = subprocess.check_output([sys.executable, "-c", code])
+        self.assertEqual(output.decode().split(), [__version__, "[]"])
+
+    def test_show_import_time(self):
+        sys.argv = ["hrun", "--import-time"]
+
+        with self.assertRaises(SystemExit) as cm:
+            main_hrun_alias()
+
+        self.assertEqual(cm.exception.code, 0)
+        output = self.captured_output.getvalue()
+        self.assertIn("ms in total", output)
+        self.assertIn("httprunner.runner", output)
+
     def test_show_help(self):
         sys.argv = ["hrun", "-h"]
 
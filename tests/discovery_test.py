@@ -0,0 +1,172 @@
+import json
+import os
+
+import pytest
+
+from httprunner import discovery
+from httprunner.discovery import (
+    FileKind,
+    classify_test_file,
+    discover_test_files,
+    is_ignored,
+    parse_ignore_rules,
+)
+
+TESTCASE = "config:\n    name: foo\nteststeps:\n-   name: bar\n"
+TESTSUITE = "config:\n    name: foo\ntestcases:\n-   name: bar\n"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    discovery._scanned_dirs.clear()
+    discovery._classified_files.clear()
+
+
+def write(path, content=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_ignore_rules():
+    rules = parse_ignore_rules(
+        [
+            "# comment",
+            "",
+            "reports/*",
+            "*.bak.yml",
+            "!keep.bak.yml",
+            "data/",
+            "/a/**/b",
+        ],
+        "/root",
+    )
+    assert is_ignored("/root/reports/foo.yml", False, rules)
+    assert not is_ignored("/root/sub/reports/foo.yml", False, rules)
+    assert is_ignored("/root/sub/foo.bak.yml", False, rules)
+    assert not is_ignored("/root/sub/keep.bak.yml", False, rules)
+    assert is_ignored("/root/sub/data", True, rules)
+    assert not is_ignored("/root/sub/data", False, rules)
+    assert is_ignored("/root/a/b", True, rules)
+    assert is_ignored("/root/a/x/y/b", False, rules)
+
+
+def test_classify_test_file(tmp_path):
+    cases = {
+        "testcase.yml": (TESTCASE, FileKind.TESTCASE),
+        "testsuite.yaml": (TESTSUITE, FileKind.TESTSUITE),
+        "api.yml": ("name: foo\nrequest:\n    url: /foo\n", FileKind.TESTCASE),
+        "nested.yml": ("foo:\n    teststeps: []\n", FileKind.OTHER),
+        "testcase.json": ('{"config": {}, "teststeps": []}', FileKind.TESTCASE),
+        "fixture.json": ('[{"teststeps": []}]', FileKind.OTHER),
+        "data.json": ('{"users": [1, 2]}', FileKind.OTHER),
+        # decisive keys after large config
+        "large.yml": (
+            "config:\n    variables:\n"
+            + "".join(f"        v{i}: {i}\n" for i in range(1000))
+            + "teststeps: []\n",
+            FileKind.TESTCASE,
+        ),
+        # decisive keys after long leading comments
+        "commented.yml": ("# " + "x" * 5000 + "\n" + TESTCASE, FileKind.TESTCASE),
+        "foo_test.py": ("import pytest\n", FileKind.PYTEST),
+    }
+    for name, (content, kind) in cases.items():
+        path = str(tmp_path / name)
+        write(path, content)
+        assert classify_test_file(path) == (kind, None), name
+
+    path = str(tmp_path / "bar_test.py")
+    write(path, "# NOTE: Generated By HttpRunner v4.3.5\n# FROM: testcases/bar.yml\n")
+    assert classify_test_file(path) == (FileKind.PYTEST, "testcases/bar.yml")
+
+
+def test_discover_test_files(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    testcases_dir = os.path.join(root, "testcases")
+    write(os.path.join(root, ".gitignore"), "reports/*\n*.bak.yml\n")
+    write(os.path.join(root, ".hrunignore"), "data/\n")
+    write(os.path.join(testcases_dir, "login.yml"), TESTCASE)
+    write(
+        os.path.join(testcases_dir, "login_test.py"),
+        "# NOTE: Generated By HttpRunner\n# FROM: testcases/login.yml\n",
+    )
+    write(
+        os.path.join(testcases_dir, "orphan_test.py"),
+        "# NOTE: Generated By HttpRunner\n# FROM: testcases/orphan.yml\n",
+    )
+    write(os.path.join(testcases_dir, "suite.yml"), TESTSUITE)
+    write(os.path.join(testcases_dir, "fixture.json"), "[]")
+    write(os.path.join(testcases_dir, "old.bak.yml"), TESTCASE)
+    write(os.path.join(testcases_dir, "data", "foo.yml"), TESTCASE)
+    write(os.path.join(root, "reports", "foo.yml"), TESTCASE)
+    write(os.path.join(root, "node_modules", "foo.yml"), TESTCASE)
+    write(os.path.join(root, "logs", "foo.yml"), TESTCASE)
+    write(os.path.join(root, "env", "pyvenv.cfg"))
+    write(os.path.join(root, "env", "foo.yml"), TESTCASE)
+
+    expected = [
+        os.path.join(testcases_dir, "login.yml"),
+        os.path.join(testcases_dir, "suite.yml"),
+        os.path.join(testcases_dir, "orphan_test.py"),
+    ]
+    assert discover_test_files(root) == expected
+
+    # scanned directories are cached until changed
+    scanned = []
+    scandir = os.scandir
+    monkeypatch.setattr(
+        discovery.os, "scandir", lambda path: scanned.append(path) or scandir(path)
+    )
+    assert discover_test_files(root) == expected
+    assert scanned == []
+
+    write(os.path.join(testcases_dir, "logout.yml"), TESTCASE)
+    stat = os.stat(testcases_dir)
+    os.utime(testcases_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert os.path.join(testcases_dir, "logout.yml") in discover_test_files(root)
+    assert scanned == [testcases_dir]
+
+
+def test_discover_with_disk_cache(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    testcases_dir = str(tmp_path / "testcases")
+    write(os.path.join(testcases_dir, "login.yml"), TESTCASE)
+    monkeypatch.setattr(discovery.loader_settings, "cache_dir", cache_dir)
+    monkeypatch.setattr(discovery, "_is_disk_cache_loaded", False)
+    assert discover_test_files(testcases_dir) == [
+        os.path.join(testcases_dir, "login.yml")
+    ]
+    assert os.listdir(cache_dir) == ["discovery.json"]
+
+    # a new process loads scanned directories and classified files from disk
+    discovery._scanned_dirs.clear()
+    discovery._classified_files.clear()
+    monkeypatch.setattr(discovery, "_is_disk_cache_loaded", False)
+    monkeypatch.setattr(discovery, "_classify", None)
+    monkeypatch.setattr(discovery.os, "scandir", None)
+    assert discover_test_files(testcases_dir) == [
+        os.path.join(testcases_dir, "login.yml")
+    ]
+
+
+def test_invalid_disk_cache_ignored(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    testcases_dir = str(tmp_path / "testcases")
+    write(os.path.join(testcases_dir, "login.yml"), TESTCASE)
+    monkeypatch.setattr(discovery.loader_settings, "cache_dir", str(cache_dir))
+    monkeypatch.setattr(discovery, "_is_disk_cache_loaded", False)
+    discover_test_files(testcases_dir)
+
+    content = json.loads((cache_dir / "discovery.json").read_text())
+    for item in content["files"].values():
+        assert item[1] == "testcase"
+        item[1] = "unknown"
+    (cache_dir / "discovery.json").write_text(json.dumps(content))
+
+    discovery._scanned_dirs.clear()
+    discovery._classified_files.clear()
+    monkeypatch.setattr(discovery, "_is_disk_cache_loaded", False)
+    assert discover_test_files(testcases_dir) == [
+        os.path.join(testcases_dir, "login.yml")
+    ]
@@ -0,0 +1,128 @@
+import os
+import time
+
+import pytest
+
+from httprunner import Config, HttpRunner, RunRequest, Step
+from httprunner.client import HttpSession
+from httprunner.configs.mock import mock_settings
+from httprunner.core.runner.exec_step import TEMPLATE_FIELDS, ExecStep
+
+
+def make_tstep():
+    return (
+        Step(
+            RunRequest("post $user_id")
+            .retry_on_failure(2, 0)
+            .with_variables(payload={"ids": ["$user_id"]})
+            .post("/users/$user_id")
+            .with_headers(**{"X-User": "user-$user_id"})
+            .with_json({"user": {"id": "$user_id"}, "tags": ["$user_id"]})
+            .validate()
+            .assert_equal("status_code", 200)
+            .assert_equal("body.ids", ["$user_id"])
+        )
+    ).perform()
+
+
+def test_copy_state_only():
+    tstep = make_tstep()
+    step = ExecStep(tstep)
+    step_copy = step.copy()
+
+    # fields never changed while running are shared
+    assert step_copy.validators is step.validators
+    assert step_copy.stop_retry_if is step.stop_retry_if
+
+    # state is copied
+    step_copy.name = "changed"
+    step_copy.remaining_retry_times -= 1
+    step_copy.variables["payload"]["ids"][0] = 1
+    step_copy.request.headers["X-User"] = 1
+    step_copy.request.req_json["user"]["id"] = 1
+    assert step.name == "post $user_id"
+    assert step.remaining_retry_times == 2
+    assert step.variables == {"payload": {"ids": ["$user_id"]}}
+    assert step.request.headers == {"X-User": "user-$user_id"}
+    assert step.request.req_json == {"user": {"id": "$user_id"}, "tags": ["$user_id"]}
+
+    # TStep used to compile is not changed either
+    assert tstep.variables == {"payload": {"ids": ["$user_id"]}}
+
+    with pytest.raises(AttributeError):
+        step.validators = []
+
+    assert step.model_copy(update={"name": "foo"}, deep=True).name == "foo"
+    assert step.to_tstep().model_dump() == tstep.model_dump()
+
+
+class ParametrizedWithRetries(HttpRunner):
+    config = Config("parametrized step with retries").base_url("http://127.0.0.1:1")
+    teststeps = [
+        Step(
+            RunRequest("post $user_id")
+            .parametrize("user_id", list(range(10)))
+            .retry_on_failure(2, 0)
+            .with_variables(payload={"ids": ["$user_id"]})
+            .post("/users/$user_id")
+            .with_headers(**{"X-User": "user-$user_id"})
+            .with_json({"user": {"id": "$user_id"}, "tags": ["$user_id"]})
+            .mock({"ids": [1]})
+            .validate()
+            .assert_equal("status_code", 200)
+            .assert_equal("body.ids", [1])
+        )
+    ]
+
+
+def test_run_parametrized_step_with_retries(monkeypatch):
+    monkeypatch.setattr(mock_settings, "is_enabled", True)
+    plan = HttpRunner.compile(ParametrizedWithRetries)
+    summary = plan.execute(session=HttpSession()).get_summary()
+    assert summary.success
+    assert len(summary.step_datas) == 10
+
+    # steps of plan are not changed by running
+    assert plan.exec_steps[0].variables == {"payload": {"ids": ["$user_id"]}}
+    assert plan.exec_steps[0].remaining_retry_times == 2
+
+
+def test_copies_share_template_fields():
+    """A step parametrized with 1000 ids and retried twice is copied 3000 times, template fields are never copied."""
+    exec_step = ExecStep(make_tstep())
+    copies = [exec_step.copy() for _ in range(1000 * 3)]
+
+    for field in TEMPLATE_FIELDS:
+        template_value = getattr(exec_step, field)
+        assert all(getattr(step, field) is template_value for step in copies)
+
+    # state is not shared by copies
+    assert len({id(step.variables) for step in copies}) == len(copies)
+    assert len({id(step.request.req_json) for step in copies}) == len(copies)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("HTTPRUNNER_BENCHMARK"),
+    reason="benchmark, set HTTPRUNNER_BENCHMARK=1 to run",
+)
+def test_benchmark_1000_ids_parametrized_step_with_retries():
+    """Copies made by runner for a step parametrized with 1000 ids and retried twice for each."""
+    tstep = make_tstep()
+    exec_step = ExecStep(tstep)
+    attempts = 1000 * 3
+
+    durations = {}
+    for name, copy_step in [
+        ("ExecStep", exec_step.copy),
+        ("TStep", lambda: tstep.model_copy(deep=True)),
+    ]:
+        # best of 3 runs to reduce noise
+        durations[name] = float("inf")
+        for _ in range(3):
+            start_at = time.perf_counter()
+            for _ in range(attempts):
+                copy_step()
+            durations[name] = min(durations[name], time.perf_counter() - start_at)
+
+    print(f"ExecStep: {durations['ExecStep']:.3f}s, TStep: {durations['TStep']:.3f}s")
+    assert durations["ExecStep"] < durations["TStep"]
@@ -0,0 +1,165 @@
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from httprunner import Config, HttpRunner, RunRequest, Step, loader
+from httprunner.cli import main_hrun_alias
+from httprunner.ext.load.engine import LoadRunner
+from httprunner.ext.load.profile import ConstantProfile
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    delay = 0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        status_code = 500 if self.path == "/fail" else 200
+        body = json.dumps({"path": self.path}).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    SlowHandler.delay = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_testcase_cls(base_url, last_path="/items"):
+    class GetItems(HttpRunner):
+        config = Config("get items").base_url(base_url)
+        teststeps = [
+            Step(
+                RunRequest("get user")
+                .get("/users/1")
+                .validate()
+                .assert_equal("status_code", 200)
+            ),
+            Step(
+                RunRequest("get items")
+                .get(last_path)
+                .validate()
+                .assert_equal("status_code", 200)
+            ),
+        ]
+
+    return GetItems
+
+
+def test_load_at_constant_rate(base_url):
+    intervals = []
+    report = LoadRunner(
+        [make_testcase_cls(base_url)],
+        ConstantProfile(rate=40, duration=1),
+        workers=5,
+        report_interval=0.5,
+        reporter=lambda elapsed, summary: intervals.append(summary),
+    ).run()
+
+    total = report["total"]
+    assert total["started"] == 40
+    assert total["dropped"] == 0
+    assert total["testcases"]["get items"]["count"] == 40
+    assert total["testcases"]["get items"]["errors"] == 0
+    for name in ["get user", "get items"]:
+        step = total["steps"][name]
+        assert step["count"] == 40
+        assert step["error_rate"] == 0
+        assert 0 < step["p50"] <= step["p90"] <= step["p99"] <= step["p99.9"]
+        assert step["p99.9"] <= step["max"]
+
+    # intervals are reported while running
+    assert len(intervals) >= 2
+    assert intervals == report["intervals"][: len(intervals)]
+    assert sum(item["started"] for item in report["intervals"]) == 40
+    assert report["intervals"][0]["target_rate"] == 40
+    assert report["intervals"][0]["testcases"]["get items"]["throughput"] > 0
+
+
+def test_load_errors_counted_by_step(base_url):
+    report = LoadRunner(
+        [make_testcase_cls(base_url, "/fail")],
+        ConstantProfile(rate=20, duration=0.5),
+        reporter=None,
+    ).run()
+
+    total = report["total"]
+    assert total["testcases"]["get items"]["error_rate"] == 1
+    assert total["steps"]["get user"]["error_rate"] == 0
+    assert total["steps"]["get items"]["errors"] == 10
+
+
+def test_load_not_slowed_down_by_latency(base_url):
+    # 2 workers can finish 10 iterations per second at most
+    SlowHandler.delay = 0.1
+    start = time.perf_counter()
+    report = LoadRunner(
+        [make_testcase_cls(base_url)],
+        ConstantProfile(rate=20, duration=1),
+        workers=2,
+        reporter=None,
+    ).run()
+
+    total = report["total"]
+    assert total["started"] == 20
+    assert total["testcases"]["get items"]["count"] == 20
+    assert time.perf_counter() - start >= 1.8
+    # latency of testcase includes time waiting for idle worker
+    assert total["testcases"]["get items"]["max"] > 1000
+    assert total["steps"]["get items"]["max"] < 1000
+
+
+def test_hrun_load(base_url, tmp_path, monkeypatch):
+    (tmp_path / "debugtalk.py").write_text("")
+    (tmp_path / "pyproject.toml").write_text("")
+    testcase = {
+        "config": {"name": "get user", "base_url": base_url},
+        "teststeps": [
+            {
+                "name": "get user",
+                "request": {"method": "GET", "url": "/users/1"},
+                "validators": [{"eq": ["status_code", 200]}],
+            }
+        ],
+    }
+    (tmp_path / "get_user.json").write_text(json.dumps(testcase))
+    report_path = tmp_path / "load.json"
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(loader, "project_meta", None)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "hrun",
+            "load",
+            str(tmp_path / "get_user.json"),
+            "--rate",
+            "10",
+            "--duration",
+            "0.5",
+            "--report-file",
+            str(report_path),
+        ],
+    )
+
+    with pytest.raises(SystemExit) as exc_info:
+        main_hrun_alias()
+
+    assert exc_info.value.code == 0
+    report = json.loads(report_path.read_text())
+    assert report["total"]["started"] == 5
+    assert report["total"]["steps"]["get user"]["count"] == 5
@@ -0,0 +1,71 @@
+import random
+
+from httprunner.ext.load.histogram import (
+    Histogram,
+    get_bucket_index,
+    get_highest_equivalent_value,
+)
+
+
+def test_small_values_counted_exactly():
+    histogram = Histogram()
+    for value in range(1, 101):
+        histogram.record(value)
+
+    assert histogram.count == 100
+    assert histogram.min == 1
+    assert histogram.max == 100
+    assert histogram.mean == 50.5
+    assert histogram.percentile(50) == 50
+    assert histogram.percentile(90) == 90
+    assert histogram.percentile(99) == 99
+    assert histogram.percentile(99.9) == 100
+    assert histogram.percentile(100) == 100
+
+
+def test_bucket_relative_error():
+    for value in [2047, 2048, 4095, 4096, 123456, 10**9]:
+        index = get_bucket_index(value)
+        highest = get_highest_equivalent_value(index)
+        assert highest >= value
+        assert (highest - value) / value < 0.001
+        # buckets are continuous
+        assert get_bucket_index(highest) == index
+        assert get_bucket_index(highest + 1) == index + 1
+
+
+def test_percentile_of_large_values():
+    values = [random.randint(1000, 5000000) for _ in range(10000)]
+    histogram = Histogram()
+    for value in values:
+        histogram.record(value)
+
+    values.sort()
+    for percentile in [50, 90, 99, 99.9]:
+        expected = values[int(percentile / 100 * len(values)) - 1]
+        assert abs(histogram.percentile(percentile) - expected) / expected < 0.002
+
+    assert histogram.percentile(100) == values[-1]
+
+
+def test_merge():
+    first, second, total = Histogram(), Histogram(), Histogram()
+    for value in range(0, 100000, 7):
+        (first if value % 2 else second).record(value)
+        total.record(value)
+
+    first.merge(second)
+    first.merge(Histogram())
+    assert first.counts == total.counts
+    assert (first.count, first.min, first.max, first.total) == (
+        total.count,
+        total.min,
+        total.max,
+        total.total,
+    )
+
+
+def test_empty():
+    histogram = Histogram()
+    assert histogram.percentile(99) == 0
+    assert histogram.mean == 0
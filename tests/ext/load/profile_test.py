@@ -0,0 +1,65 @@
+import pytest
+
+from httprunner import exceptions
+from httprunner.ext.load.profile import (
+    ConstantProfile,
+    RampProfile,
+    StepProfile,
+    make_profile,
+)
+
+
+def test_constant_profile():
+    times = list(ConstantProfile(10, 2).arrival_times())
+    assert len(times) == 20
+    for index, elapsed in enumerate(times):
+        assert elapsed == pytest.approx(index * 0.1, abs=1e-5)
+
+
+def test_ramp_profile():
+    profile = RampProfile(0, 20, 2)
+    times = list(profile.arrival_times())
+    assert len(times) == 20
+    # arrivals get denser as rate goes up
+    assert times[1] - times[0] > times[-1] - times[-2]
+    assert profile.rate_at(1) == 10
+    assert sum(1 for elapsed in times if elapsed < 1) == 5
+
+
+def test_step_profile():
+    profile = StepProfile(5, 5, 1, 3)
+    times = list(profile.arrival_times())
+    assert len(times) == 30
+    assert [profile.rate_at(elapsed) for elapsed in (0, 1.5, 2.9)] == [5, 10, 15]
+    assert [
+        sum(1 for t in times if second <= t < second + 1) for second in range(3)
+    ] == [
+        5,
+        10,
+        15,
+    ]
+
+
+def test_make_profile():
+    assert isinstance(make_profile(10, rate=5), ConstantProfile)
+
+    profile = make_profile(10, ramp="1:50")
+    assert isinstance(profile, RampProfile)
+    assert (profile.start_rate, profile.end_rate) == (1, 50)
+
+    profile = make_profile(10, step="10:5:2")
+    assert isinstance(profile, StepProfile)
+    assert (profile.start_rate, profile.step_rate, profile.step_duration) == (10, 5, 2)
+
+    for kwargs in [
+        {},
+        {"rate": 0},
+        {"ramp": "10"},
+        {"step": "1:a:1"},
+        {"ramp": "-1:5"},
+    ]:
+        with pytest.raises(exceptions.ParamsError):
+            make_profile(10, **kwargs)
+
+    with pytest.raises(exceptions.ParamsError):
+        make_profile(0, rate=1)
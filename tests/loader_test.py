@@ -1,4 +1,7 @@
+import datetime
+import json
 import os
+import sys
 import unittest
 
 import pytest
@@ -128,3 +131,139 @@ class TestLoader(unittest.TestCase):
             loader.locate_file("examples/postman_echo/", "debugtalk.py"),
             os.path.join(os.getcwd(), "examples", "debugtalk.py"),
         )
+
+
+TESTCASE_YAML = """
+config:
+    name: login
+    variables:
+        user: foo
+teststeps:
+-   name: login
+    request:
+        method: POST
+        url: /login
+        json:
+            user: $user
+"""
+
+
+@pytest.fixture
+def testcase_file(tmp_path):
+    loader._cached_testcases.clear()
+    path = tmp_path / "login.yml"
+    path.write_text(TESTCASE_YAML)
+    yield str(path)
+    loader._cached_testcases.clear()
+
+
+def test_load_testcase_file_cached(testcase_file, monkeypatch):
+    testcase_obj = loader.load_testcase_file(testcase_file)
+    assert testcase_obj.config.name == "login"
+    assert testcase_obj.teststeps[0].request.req_json == {"user": "$user"}
+
+    validate_calls = []
+    validate = loader.TestCase.model_validate
+    monkeypatch.setattr(
+        loader.TestCase,
+        "model_validate",
+        lambda *args, **kwargs: validate_calls.append(1) or validate(*args, **kwargs),
+    )
+
+    # cached copies can be changed
+    testcase_obj.config.variables["user"] = "bar"
+    cached_obj = loader.load_testcase_file(testcase_file)
+    assert cached_obj.config.variables == {"user": "foo"}
+    assert cached_obj.config.path == testcase_file
+    assert validate_calls == []
+
+    # loaded again after file changed
+    with open(testcase_file, "a") as f:
+        f.write("            id: 1\n")
+    changed_obj = loader.load_testcase_file(testcase_file)
+    assert changed_obj.teststeps[0].request.req_json == {"user": "$user", "id": 1}
+    assert validate_calls == [1]
+
+
+def test_load_testcase_file_disk_cached(testcase_file, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(loader.loader_settings, "cache_dir", str(cache_dir))
+    testcase_obj = loader.load_testcase_file(testcase_file)
+    assert len(os.listdir(cache_dir)) == 1
+
+    # a new process has empty memory cache
+    loader._cached_testcases.clear()
+    monkeypatch.setattr(loader, "load_test_file", None)
+    cached_obj = loader.load_testcase_file(testcase_file)
+    assert cached_obj.model_dump() == testcase_obj.model_dump()
+
+
+def test_disk_cached_testcase_is_json(testcase_file, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(loader.loader_settings, "cache_dir", str(cache_dir))
+    testcase_obj = loader.load_testcase_file(testcase_file)
+    (cache_path,) = cache_dir.iterdir()
+    assert cache_path.suffix == ".json"
+    assert json.loads(cache_path.read_text())["config"]["name"] == "login"
+
+    # invalid cache is not used
+    cache_path.write_text(json.dumps({"config": {}}))
+    loader._cached_testcases.clear()
+    reloaded_obj = loader.load_testcase_file(testcase_file)
+    assert reloaded_obj.model_dump() == testcase_obj.model_dump()
+
+
+def test_testcase_not_kept_by_json_not_disk_cached(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(loader.loader_settings, "cache_dir", str(cache_dir))
+    path = tmp_path / "dated.yml"
+    path.write_text(TESTCASE_YAML.replace("user: foo", "user: 2020-01-01"))
+    testcase_obj = loader._load_validated_testcase(str(path))
+    assert testcase_obj.config.variables["user"] == datetime.date(2020, 1, 1)
+    assert not cache_dir.exists()
+
+
+def test_load_project_meta_cached_for_each_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    monkeypatch.setattr(loader, "project_meta", None)
+    monkeypatch.delitem(sys.modules, "debugtalk", raising=False)
+    roots = []
+    for name in ["foo", "bar"]:
+        root = tmp_path / name
+        root.mkdir()
+        (root / "debugtalk.py").write_text(f"def get_name():\n    return '{name}'\n")
+        roots.append(str(root))
+
+    load_calls = []
+    load_debugtalk_functions = loader.load_debugtalk_functions
+    monkeypatch.setattr(
+        loader,
+        "load_debugtalk_functions",
+        lambda: load_calls.append(1) or load_debugtalk_functions(),
+    )
+
+    for root in roots + roots:
+        project_meta = loader.load_project_meta(root, reload=True)
+        assert project_meta.httprunner_root_path == root
+        assert project_meta.functions["get_name"]() == os.path.basename(root)
+    assert load_calls == [1, 1]
+    assert sys.path.count(roots[0]) == 1
+
+    # debugtalk.py is loaded again only if modified
+    debugtalk_path = os.path.join(roots[0], "debugtalk.py")
+    with open(debugtalk_path, "w") as f:
+        f.write("def get_name():\n    return 'modified'\n")
+    stat = os.stat(debugtalk_path)
+    os.utime(debugtalk_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    project_meta = loader.load_project_meta(roots[0], reload=True)
+    assert project_meta.functions["get_name"]() == "modified"
+    assert load_calls == [1, 1, 1]
+
+
+def test_get_debugtalk_py_file_option():
+    assert loader.get_debugtalk_py_file_option(["hrun", "a.yml"]) is None
+    assert (
+        loader.get_debugtalk_py_file_option(["hrun", "--debugtalk-py-file", "a.py"])
+        == "a.py"
+    )
+    assert loader.get_debugtalk_py_file_option(["--debugtalk-py-file=b.py"]) == "b.py"
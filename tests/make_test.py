@@ -3,14 +3,17 @@ import unittest
 
 import pytest
 
-from httprunner import loader
+from httprunner import loader, make
 from httprunner.make import (
+    MANIFEST_FILE_NAME,
+    format_pytest_content,
     main_make,
     convert_testcase_path,
     pytest_files_made_cache_mapping,
     make_config_chain_style,
     make_teststep_chain_style,
     pytest_files_run_set,
+    pytest_files_written_set,
     ensure_file_abs_path_valid,
 )
 
@@ -240,6 +243,19 @@ from request_methods.request_with_functions_test import (
             .validate().assert_equal("status_code", 200).assert_equal("body.args.sum_v", "3"))""",
         )
 
+    def test_make_shared_teststep_chain_style(self):
+        step = {
+            "name": "login",
+            "testcase": "CLS_LB(Login)CLS_RB",
+            "export": ["token"],
+            "share": {"scope": "session", "key": ["user"], "ttl": 600},
+        }
+        self.assertEqual(
+            make_teststep_chain_style(step),
+            """Step(RunTestCase("login").call(CLS_LB(Login)CLS_RB).export(*['token'])"""
+            """.shared(**{'scope': 'session', 'key': ['user'], 'ttl': 600}))""",
+        )
+
     @pytest.mark.skip
     def test_make_requests_with_json_chain_style(self):
         step = {
@@ -286,3 +302,121 @@ from request_methods.request_with_functions_test import (
             .assert_equal("status_code", 200)
             .assert_equal("body.args.sum_v", "3"))""",
         )
+
+
+def create_project(tmp_path, monkeypatch, profiles: int = 1):
+    """create project with login testcase referenced by profile testcases"""
+    testcases_dir = tmp_path / "testcases"
+    testcases_dir.mkdir()
+    (tmp_path / "debugtalk.py").write_text("")
+    (testcases_dir / "login.yml").write_text(
+        "config:\n    name: login\n"
+        "teststeps:\n-   name: login\n    request:\n        method: POST\n        url: /login\n"
+    )
+    for index in range(profiles):
+        name = f"profile{index or ''}"
+        (testcases_dir / f"{name}.yml").write_text(
+            f"config:\n    name: {name}\n"
+            "teststeps:\n-   name: login\n    testcase: testcases/login.yml\n"
+            "-   name: profile\n    request:\n        method: GET\n        url: /profile\n"
+        )
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(loader, "project_meta", None)
+    return testcases_dir
+
+
+def test_make_changed_testcases_only(tmp_path, monkeypatch):
+    testcases_dir = create_project(tmp_path, monkeypatch)
+    login_file = testcases_dir / "login.yml"
+
+    def make(path):
+        pytest_files_made_cache_mapping.clear()
+        pytest_files_run_set.clear()
+        return main_make([path])
+
+    login_pytest_file = str(testcases_dir / "login_test.py")
+    profile_pytest_file = str(testcases_dir / "profile_test.py")
+
+    make("testcases/profile.yml")
+    assert pytest_files_written_set == {login_pytest_file, profile_pytest_file}
+    assert os.path.isfile(tmp_path / MANIFEST_FILE_NAME)
+
+    # nothing changed
+    assert make("testcases/profile.yml") == [profile_pytest_file]
+    assert pytest_files_written_set == set()
+    assert pytest_files_made_cache_mapping[login_pytest_file] == "Login"
+
+    # referenced testcase changed, its dependent is made again
+    login_file.write_text(login_file.read_text().replace("/login", "/v2/login"))
+    make("testcases/profile.yml")
+    assert pytest_files_written_set == {login_pytest_file, profile_pytest_file}
+
+    with open(login_pytest_file) as f:
+        assert "/v2/login" in f.read()
+
+
+def test_make_in_parallel(tmp_path, monkeypatch):
+    testcases_dir = create_project(tmp_path, monkeypatch, profiles=4)
+    pytest_files_made_cache_mapping.clear()
+    pytest_files_run_set.clear()
+
+    pytest_files = main_make(["testcases"], jobs=2)
+    assert sorted(pytest_files) == sorted(
+        str(testcases_dir / name)
+        for name in [
+            "login_test.py",
+            "profile_test.py",
+            "profile1_test.py",
+            "profile2_test.py",
+            "profile3_test.py",
+        ]
+    )
+    # made by worker processes and merged back
+    assert pytest_files_written_set == set(pytest_files)
+    assert (
+        pytest_files_made_cache_mapping[str(testcases_dir / "login_test.py")] == "Login"
+    )
+    with open(testcases_dir / "profile3_test.py") as f:
+        assert "from testcases.login_test import TestCaseLogin as Login" in f.read()
+
+
+def test_make_without_format(tmp_path, monkeypatch):
+    testcases_dir = create_project(tmp_path, monkeypatch)
+    pytest_file = str(testcases_dir / "login_test.py")
+    pytest_files_made_cache_mapping.clear()
+    main_make(["testcases/login.yml"], is_format=False)
+    with open(pytest_file) as f:
+        content = f.read()
+    assert format_pytest_content(content) != content
+
+    # made again to be formatted
+    pytest_files_made_cache_mapping.clear()
+    main_make(["testcases/login.yml"])
+    assert pytest_files_written_set == {pytest_file}
+    with open(pytest_file) as f:
+        content = f.read()
+    assert format_pytest_content(content) == content
+
+
+def test_format_with_project_black_config(tmp_path, monkeypatch):
+    testcases_dir = create_project(tmp_path, monkeypatch)
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.black]\nline-length = 120\nskip-string-normalization = true\n"
+    )
+    content = "x = {'user': 'foo', 'password': 'bar', 'token': 'baz', 'role': 'admin', 'id': 1, 'age': 10}\n"
+    # line is shorter than 120 and quotes are kept
+    assert format_pytest_content(content, str(testcases_dir / "a_test.py")) == content
+
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "pyproject.toml").write_text("")
+    formatted_content = format_pytest_content(
+        content, str(tmp_path / "other" / "a_test.py")
+    )
+    assert formatted_content.startswith('x = {\n    "user": "foo",')
+
+
+def test_formatted_contents_bounded(monkeypatch):
+    monkeypatch.setattr(make, "MAX_FORMATTED_CONTENTS", 2)
+    for index in range(3):
+        format_pytest_content(f"x  =  {index}\n")
+    assert len(make.__formatted_contents) == 2
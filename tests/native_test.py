@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from httprunner import loader
+from httprunner.native import collect_native_testcases, main_native, run_native
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_testcase(name: str, expected_path: str, **config) -> dict:
+    return {
+        "config": {"name": name, **config},
+        "teststeps": [
+            {
+                "name": "get $user",
+                "request": {"method": "GET", "url": "/users/$user"},
+                "validators": [
+                    {
+                        "method": "equal",
+                        "expression": "body.path",
+                        "expect": expected_path,
+                    }
+                ],
+            }
+        ],
+    }
+
+
+@pytest.fixture
+def project(tmp_path, base_url, monkeypatch):
+    testcases_dir = tmp_path / "testcases"
+    testcases_dir.mkdir()
+    (tmp_path / "debugtalk.py").write_text("")
+    (tmp_path / "pyproject.toml").write_text("")
+    testcases = {
+        "pass.json": make_testcase(
+            "pass", "/users/foo", base_url=base_url, variables={"user": "foo"}
+        ),
+        "fail.json": make_testcase(
+            "fail", "/users/bar", base_url=base_url, variables={"user": "foo"}
+        ),
+        "parameters.json": make_testcase(
+            "user $user",
+            "/users/$user",
+            base_url=base_url,
+            parameters={"user": ["a", "b"]},
+        ),
+        "fixture.json": [1, 2, 3],
+    }
+    for name, content in testcases.items():
+        (testcases_dir / name).write_text(json.dumps(content))
+
+    (tmp_path / "testsuite.yml").write_text(
+        "config:\n    name: testsuite\n    variables:\n        user: foo\n"
+        "testcases:\n-   name: suite pass\n    testcase: testcases/fail.json\n"
+        "    variables:\n        user: bar\n"
+    )
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(loader, "project_meta", None)
+    return tmp_path
+
+
+def test_collect_native_testcases(project):
+    native_testcases = collect_native_testcases(["testcases", "testsuite.yml"])
+    assert [
+        (os.path.basename(item.path), item.parameters) for item in native_testcases
+    ] == [
+        ("fail.json", None),
+        ("parameters.json", {"user": "a"}),
+        ("parameters.json", {"user": "b"}),
+        ("pass.json", None),
+        ("fail.json", None),
+    ]
+    assert native_testcases[-1].config["variables"] == {"user": "bar"}
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_native(project, jobs):
+    summary = run_native(["testcases", "testsuite.yml"], jobs)
+    assert not summary["success"]
+    assert summary["stat"]["testcases"] == {"total": 5, "success": 4, "fail": 1}
+    assert [detail["name"] for detail in summary["details"]] == [
+        "fail",
+        "user a",
+        "user b",
+        "pass",
+        "suite pass",
+    ]
+    assert summary["details"][-1]["success"]
+    # variables of testcase are overridden by testsuite
+    assert summary["details"][-1]["in_out"]["config_vars"]["user"] == "bar"
+
+
+def test_main_native(project):
+    assert main_native(["testcases/pass.json", "--save-tests"]) == 0
+    with open(project / "logs" / "testcases" / "pass.summary.json") as f:
+        assert json.load(f)["stat"]["testcases"]["success"] == 1
+
+    assert main_native(["testcases/fail.json"]) == 1
+
+    with pytest.raises(SystemExit):
+        main_native(["testcases/fixture.json"])
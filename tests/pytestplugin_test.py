@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from httprunner import loader, native
+from tests.native_test import EchoHandler, make_testcase
+
+pytest_plugins = ["pytester"]
+
+
+@pytest.fixture
+def project(pytester, monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    pytester.makefile(".py", debugtalk="")
+    pytester.makefile(".toml", pyproject="")
+    testcases_dir = pytester.mkdir("testcases")
+    testcases = {
+        "pass.json": make_testcase(
+            "pass", "/users/foo", base_url=base_url, variables={"user": "foo"}
+        ),
+        "fail.json": make_testcase(
+            "fail", "/users/bar", base_url=base_url, variables={"user": "foo"}
+        ),
+        "parameters.json": make_testcase(
+            "user $user",
+            "/users/$user",
+            base_url=base_url,
+            parameters={"user": ["a", "b"]},
+        ),
+        "fixture.json": [1, 2, 3],
+    }
+    for name, content in testcases.items():
+        (testcases_dir / name).write_text(json.dumps(content))
+
+    pytester.makefile(
+        ".yml",
+        testsuite="config:\n    name: testsuite\n"
+        "testcases:\n-   name: suite pass\n    testcase: testcases/fail.json\n"
+        "    variables:\n        user: bar\n",
+    )
+    monkeypatch.setattr(loader, "project_meta", None)
+    yield pytester
+    server.shutdown()
+    server.server_close()
+
+
+def test_collect_testcases(project):
+    result = project.runpytest_inprocess(
+        "-p", "httprunner.pytestplugin", "--collect-testcases", "--collect-only", "-q"
+    )
+    result.stdout.fnmatch_lines(
+        [
+            "testcases/fail.json::fail",
+            "testcases/parameters.json::parameters",
+            "testcases/pass.json::pass",
+            "testsuite.yml::suite pass",
+        ]
+    )
+    result.assert_outcomes()
+
+    # not collected without option
+    result = project.runpytest_inprocess(
+        "-p", "httprunner.pytestplugin", "--collect-only", "-q"
+    )
+    assert result.ret == pytest.ExitCode.NO_TESTS_COLLECTED
+
+
+def test_repeated_names_in_testsuite(project):
+    project.makefile(
+        ".yml",
+        repeated="config:\n    name: repeated\n"
+        "testcases:\n-   name: same\n    testcase: testcases/pass.json\n"
+        "-   name: same\n    testcase: testcases/pass.json\n"
+        "-   name: other\n    testcase: testcases/pass.json\n",
+    )
+    result = project.runpytest_inprocess(
+        "-p",
+        "httprunner.pytestplugin",
+        "--collect-testcases",
+        "--collect-only",
+        "-q",
+        "repeated.yml",
+    )
+    result.stdout.fnmatch_lines(
+        ["repeated.yml::same", "repeated.yml::same_1", "repeated.yml::other"]
+    )
+
+
+def test_run_testcases(project):
+    result = project.runpytest_inprocess(
+        "-p", "httprunner.pytestplugin", "--collect-testcases"
+    )
+    result.assert_outcomes(passed=3, failed=1)
+    result.stdout.fnmatch_lines(["*ValidationFailure*"])
+
+    result = project.runpytest_inprocess(
+        "-p", "httprunner.pytestplugin", "--collect-testcases", "-k", "suite"
+    )
+    result.assert_outcomes(passed=1, deselected=3)
+
+
+def test_failure_not_hidden_by_export(project):
+    # token is never extracted as the step fails
+    fail_path = project.path / "testcases" / "fail.json"
+    testcase = json.loads(fail_path.read_text())
+    testcase["config"]["export"] = ["token"]
+    fail_path.write_text(json.dumps(testcase))
+
+    result = project.runpytest_inprocess(
+        "-p", "httprunner.pytestplugin", "--collect-testcases", "testcases/fail.json"
+    )
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*ValidationFailure*"])
+    result.stdout.no_fnmatch_line("*VariableNotFound*")
+
+
+def test_collect_testcases_lazily(project, monkeypatch):
+    """testcase files are not loaded when collecting"""
+    count = 2000
+    content = json.dumps(make_testcase("lazy", "/users/lazy"))
+    lazy_dir = project.mkdir("lazy")
+    for index in range(count):
+        (lazy_dir / f"lazy_{index}.json").write_text(content)
+
+    def load_testcase_file(*args, **kwargs):
+        raise AssertionError("testcase loaded when collecting")
+
+    monkeypatch.setattr(native, "load_testcase_file", load_testcase_file)
+    result = project.runpytest_inprocess(
+        "-p",
+        "httprunner.pytestplugin",
+        "--collect-testcases",
+        "--collect-only",
+        "-q",
+        "lazy",
+    )
+    result.stdout.fnmatch_lines([f"{count} tests collected*"])
+
+
+def test_record_timings(project):
+    project.runpytest_inprocess("-p", "httprunner.pytestplugin", "--collect-testcases")
+    with open(project.path / ".hrun_timings.json") as f:
+        timings = json.load(f)
+    assert sorted(timings) == [
+        "testcases/fail.json::fail",
+        "testcases/parameters.json::parameters",
+        "testcases/pass.json::pass",
+        "testsuite.yml::suite pass",
+    ]
+    assert all(duration > 0 for duration in timings.values())
+
+    os.remove(project.path / ".hrun_timings.json")
+    project.runpytest_inprocess(
+        "-p", "httprunner.pytestplugin", "--collect-testcases", "--timings-file="
+    )
+    assert not os.path.exists(project.path / ".hrun_timings.json")
+
+
+def test_shared_results_removed_at_the_end(pytester):
+    # --testrunuid is added by pytest-xdist
+    pytester.makeconftest(
+        "def pytest_addoption(parser):\n"
+        "    parser.addoption('--testrunuid', default=None)\n"
+    )
+    pytester.makepyfile(
+        "import os\n"
+        "from httprunner.core.runner.shared import _get_session_dir\n"
+        "def test_shared(request):\n"
+        "    session_dir = _get_session_dir(request.config.option.testrunuid)\n"
+        "    os.makedirs(session_dir)\n"
+        "    with open('session_dir', 'w') as f:\n"
+        "        f.write(session_dir)\n"
+    )
+    result = pytester.runpytest_inprocess("-p", "httprunner.pytestplugin")
+    result.assert_outcomes(passed=1)
+    session_dir = (pytester.path / "session_dir").read_text()
+    assert not os.path.exists(session_dir)
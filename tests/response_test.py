@@ -1,9 +1,28 @@
+import json
 import unittest
 
+import jmespath
 import requests
+from requests.structures import CaseInsensitiveDict
 
-from httprunner.models import JMESPathExtractor, Validator
-from httprunner.response import ResponseObject
+from httprunner.exceptions import ValidationFailure
+from httprunner.models import JMESPathExtractor, TStep, Validator
+from httprunner.response import (
+    ExtractionPlan,
+    ResponseObject,
+    compile_jmespath,
+    compile_validator,
+)
+
+
+def build_response(body, status_code: int = 200) -> requests.Response:
+    """Build requests.Response without sending any request."""
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.headers["Content-Type"] = "application/json"
+    resp.encoding = "utf-8"
+    resp._content = json.dumps(body).encode("utf-8")
+    return resp
 
 
 class TestResponse(unittest.TestCase):
@@ -77,3 +96,202 @@ class TestResponse(unittest.TestCase):
             variables_mapping=variables_mapping,
             functions_mapping=functions_mapping,
         )
+
+
+class TestResponseSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.resp_obj = ResponseObject(
+            build_response({"locations": [{"name": "Seattle", "state": "WA"}]})
+        )
+
+    def test_compile_jmespath_cached(self):
+        self.assertIs(
+            compile_jmespath("body.locations[0].name"),
+            compile_jmespath("body.locations[0].name"),
+        )
+
+    def test_search_context_built_once(self):
+        self.assertIs(self.resp_obj.search_context, self.resp_obj.search_context)
+        self.assertEqual(self.resp_obj.search_context["status_code"], 200)
+
+    def test_search_context_rebuilt_after_reassigning(self):
+        self.assertEqual(
+            self.resp_obj._search_jmespath("body.locations[0].name"), "Seattle"
+        )
+        self.resp_obj.body = {"locations": [{"name": "Olympia"}]}
+        self.assertEqual(
+            self.resp_obj._search_jmespath("body.locations[0].name"), "Olympia"
+        )
+
+
+class TestExtractionPlan(unittest.TestCase):
+    data = {
+        "status_code": 200,
+        "headers": CaseInsensitiveDict({"Content-Type": "application/json"}),
+        "body": {
+            "locations": [
+                {"name": "Seattle", "state": "WA"},
+                {"name": "New York", "state": "NY"},
+            ],
+            "matrix": [[1, 2], [3, 4]],
+            "text": "abc",
+            "empty": None,
+        },
+    }
+
+    def test_collect_same_as_jmespath(self):
+        expressions = [
+            "status_code",
+            'headers."content-type"',
+            "body",
+            "body.locations[0].name",
+            "body.locations[-1].state",
+            "body.locations[5].name",
+            "body.matrix[1][0]",
+            "body.text.foo",
+            "body.text[0]",
+            "body.empty.foo",
+            "body.missing",
+        ]
+        plan = ExtractionPlan(expressions)
+        self.assertEqual(plan.simple_expressions, expressions)
+
+        values = plan.collect(self.data)
+        for expr in expressions:
+            self.assertEqual(values[expr], jmespath.search(expr, self.data), expr)
+
+    def test_complex_expressions(self):
+        plan = ExtractionPlan(
+            ["body.locations[*].name", "length(body.locations)", "body.locations[0"]
+        )
+        self.assertEqual(plan.simple_expressions, [])
+        self.assertEqual(len(plan.complex_expressions), 3)
+        self.assertEqual(plan.collect(self.data), {})
+
+    def test_extract_and_validate(self):
+        resp_obj = ResponseObject(build_response(self.data["body"]))
+        extract_mapping = resp_obj.extract(
+            [
+                JMESPathExtractor(
+                    variable_name="var_1", expression="body.locations[0].name"
+                ),
+                JMESPathExtractor(
+                    variable_name="var_2", expression="body.locations[*].state"
+                ),
+            ]
+        )
+        self.assertEqual(extract_mapping, {"var_1": "Seattle", "var_2": ["WA", "NY"]})
+
+        resp_obj.validate(
+            [
+                Validator(method="equal", expression="status_code", expect=200),
+                Validator(
+                    method="equal",
+                    expression="body.locations[$index].name",
+                    expect="New York",
+                ),
+                Validator(
+                    method="length_equal", expression="body.locations[*]", expect=2
+                ),
+            ],
+            variables_mapping={"index": 1},
+        )
+
+
+class NotComparableDict(dict):
+    def __eq__(self, other):
+        raise AssertionError("static parts should not be compared")
+
+    __hash__ = None
+
+
+class TestValidatorPlan(unittest.TestCase):
+    def setUp(self) -> None:
+        self.resp_obj = ResponseObject(
+            build_response({"code": 0, "data": {"names": ["foo", "bar"]}})
+        )
+
+    def test_plan_shared_by_copies(self):
+        step = TStep(
+            name="step",
+            validators=[Validator(method="equal", expression="body.code", expect=0)],
+        )
+        plan = compile_validator(step.validators[0])
+        self.assertIsNotNone(plan.compiled_expression)
+        self.assertFalse(plan.is_expect_dynamic)
+
+        step_copy = step.model_copy(deep=True)
+        self.assertIs(compile_validator(step_copy.validators[0]), plan)
+
+        step_copy.validators[0].expression = "body.data"
+        self.assertIsNot(compile_validator(step_copy.validators[0]), plan)
+
+    def test_plan_recompiled_if_fields_reassigned(self):
+        validator = Validator(method="equal", expression="body.code", expect=1)
+        plan = compile_validator(validator)
+        self.assertFalse(plan.is_expect_dynamic)
+
+        validator.expect = "$code"
+        validator.config = {"tolerance": "$tolerance"}
+        plan = compile_validator(validator)
+        self.assertTrue(plan.is_expect_dynamic)
+        self.assertTrue(plan.is_config_dynamic)
+        self.assertIs(compile_validator(validator.model_copy(deep=True)), plan)
+
+        validator.message = "${get_message()}"
+        self.assertTrue(compile_validator(validator).is_message_dynamic)
+
+        # static parts are not compared on every run
+        validator.expect = NotComparableDict(names=["foo", "bar"])
+        plan = compile_validator(validator)
+        self.assertIs(compile_validator(validator), plan)
+
+    def test_dynamic_validator(self):
+        validator = Validator(
+            method="equal",
+            expression="body.data.names",
+            expect=["$name", "bar"],
+            message="${get_message()}",
+        )
+        plan = compile_validator(validator)
+        self.assertTrue(plan.is_expect_dynamic)
+        self.assertTrue(plan.is_message_dynamic)
+        self.assertFalse(plan.is_config_dynamic)
+
+        self.resp_obj.validate(
+            [validator],
+            variables_mapping={"name": "foo"},
+            functions_mapping={"get_message": lambda: "names mismatch"},
+        )
+        validator_dict = self.resp_obj.validation_results["validate_extractor"][0]
+        self.assertEqual(validator_dict["Result"], "✔️")
+        self.assertEqual(
+            validator_dict["Assert"],
+            {
+                "ActualValue": ["foo", "bar"],
+                "Comparator": "equal",
+                "ExpectValue": ["foo", "bar"],
+            },
+        )
+        self.assertEqual(validator_dict["Message"], "names mismatch")
+        self.assertEqual(validator_dict["JMESPath"], "body.data.names")
+
+    def test_fail_fast(self):
+        validators = [
+            Validator(method="equal", expression="body.code", expect=1),
+            Validator(method="equal", expression="status_code", expect=201),
+            Validator(method="equal", expression="status_code", expect=200),
+        ]
+        with self.assertRaises(ValidationFailure) as cm:
+            self.resp_obj.validate(validators)
+        self.assertIn("第 2 个失败的断言", str(cm.exception))
+        self.assertEqual(len(self.resp_obj.validation_results["validate_extractor"]), 3)
+
+        with self.assertRaises(ValidationFailure) as cm:
+            self.resp_obj.validate(validators, fail_fast=True)
+        self.assertNotIn("第 2 个失败的断言", str(cm.exception))
+        self.assertEqual(len(self.resp_obj.validation_results["validate_extractor"]), 1)
+
+    def test_no_validators(self):
+        self.resp_obj.validate([])
+        self.assertEqual(self.resp_obj.validation_results, {})
@@ -3,8 +3,11 @@ import unittest
 
 import pytest
 
-from httprunner import loader
+from httprunner import Config, RunRequest, Step, client, loader, models, runner
+from httprunner.builtin import expand_nested_json
 from httprunner.cli import main_run
+from httprunner.client import HttpSession
+from httprunner.configs.mock import mock_settings
 from httprunner.runner import HttpRunner
 
 
@@ -43,3 +46,182 @@ class TestHttpRunner(unittest.TestCase):
         self.assertTrue(os.path.exists("tests/data/debugtalk.py"))
         self.assertTrue(os.path.exists("tests/data/a_b_c/T1_test.py"))
         self.assertTrue(os.path.exists("tests/data/a_b_c/T2_3_test.py"))
+
+
+class MockedRequestCase(HttpRunner):
+    config = (
+        Config("mocked request $foo")
+        .base_url("http://127.0.0.1:1")
+        .variables(foo="bar")
+    )
+    teststeps = [
+        Step(
+            RunRequest("get with params $foo")
+            .get("/get")
+            .with_params(foo="$foo")
+            .mock({"foo": "$foo"})
+            .validate()
+            .assert_equal("status_code", 200)
+            .assert_equal("body.foo", "$foo")
+        ),
+    ]
+
+
+@pytest.fixture
+def enable_mock(monkeypatch):
+    monkeypatch.setattr(mock_settings, "is_enabled", True)
+
+
+def test_compiled_plan(enable_mock):
+    plan = HttpRunner.compile(MockedRequestCase)
+    assert plan is MockedRequestCase.compile()
+
+    session = HttpSession()
+    for foo in ("bar", "baz", "qux"):
+        runner = plan.execute(variables={"foo": foo}, session=session)
+        summary = runner.get_summary()
+        assert summary.success
+        assert summary.name == f"mocked request {foo}"
+        req_resp = summary.step_datas[0].data.req_resps[0]
+        assert req_resp.request.url == f"http://127.0.0.1:1/get?foo={foo}"
+        assert req_resp.response.body == {"foo": foo}
+
+    # templates are not changed by executions
+    assert plan.config.variables == {"foo": "bar"}
+    assert not plan.teststeps[0].is_variables_resolved
+
+    # run() is built on the compiled plan
+    for _ in range(2):
+        summary = MockedRequestCase().run().get_summary()
+        assert summary.step_datas[0].data.req_resps[0].response.body == {"foo": "bar"}
+    assert MockedRequestCase.compile() is plan
+
+    # plan is compiled again if class attributes were reassigned
+    origin_teststeps = MockedRequestCase.teststeps
+    try:
+        MockedRequestCase.teststeps = origin_teststeps[:]
+        assert MockedRequestCase.compile() is not plan
+    finally:
+        MockedRequestCase.teststeps = origin_teststeps
+
+
+def test_compiled_plan_outdated(enable_mock):
+    plan = MockedRequestCase.compile()
+    origin_config = MockedRequestCase.config
+    try:
+        # builders changed in place
+        MockedRequestCase.config = (
+            Config("mocked request $foo")
+            .base_url("http://127.0.0.1:1")
+            .variables(foo="bar")
+        )
+        plan = MockedRequestCase.compile()
+        assert MockedRequestCase.compile() is plan
+        MockedRequestCase.config.variables(foo="baz")
+        new_plan = MockedRequestCase.compile()
+        assert new_plan is not plan
+        assert new_plan.config.variables == {"foo": "baz"}
+
+        MockedRequestCase.teststeps.append(MockedRequestCase.teststeps[0])
+        try:
+            assert len(MockedRequestCase.compile().teststeps) == 2
+        finally:
+            MockedRequestCase.teststeps.pop()
+        assert len(MockedRequestCase.compile().teststeps) == 1
+    finally:
+        MockedRequestCase.config = origin_config
+
+
+def test_compiled_plan_outdated_by_step_changed_in_place(enable_mock):
+    request = (
+        RunRequest("get with params")
+        .get("/get")
+        .with_params(foo="bar")
+        .mock({"foo": "bar"})
+    )
+
+    class GetCase(HttpRunner):
+        config = Config("get").base_url("http://127.0.0.1:1")
+        teststeps = [Step(request)]
+
+    plan = GetCase.compile()
+    assert GetCase.compile() is plan
+
+    # builder methods called on the request kept by step
+    request.with_params(foo="baz")
+    new_plan = GetCase.compile()
+    assert new_plan is not plan
+    summary = new_plan.execute().get_summary()
+    req_resp = summary.step_datas[0].data.req_resps[0]
+    assert req_resp.request.url == "http://127.0.0.1:1/get?foo=baz"
+    assert GetCase.compile() is new_plan
+
+
+def test_run_with_instance_config(enable_mock):
+    testcase = MockedRequestCase()
+    testcase.config = (
+        Config("instance request $foo")
+        .base_url("http://127.0.0.1:1")
+        .variables(foo="qux")
+    )
+    summary = testcase.run().get_summary()
+    assert summary.name == "instance request qux"
+    assert summary.step_datas[0].data.req_resps[0].response.body == {"foo": "qux"}
+    assert testcase.raw_testcase.config.name == "instance request $foo"
+
+    # class config is not changed
+    summary = MockedRequestCase().run().get_summary()
+    assert summary.step_datas[0].data.req_resps[0].response.body == {"foo": "bar"}
+
+
+def test_validation_results_built_when_read(enable_mock, monkeypatch):
+    built = []
+    build = models.build_validation_results
+    monkeypatch.setattr(
+        models,
+        "build_validation_results",
+        lambda records: built.append(len(records)) or build(records),
+    )
+
+    summary = MockedRequestCase().run().get_summary()
+    assert built == []
+
+    session_data = summary.step_datas[0].data
+    results = session_data.validation_results["validate_extractor"]
+    assert [result["Assert"]["ExpectValue"] for result in results] == [200, "bar"]
+    assert session_data.model_dump()["validation_results"] == {
+        "validate_extractor": results
+    }
+    assert built == [2]
+
+
+def test_expanded_response_body_reused(enable_mock, monkeypatch):
+    expanded = []
+
+    def expand(target, paths=None):
+        expanded.append(paths)
+        return expand_nested_json(target, paths)
+
+    monkeypatch.setattr(client, "expand_nested_json", expand)
+    monkeypatch.setattr(runner, "expand_nested_json", expand)
+
+    class ExpandCase(HttpRunner):
+        config = Config("expand nested json").base_url("http://127.0.0.1:1")
+        teststeps = [
+            Step(
+                RunRequest("get nested json")
+                .get("/get")
+                .expand_nested_json("data")
+                .mock({"data": '{"user": {"name": "bar"}}', "raw": '{"foo": 1}'})
+                .validate()
+                .assert_equal("body.data.user.name", "bar")
+                .assert_equal("body.raw", '{"foo": 1}')
+            ),
+        ]
+
+    summary = ExpandCase().run().get_summary()
+    assert summary.success
+    # expanded only once when recording the response, the result is reused by validators
+    assert expanded == [["data"]]
+    req_resp = summary.step_datas[0].data.req_resps[0]
+    assert req_resp.response.body["data"] == {"user": {"name": "bar"}}
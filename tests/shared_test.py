@@ -0,0 +1,217 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from httprunner import Config, HttpRunner, RunRequest, RunTestCase, Step
+from httprunner.client import HttpSession
+from httprunner.core.runner import shared
+from httprunner.core.runner.shared import clear_shared_results
+from httprunner.exceptions import ValidationFailure
+
+
+class AuthHandler(BaseHTTPRequestHandler):
+    # token -> user
+    tokens = {}
+    logins = []
+    requests = []
+
+    def send_json(self, status_code, body, cookie=None):
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        if cookie:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_POST(self):
+        user = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["user"]
+        self.logins.append(user)
+        token = f"{user}-{len(self.logins)}"
+        self.tokens[token] = user
+        self.send_json(200, {"token": token}, cookie=f"sid={token}; Path=/")
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        token = self.headers.get("Authorization")
+        if token not in self.tokens or f"sid={token}" not in self.headers.get(
+            "Cookie", ""
+        ):
+            self.send_json(401, {"error": "unauthorized"})
+            return
+
+        self.send_json(200, {"user": self.tokens[token]})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    AuthHandler.tokens = {}
+    AuthHandler.logins = []
+    AuthHandler.requests = []
+    clear_shared_results()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), AuthHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    clear_shared_results()
+
+
+class Login(HttpRunner):
+    config = Config("login").base_url("$base_url").export("token")
+    teststeps = [
+        Step(
+            RunRequest("login")
+            .post("/login")
+            .with_json({"user": "$user"})
+            .extract()
+            .with_jmespath("body.token", "token")
+        )
+    ]
+
+
+def make_testcase_cls(retry_times=1, **share):
+    class GetMe(HttpRunner):
+        config = Config("get me").base_url("$base_url")
+        teststeps = [
+            Step(
+                RunTestCase("login $user")
+                .call(Login)
+                .shared(key=["user"], **share)
+                .export("token")
+            ),
+            Step(
+                RunRequest("get me")
+                .retry_on_failure(retry_times, 0)
+                .get("/users/me")
+                .with_headers(Authorization="$token")
+                .validate()
+                .assert_equal("status_code", 200)
+                .assert_equal("body.user", "$user")
+            ),
+        ]
+
+    return GetMe
+
+
+def run(testcase_cls, base_url, user):
+    plan = HttpRunner.compile(testcase_cls)
+    runner = plan.execute({"base_url": base_url, "user": user}, session=HttpSession())
+    return runner.get_summary()
+
+
+def test_shared_testcase_run_once_for_each_key(base_url):
+    testcase_cls = make_testcase_cls()
+    for user in ["a", "a", "b", "a", "b"]:
+        summary = run(testcase_cls, base_url, user)
+        assert summary.success
+
+    # exported variables and cookies are reused by new sessions
+    assert AuthHandler.logins == ["a", "b"]
+
+
+def test_shared_testcase_expired(base_url):
+    testcase_cls = make_testcase_cls(ttl=0.2)
+    run(testcase_cls, base_url, "a")
+    run(testcase_cls, base_url, "a")
+    time.sleep(0.3)
+    run(testcase_cls, base_url, "a")
+    assert AuthHandler.logins == ["a", "a"]
+
+
+def test_shared_testcase_refreshed_on_401(base_url):
+    testcase_cls = make_testcase_cls()
+    run(testcase_cls, base_url, "a")
+
+    # token revoked, login again and request is retried with new token
+    AuthHandler.tokens.clear()
+    summary = run(testcase_cls, base_url, "a")
+    assert summary.success
+    assert AuthHandler.logins == ["a", "a"]
+
+    # refreshed result is shared
+    run(testcase_cls, base_url, "a")
+    assert AuthHandler.logins == ["a", "a"]
+
+
+def test_request_sent_again_after_refreshed(base_url, monkeypatch):
+    testcase_cls = make_testcase_cls(retry_times=0)
+    run(testcase_cls, base_url, "a")
+    AuthHandler.requests.clear()
+
+    # token revoked, the request got 401 is sent again with new token, without retrying
+    AuthHandler.tokens.clear()
+    summary = run(testcase_cls, base_url, "a")
+    assert summary.success
+    assert AuthHandler.logins == ["a", "a"]
+    assert AuthHandler.requests == ["/users/me", "/users/me"]
+    assert summary.step_datas[-1].data.stat.response_time_ms > 0
+
+    # sent again only once if still unauthorized
+    AuthHandler.requests.clear()
+    monkeypatch.setattr(AuthHandler, "tokens", {})
+    monkeypatch.setattr(AuthHandler, "do_POST", AuthHandler.do_GET)
+    with pytest.raises(ValidationFailure):
+        run(testcase_cls, base_url, "a")
+    assert AuthHandler.requests == ["/users/me", "/login", "/users/me"]
+
+
+def test_shared_testcase_in_session_scope(base_url, monkeypatch):
+    if os.name == "nt":
+        pytest.skip("session scope is shared in one process on Windows")
+
+    session_id = f"test-{os.getpid()}-{time.time()}"
+    monkeypatch.setenv("HTTPRUNNER_SHARED_SESSION_ID", session_id)
+    testcase_cls = make_testcase_cls(scope="session")
+    try:
+        run(testcase_cls, base_url, "a")
+
+        # results are saved as JSON, only accessible by the current user
+        session_dir = shared._get_session_dir(session_id)
+        assert os.stat(os.path.dirname(session_dir)).st_mode & 0o777 == 0o700
+        assert os.stat(session_dir).st_mode & 0o777 == 0o700
+        (result_name,) = [
+            name for name in os.listdir(session_dir) if name.endswith(".json")
+        ]
+        result_path = os.path.join(session_dir, result_name)
+        assert os.stat(result_path).st_mode & 0o777 == 0o600
+        with open(result_path) as f:
+            result = json.load(f)
+        assert result["export_vars"] == {"token": "a-1"}
+        assert result["cookies"][0]["name"] == "sid"
+
+        # a new worker process has nothing in memory
+        clear_shared_results()
+        assert run(testcase_cls, base_url, "a").success
+        assert AuthHandler.logins == ["a"]
+    finally:
+        clear_shared_results(session_id)
+    assert not os.path.exists(session_dir)
+
+
+def test_shared_dir_accessible_by_others_not_used(base_url, monkeypatch):
+    if os.name == "nt":
+        pytest.skip("session scope is shared in one process on Windows")
+
+    session_id = f"test-{os.getpid()}-{time.time()}"
+    monkeypatch.setenv("HTTPRUNNER_SHARED_SESSION_ID", session_id)
+    session_dir = shared._get_session_dir(session_id)
+    os.makedirs(session_dir, exist_ok=True)
+    os.chmod(session_dir, 0o777)
+    testcase_cls = make_testcase_cls(scope="session")
+    try:
+        run(testcase_cls, base_url, "a")
+        assert os.listdir(session_dir) == []
+        # shared in this process only
+        run(testcase_cls, base_url, "a")
+        assert AuthHandler.logins == ["a"]
+    finally:
+        clear_shared_results(session_id)
@@ -0,0 +1,81 @@
+import pytest
+
+from httprunner.timing import (
+    estimate_durations,
+    load_timings,
+    save_timings,
+    sort_longest_first,
+    update_timings,
+)
+
+
+def test_load_and_save_timings(tmp_path):
+    timings_path = str(tmp_path / "timings.json")
+    assert load_timings(timings_path) == {}
+
+    timings = {"a.yml::a": 1.0}
+    update_timings(timings, {"a.yml::a": 3.0, "b.yml::b": 2.0})
+    assert timings == {"a.yml::a": 2.0, "b.yml::b": 2.0}
+
+    save_timings(timings_path, timings)
+    assert load_timings(timings_path) == timings
+
+    with open(timings_path, "w") as f:
+        f.write("invalid")
+    assert load_timings(timings_path) == {}
+
+
+def test_sort_longest_first():
+    timings = {"a": 1.0, "b": 5.0, "c": 3.0}
+    node_ids = ["a", "b", "c", "new"]
+    # new testcase is estimated with median of known durations
+    assert estimate_durations(node_ids, timings)["new"] == 3.0
+    assert sort_longest_first(node_ids, timings) == [1, 2, 3, 0]
+    # collected order is kept without timings
+    assert sort_longest_first(node_ids, {}) == [0, 1, 2, 3]
+
+
+class FakeGateway:
+    def __init__(self, id):
+        self.id = id
+
+
+class FakeNode:
+    def __init__(self, name):
+        self.gateway = FakeGateway(name)
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+class FakeConfig:
+    def getvalue(self, name):
+        return ["2*popen"] if name == "tx" else None
+
+    getoption = getvalue
+
+
+def test_longest_first_scheduling():
+    pytest.importorskip("xdist")
+    from httprunner.ext.xdist import LongestFirstScheduling
+
+    collection = ["a", "b", "c", "d", "e"]
+    timings = {"a": 1, "b": 5, "c": 4, "d": 3, "e": 2}
+    scheduler = LongestFirstScheduling(FakeConfig(), timings=timings)
+    nodes = [FakeNode("gw0"), FakeNode("gw1")]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+
+    scheduler.schedule()
+    assert nodes[0].sent == [1, 3]
+    assert nodes[1].sent == [2, 4]
+
+    # the first idle worker runs the next longest testcase
+    scheduler.mark_test_complete(nodes[1], 2)
+    assert nodes[1].sent == [2, 4, 0]
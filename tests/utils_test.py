@@ -74,6 +74,39 @@ class TestUtils(unittest.TestCase):
         functions_mapping["type_match"](None, "NoneType")
         functions_mapping["type_match"](None, None)
 
+    def test_cached_comparators(self):
+        from pydantic import BaseModel
+
+        from httprunner.builtin import comparators
+
+        schema = {
+            "type": "object",
+            "properties": {"id": {"type": "integer"}},
+            "required": ["id"],
+        }
+        for i in range(3):
+            comparators.match_json_schema({"id": i}, dict(schema))
+        self.assertEqual(
+            comparators._get_json_schema_validator.cache_info().currsize, 1
+        )
+        with self.assertRaises(AssertionError):
+            comparators.match_json_schema({"id": "1"}, schema)
+        with self.assertRaises(AssertionError):
+            comparators.match_json_schema({"id": 1}, {"type": "unknown"})
+
+        class Item(BaseModel):
+            id: int
+
+        comparators.match_pydantic_model({"id": 1}, Item)
+        comparators.match_pydantic_model([{"id": 1}, {"id": 2}], list[Item])
+        with self.assertRaises(AssertionError):
+            comparators.match_pydantic_model([{"id": "1"}], list[Item])
+
+        comparators.regex_match("123abc456", r"^123\w+456$")
+        comparators.regex_match("123def456", r"^123\w+456$")
+        with self.assertRaises(AssertionError):
+            comparators.regex_match("123abc456", "^12b.*456$")
+
     def test_lower_dict_keys(self):
         request_dict = {
             "url": "http://127.0.0.1:5000",
@@ -0,0 +1,144 @@
+import pytest
+
+from httprunner.core.runner import with_resource
+from httprunner.core.runner.update_form import update_form
+from httprunner.core.runner.update_json import update_json
+from httprunner.core.runner.with_resource import (
+    evaluate_resources,
+    get_referenced_variables,
+)
+from httprunner.exceptions import OverrideReservedVariableError
+from httprunner.models import SharedResources, StableDeepCopyDict, TRequestConfig, TStep
+from httprunner.parser import ParseMe
+
+extractor_calls = []
+
+
+def extract_api_doc(api_doc: dict) -> dict:
+    extractor_calls.append(api_doc)
+    return {"api_path": api_doc["path"]}
+
+
+functions = {"extract_api_doc": extract_api_doc, "get_id": lambda: 1}
+
+
+def make_step(resources: list, **variables) -> TStep:
+    step = TStep(
+        name="foo",
+        variables=StableDeepCopyDict(variables),
+        request_config=TRequestConfig(name="foo", resources=SharedResources(resources)),
+    )
+    return step.model_copy(deep=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    extractor_calls.clear()
+    with_resource._evaluated_resources.clear()
+    with_resource._referenced_variables.clear()
+
+
+def test_evaluated_resources_cached():
+    api_doc = {"path": "/api/$version/users", "schema": {"type": "object"}}
+    resources = [("api_doc", api_doc, "extract_api_doc")]
+
+    evaluated = evaluate_resources(make_step(resources, version="v1"), functions)
+    assert evaluated == {
+        "api_doc": {"path": "/api/v1/users", "schema": {"type": "object"}},
+        "api_path": "/api/v1/users",
+    }
+    # the resource itself is not changed
+    assert api_doc["path"] == "/api/$version/users"
+
+    # not referenced variables changed
+    assert (
+        evaluate_resources(make_step(resources, version="v1", other=1), functions)
+        == evaluated
+    )
+    assert len(extractor_calls) == 1
+
+    # referenced variable changed
+    evaluated_v2 = evaluate_resources(make_step(resources, version="v2"), functions)
+    assert evaluated_v2["api_path"] == "/api/v2/users"
+    assert len(extractor_calls) == 2
+
+    # 1 and True are equal but not the same
+    evaluate_resources(make_step(resources, version=1), functions)
+    evaluate_resources(make_step(resources, version=True), functions)
+    assert len(extractor_calls) == 4
+
+    # unhashable variable values
+    evaluate_resources(make_step(resources, version=[1]), functions)
+    evaluate_resources(make_step(resources, version=[1]), functions)
+    evaluate_resources(make_step(resources, version=[2]), functions)
+    assert len(extractor_calls) == 6
+
+
+def test_evaluated_resources_shared_and_updated_on_copies():
+    api_doc = {
+        "path": "/api/$version",
+        "body": {"user": {"name": "foo", "tags": ["a"]}, "meta": {"id": 1}},
+    }
+    resources = [("api_doc", api_doc, None)]
+    evaluated = evaluate_resources(make_step(resources, version="v1"), functions)
+    # the raw resource is not parsed in place, parts without variables are not copied
+    assert api_doc["path"] == "/api/$version"
+    assert evaluated["api_doc"] == {"path": "/api/v1", "body": api_doc["body"]}
+    assert evaluated["api_doc"]["body"] is api_doc["body"]
+
+    # evaluated resource is shared rather than copied for each step
+    shared = evaluate_resources(make_step(resources, version="v1"), functions)
+    assert shared["api_doc"] is evaluated["api_doc"]
+
+    # request updated with update_json_object() and update_form_data() are copies
+    body = evaluated["api_doc"]["body"]
+    parsed_request_dict = {
+        "req_json": body,
+        "req_json_update": [({"user": {"name": "bar"}}, True)],
+        "data": body,
+        "data_update": [({"user": {"tags": []}}, False)],
+    }
+    update_json(parsed_request_dict)
+    update_form(parsed_request_dict)
+    assert parsed_request_dict["req_json"] == {
+        "user": {"name": "bar", "tags": ["a"]},
+        "meta": {"id": 1},
+    }
+    assert parsed_request_dict["data"] == {"user": {"tags": []}, "meta": {"id": 1}}
+    assert body == {"user": {"name": "foo", "tags": ["a"]}, "meta": {"id": 1}}
+    # only dicts on the updated paths are copied
+    assert parsed_request_dict["req_json"]["meta"] is body["meta"]
+
+
+def test_cached_resources_bounded(monkeypatch):
+    monkeypatch.setattr(with_resource, "MAX_CACHED_RESOURCES", 2)
+    api_docs = [{"path": f"/api/{index}/$version"} for index in range(5)]
+    for api_doc in api_docs:
+        evaluate_resources(
+            make_step([("api_doc", api_doc, None)], version="v1"), functions
+        )
+
+    assert len(with_resource._referenced_variables) == 2
+    assert len(with_resource._evaluated_resources) == 2
+
+
+def test_not_cached_resources():
+    assert get_referenced_variables({"a": "$a", "b": ["${b}", "$$c"]}) == {"a", "b"}
+    assert get_referenced_variables({"id": "${get_id()}"}) is None
+    assert get_referenced_variables(["${pyexp(1 + 1)}"]) is None
+    assert get_referenced_variables(ParseMe()) is None
+
+    api_doc = {"path": "/api/${get_id()}"}
+    resources = [("api_doc", api_doc, "extract_api_doc")]
+    for _ in range(2):
+        evaluated = evaluate_resources(make_step(resources), functions)
+        assert evaluated["api_path"] == "/api/1"
+    assert len(extractor_calls) == 2
+
+
+def test_reserved_variable_name():
+    resources = [("api_doc", {"path": "/api"}, None)]
+    evaluate_resources(make_step(resources), functions)
+
+    with pytest.raises(OverrideReservedVariableError):
+        evaluate_resources(make_step(resources, api_doc=1), functions)